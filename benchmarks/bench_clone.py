@@ -0,0 +1,40 @@
+"""
+Layering a small override on a large base with new() and merged_new() - clones copy on write, so the time and
+memory depend on the override and not on the base.
+
+    PYTHONPATH=src python benchmarks/bench_clone.py [sections] [keys per section]
+"""
+import sys
+import time
+import tracemalloc
+
+from syd import SydParser
+
+
+def measure(label, function):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = function()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f'{label}: {elapsed * 1000:.2f} ms, {size / 1024:,.1f} KiB')
+    return result
+
+
+def main(sections=200, keys=500):
+    text = ''.join(
+        f'section_{s} {{\n' + ''.join(f'    key_{k}: {k}\n' for k in range(keys)) + '}\n' for s in range(sections)
+    )
+    base = SydParser(text).parse()
+    override = SydParser('section_7 {\n    key_3: 42\n}\nextra: 1\n').parse()
+    print(f'base of {sections * keys} values')
+    measure('clone()', base.clone)
+    measure('new(override)', lambda: base.new(override))
+    merged = measure('merged_new(override)', lambda: base.merged_new(override))
+    assert merged['section_7.key_3'] == 42 and merged['section_7.key_4'] == 4 and base['section_7.key_3'] == 3
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,45 @@
+"""
+Parsing and tree operations on very deeply nested documents.
+
+    PYTHONPATH=src python benchmarks/bench_deep_nesting.py [depth]
+"""
+import sys
+import time
+
+from syd import SydParser
+
+
+def make_text(depth):
+    return ''.join((
+        ''.join('%sk {\n' % (' ' * (i % 8)) for i in range(depth)),
+        'v: 1\n',
+        '}\n' * depth,
+    ))
+
+
+def run(label, fn):
+    start = time.perf_counter()
+    try:
+        res = fn()
+    except RecursionError:
+        print(f'{label:<12} RecursionError')
+        return None
+    print(f'{label:<12} {time.perf_counter() - start:8.3f} s')
+    return res
+
+
+def main(depth=10000):
+    print(f'depth: {depth} (recursion limit: {sys.getrecursionlimit()})')
+    text = make_text(depth)
+    tree = run('parse', lambda: SydParser(text).parse())
+    if tree is None:
+        return
+    run('lazy parse', lambda: SydParser(text).parse(lazy=True))
+    clone = run('clone', tree.clone)
+    run('merged_new', lambda: tree.merged_new(clone))
+    run('str', lambda: str(tree))
+    run('lock', clone.lock)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,44 @@
+"""
+Removing half of the keys of a large block one by one and with delete_many().
+
+    PYTHONPATH=src python benchmarks/bench_delete.py [keys]
+"""
+import sys
+import time
+
+from syd import SydContainer, SydData
+
+
+def make_block(size):
+    block = SydContainer('block')
+    for i in range(size):
+        block.add(SydData(f'key_{i}', i))
+    return block
+
+
+def run(label, fn):
+    start = time.perf_counter()
+    fn()
+    print(f'{label:<16} {time.perf_counter() - start:8.3f} s')
+
+
+def main(size=100000):
+    keys = [f'key_{i}' for i in range(0, size, 2)]
+    print(f'block of {size} keys, removing {len(keys)}')
+
+    block = make_block(size)
+
+    def delete_one_by_one():
+        for key in keys:
+            del block[key]
+    run('del block[key]', delete_one_by_one)
+    assert len(block.keys()) == size - len(keys) and block['key_1'] == 1
+
+    block = make_block(size)
+    if hasattr(block, 'delete_many'):
+        run('delete_many', lambda: block.delete_many(keys))
+        assert len(block.keys()) == size - len(keys) and block['key_1'] == 1
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
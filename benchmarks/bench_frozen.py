@@ -0,0 +1,32 @@
+"""
+Deep lookups on a locked tree and on its frozen snapshot (a single dict lookup per path).
+
+    PYTHONPATH=src python benchmarks/bench_frozen.py [services] [lookups]
+"""
+import sys
+import time
+
+from syd import SydParser
+
+
+def main(services=1000, lookups=200000):
+    text = 'services {\n' + ''.join(
+        f'    s{i} {{\n        ports [\n' + ''.join(
+            f'            {{\n                port: {8000 + p}\n            }}\n' for p in range(4)
+        ) + '        ]\n    }\n' for i in range(services)
+    ) + '}\n'
+    tree = SydParser(text).parse()
+    tree.lock()
+    paths = [f'services.s{i * 7 % services}.ports.{i % 4}.port' for i in range(lookups)]
+    start = time.perf_counter()
+    frozen = tree.freeze()
+    print(f'freeze(): {time.perf_counter() - start:.3f} s for {len(frozen)} paths')
+    for label, config in (('locked tree', tree), ('frozen', frozen)):
+        start = time.perf_counter()
+        total = sum(config.get(p) for p in paths)
+        elapsed = time.perf_counter() - start
+        print(f'{label}: {lookups} lookups in {elapsed:.3f} s, {lookups / elapsed:,.0f}/s (sum {total})')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,46 @@
+"""
+Memory saved by sharing the identical subtrees of a generated document with many identical host sections.
+
+    PYTHONPATH=src python benchmarks/bench_intern.py [hosts]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+from syd import SydParser
+
+
+def make_text(hosts):
+    return ''.join(
+        f'host_{i} {{\n    name: h{i}\n    port: 443\n    tls {{\n        cert: /etc/ssl/site.pem\n'
+        f'        protocols [\n            TLSv1.2\n            TLSv1.3\n        ]\n    }}\n'
+        f'    limits {{\n        connections: 1024\n        timeout: 30\n    }}\n}}\n'
+        for i in range(hosts)
+    )
+
+
+def main(hosts=20000):
+    text = make_text(hosts)
+    tree = SydParser(text).parse()
+    tree.lock()
+    start = time.perf_counter()
+    tree.intern()
+    elapsed = time.perf_counter() - start
+
+    # memory is traced in a second run (tracing slows everything down)
+    tracemalloc.start()
+    tree = SydParser(text).parse()
+    tree.lock()
+    parsed = tracemalloc.get_traced_memory()[0]
+    report = tree.intern()
+    gc.collect()  # dropped nodes refer to their parents - they are freed by the cycle collector
+    interned = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f'hosts: {hosts}, intern: {elapsed:.3f} s')
+    print(f'nodes shared: {report.nodes_shared}, reported: {report.bytes_saved / 2 ** 20:.1f} MiB')
+    print(f'traced memory: {parsed / 2 ** 20:.1f} MiB -> {interned / 2 ** 20:.1f} MiB')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
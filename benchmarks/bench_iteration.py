@@ -0,0 +1,33 @@
+"""
+Iterating a large list and its keys, values and items - the views do not copy the children, so the extra memory
+stays constant.
+
+    PYTHONPATH=src python benchmarks/bench_iteration.py [items]
+"""
+import sys
+import time
+import tracemalloc
+
+from syd import SydContainer, SydData
+
+
+def measure(label, make_iterator):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = sum(1 for _ in make_iterator())
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f'{label}: {count} in {elapsed:.3f} s, peak extra memory {peak / 1024:,.1f} KiB')
+
+
+def main(items=1000000):
+    data = SydContainer('data', is_list=True, initial_data=[SydData(None, i) for i in range(items)])
+    measure('iter(list)', lambda: iter(data))
+    measure('keys()', data.keys)
+    measure('values()', data.values)
+    measure('items()', data.items)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,27 @@
+"""
+Membership tests on a large list (an allow-list) - the value index makes them constant time.
+
+    PYTHONPATH=src python benchmarks/bench_list_membership.py [items] [tests]
+"""
+import sys
+import time
+
+from syd import SydParser
+
+
+def main(items=100000, tests=10000):
+    text = 'allowed [\n' + ''.join(f'    user_{i}\n' for i in range(items)) + ']\n'
+    allowed = SydParser(text).parse().get_child('allowed')
+    probes = [f'user_{i * 7919 % (items * 2)}' for i in range(tests)]  # about half of them are not in the list
+    start = time.perf_counter()
+    'user_0' in allowed  # builds the index
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    found = sum(1 for probe in probes if probe in allowed)
+    elapsed = time.perf_counter() - start
+    print(f'{items} items, first test: {first:.3f} s')
+    print(f'{tests} tests ({found} found): {elapsed:.3f} s, {tests / elapsed:,.0f} tests/s')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,30 @@
+"""
+Plain Python values of a large document: syd.loads() (built from the parse events) against SydParser.parse().value
+(a tree first, then its values).
+
+    PYTHONPATH=src python benchmarks/bench_loads.py [records]
+"""
+import sys
+import time
+
+from syd import SydParser, loads
+
+
+def main(records=50000):
+    text = 'records [\n' + ''.join(
+        f'    {{\n        id: {i}\n        name: record {i}\n        score: {i * 0.5}\n        created: 2020-01-02\n'
+        f'        tags [\n            a\n            b\n        ]\n    }}\n' for i in range(records)
+    ) + ']\n'
+    for label, function in (
+        ('parse().value', lambda: SydParser(text).parse().value),
+        ('loads()', lambda: loads(text)),
+    ):
+        start = time.perf_counter()
+        value = function()
+        elapsed = time.perf_counter() - start
+        assert len(value['records']) == records
+        print(f'{label}: {elapsed:.3f} s for {records} records ({len(text) / elapsed / 2 ** 20:.1f} MiB/s)')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,44 @@
+"""
+Parsing a document dominated by large multiline strings (templates, certificates) compared to reading it.
+
+    PYTHONPATH=src python benchmarks/bench_multiline_strings.py [blocks] [lines per block]
+"""
+import io
+import sys
+import time
+
+from syd import SydParser
+
+
+def make_text(blocks, lines):
+    parts = []
+    for i in range(blocks):
+        token = ('~', '~~', '~~~')[i % 3]
+        parts.append(f'template_{i} {token} {{\n')
+        parts.extend(f'    <div class="row-{j}">{"x" * 60}</div>\n' for j in range(lines))
+        parts.append('}\n')
+    return ''.join(parts)
+
+
+def run(label, fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        res = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f'{label:<24} {best:8.3f} s')
+    return res
+
+
+def main(blocks=30, lines=20000):
+    text = make_text(blocks, lines)
+    print(f'{len(text) / 2 ** 20:.1f} MiB, {blocks} multiline strings of {lines} lines')
+    run('read', lambda: io.StringIO(text).read())
+    run('parse', lambda: SydParser(text).parse())
+    run('parse + materialize', lambda: SydParser(text).parse().value)
+    run('parse file object', lambda: SydParser(io.StringIO(text)).parse().value)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
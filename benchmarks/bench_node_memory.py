@@ -0,0 +1,33 @@
+"""
+Memory of a parsed document of many scalars - bytes per node (of the tree only, the text is not counted).
+
+    PYTHONPATH=src python benchmarks/bench_node_memory.py [blocks] [scalars per block]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+from syd import SydParser
+
+
+def main(blocks=1000, scalars=1000):
+    text = ''.join(
+        f'block_{b} {{\n' + ''.join(f'    key_{k}: {k}\n' for k in range(scalars)) + '}\n' for b in range(blocks)
+    ) + 'items [\n' + ''.join(f'    {i}\n' for i in range(scalars)) + ']\n'
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    tree = SydParser(text).parse()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    nodes = blocks * (scalars + 1) + scalars + 1
+    print(f'{nodes} nodes parsed in {elapsed:.2f} s (with tracemalloc): {size / 2 ** 20:,.1f} MiB, '
+          f'{size / nodes:.1f} bytes per node')
+    return tree
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,39 @@
+"""
+Resolving a config of four layers (defaults <- site <- host <- env) with chained merged_new() and with SydOverlay.
+
+    PYTHONPATH=src python benchmarks/bench_overlay.py [sections] [keys per section] [lookups]
+"""
+import sys
+import time
+
+from syd import SydParser, SydOverlay
+
+
+def layer(sections, keys, value):
+    return SydParser(''.join(
+        f'section_{s} {{\n' + ''.join(f'    key_{k}: {value}\n' for k in range(keys)) + '}\n' for s in range(sections)
+    )).parse()
+
+
+def main(sections=100, keys=100, lookups=100000):
+    defaults = layer(sections, keys, 0)
+    site = layer(sections // 2, keys // 2, 1)
+    host = layer(sections // 4, keys // 4, 2)
+    env = layer(2, 2, 3)
+    paths = [f'section_{i % sections}.key_{i * 7 % keys}' for i in range(lookups)]
+
+    for label, build in (
+        ('merged_new', lambda: defaults.merged_new(site, host, env)),
+        ('SydOverlay', lambda: SydOverlay(defaults, site, host, env)),
+    ):
+        start = time.perf_counter()
+        config = build()
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        total = sum(config[p] for p in paths)
+        looked_up = time.perf_counter() - start
+        print(f'{label}: built in {built * 1000:.2f} ms, {lookups} lookups in {looked_up:.3f} s (sum {total})')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
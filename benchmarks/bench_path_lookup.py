@@ -0,0 +1,54 @@
+"""
+Lookups per second through dotted string keys and through compiled paths (syd.path()) at depths 1 to 10.
+
+    PYTHONPATH=src python benchmarks/bench_path_lookup.py
+"""
+import time
+
+import syd
+from syd import SydParser
+
+
+def make_text(depth):
+    """A scalar under depth - 1 levels of blocks and lists (servers.0 is a block in a list) and its dotted path"""
+    steps = []
+    while len(steps) < depth - 1:
+        if len(steps) <= depth - 3:
+            steps.extend((('servers [', 'servers', ']'), ('{', '0', '}')))
+        else:
+            steps.append((f'b{len(steps)} {{', f'b{len(steps)}', '}'))
+    lines = [f'{"    " * level}{opener}\n' for level, (opener, _, _) in enumerate(steps)]
+    lines.append(f'{"    " * len(steps)}port: 8080\n')
+    lines.extend(f'{"    " * level}{closer}\n' for level, (_, _, closer) in reversed(list(enumerate(steps))))
+    return ''.join(lines), '.'.join([key for _, key, _ in steps] + ['port'])
+
+
+def rate(fn, seconds=0.3):
+    count = 0
+    start = time.perf_counter()
+    end = start + seconds
+    while time.perf_counter() < end:
+        for _ in range(1000):
+            fn()
+        count += 1000
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    compiled = getattr(syd, 'path', None)
+    print(f'{"depth":>5} {"string key":>14} {"compiled path":>14}')
+    for depth in range(1, 11):
+        text, key = make_text(depth)
+        tree = SydParser(text).parse()
+        assert tree[key] == 8080, key
+        by_string = rate(lambda: tree[key])
+        if compiled is not None:
+            syd_path = compiled(key)
+            by_path = f'{rate(lambda: tree[syd_path]):>14,.0f}'
+        else:
+            by_path = f'{"-":>14}'
+        print(f'{depth:>5} {by_string:>14,.0f} {by_path}')
+
+
+if __name__ == '__main__':
+    main()
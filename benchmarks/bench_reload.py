@@ -0,0 +1,43 @@
+"""
+Reload latency of a SydDocument after a one line edit, compared to parsing the whole document again.
+
+    PYTHONPATH=src python benchmarks/bench_reload.py
+"""
+import time
+
+from syd import SydParser, SydDocument
+
+
+def make_text(hosts):
+    return ''.join(
+        f'host_{i} {{\n    name: h{i}.example.com\n    port: {8000 + i}\n    tags [\n        web\n        eu\n    ]\n}}\n'
+        for i in range(hosts)
+    )
+
+
+def best(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    print(f'{"hosts":>8} {"full parse":>12} {"reload":>12}')
+    for hosts in (1000, 10000, 100000):
+        text = make_text(hosts)
+        edited = text.replace(f'port: {8000 + hosts // 2}\n', 'port: 1\n')
+        document = SydDocument(text)
+        texts = [edited, text]
+
+        def reload():
+            document.reload(texts[0])
+            texts.reverse()
+
+        print(f'{hosts:>8} {best(lambda: SydParser(text).parse(), 1):>10.4f} s {best(reload):>10.4f} s')
+
+
+if __name__ == '__main__':
+    main()
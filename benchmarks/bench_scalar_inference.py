@@ -0,0 +1,68 @@
+"""
+Micro-benchmark for bare scalar inference: scalars/second of the old "run every matcher" classification against the
+first-character dispatch used by SydParser, on a string-heavy document.
+
+    PYTHONPATH=src python benchmarks/bench_scalar_inference.py
+"""
+import random
+import time
+
+from syd import SydParser, SydDataType
+from syd.curlybrace_parser import _Patterns
+from syd.datatypes.date_time import parse_date, parse_time, parse_datetime
+
+
+def legacy_classify(data_part):
+    """The previous classification: all four patterns are tried on every bare scalar"""
+    number_match = _Patterns.number.match(data_part)
+    datetime_match = _Patterns.datetime.match(data_part)
+    date_match = _Patterns.date.match(data_part)
+    time_match = _Patterns.time.match(data_part)
+    if number_match:
+        return (int(data_part) if data_part.isdigit() else float(data_part)), SydDataType.number
+    elif datetime_match:
+        return parse_datetime(datetime_match), SydDataType.datetime
+    elif date_match:
+        return parse_date(date_match), SydDataType.date
+    elif time_match:
+        return parse_time(time_match), SydDataType.time
+    return data_part, SydDataType.string
+
+
+def make_values(count, seed=7):
+    rnd = random.Random(seed)
+    words = ['alpha', 'server name', 'localhost', 'enabled', 'https://example.com/x', 'some longer description text']
+    values = []
+    for _ in range(count):
+        r = rnd.random()
+        if r < 0.85:
+            values.append(rnd.choice(words))
+        elif r < 0.95:
+            values.append(str(rnd.randint(-1000, 100000)))
+        elif r < 0.98:
+            values.append('2018-%d-%d' % (rnd.randint(1, 12), rnd.randint(1, 28)))
+        else:
+            values.append('%d:%02d PM' % (rnd.randint(1, 11), rnd.randint(0, 59)))
+    return values
+
+
+def run(label, fn, values, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            fn(value)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f'{label:<32} {len(values) / best:>14,.0f} scalars/s')
+
+
+def main(count=200000):
+    values = make_values(count)
+    run('before (all matchers)', legacy_classify, values)
+    run('after (first char dispatch)', SydParser._SydParser__classify_bare_scalar, values)
+    run('scalar_values (full path)', SydParser.scalar_values, values)
+
+
+if __name__ == '__main__':
+    main()
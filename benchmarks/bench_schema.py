@@ -0,0 +1,55 @@
+"""
+Decoding a large list of records into dataclasses: building the tree and converting it by hand, decoding the tree
+with a compiled model and decoding the parse events directly (no tree).
+
+    PYTHONPATH=src python benchmarks/bench_schema.py [records]
+"""
+import dataclasses
+import sys
+import time
+
+from syd import SydParser, compile_model
+
+
+@dataclasses.dataclass
+class Record:
+    id: int
+    name: str
+    score: float
+    active: bool
+    tags: list[str]
+
+
+@dataclasses.dataclass
+class Document:
+    records: list[Record]
+
+
+def tree_then_convert(text):
+    tree = SydParser(text).parse()
+    return Document([
+        Record(int(r['id']), r['name'], float(r['score']), r['active'] == 'true', list(r['tags']))
+        for r in tree['records']
+    ])
+
+
+def main(records=20000):
+    text = 'records [\n' + ''.join(
+        f'    {{\n        id: {i}\n        name: record {i}\n        score: {i * 0.5}\n        active: true\n'
+        f'        tags [\n            a\n            b\n        ]\n    }}\n' for i in range(records)
+    ) + ']\n'
+    decoder = compile_model(Document)
+    results = []
+    for label, decode in (
+        ('tree then convert', tree_then_convert),
+        ('decode(tree)', lambda t: decoder.decode(SydParser(t).parse())),
+        ('decode_text (events)', decoder.decode_text),
+    ):
+        start = time.perf_counter()
+        results.append(decode(text))
+        print(f'{label}: {time.perf_counter() - start:.3f} s for {records} records')
+    assert results[0] == results[1] == results[2]
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
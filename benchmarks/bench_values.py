@@ -0,0 +1,29 @@
+"""
+Reading the value of a large section again and again (tree['servers'] in a request path) - the value is built once
+and kept until the section changes.
+
+    PYTHONPATH=src python benchmarks/bench_values.py [servers] [reads]
+"""
+import sys
+import time
+
+from syd import SydParser
+
+
+def main(servers=1000, reads=1000):
+    text = 'servers {\n' + ''.join(
+        f'    s{i} {{\n        host: h{i}.example.org\n        port: {8000 + i}\n        tags [\n            a\n'
+        f'            b\n        ]\n    }}\n' for i in range(servers)
+    ) + '}\n'
+    tree = SydParser(text).parse()
+    start = time.perf_counter()
+    for _ in range(reads):
+        servers_value = tree['servers']
+    elapsed = time.perf_counter() - start
+    assert servers_value['s1']['port'] == 8001
+    print(f"{reads} reads of tree['servers'] ({servers} servers): {elapsed:.3f} s, "
+          f'{elapsed / reads * 1e6:,.1f} us per read')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
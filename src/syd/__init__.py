@@ -4,5 +4,21 @@ from .curlybrace_parser import (
     SydData,
     SydDataType,
     SydParseError,
-    SynamicSydParseError
+    SynamicSydParseError,
+    SydEvent,
+    SydEventType,
+    iterparse,
+    tree_events
 )
+from .datatypes.syd_data import SydPath, path
+from .include import IncludeResolver, clear_include_cache
+from .cache import load
+from .binary import SydBinaryImage, dump_binary, dumps_binary, load_binary
+from .parallel import parse_many
+from .document import SydDocument
+from .patch import SydPatch, diff
+from .overlay import SydOverlay
+from .frozen import SydFrozen
+from .schema import SydDecoder, compile_model
+from .exceptions import SynamicSydValidationError
+from .native import loads, load_file
@@ -0,0 +1,259 @@
+"""
+Compact binary image of a Syd tree.
+
+Layout (little endian):
+
+    header          magic, version, node count, string count and section offsets
+    node table      one fixed size record per node, in breadth first order so that the children of a container
+                    are contiguous: tag, flags, key string index, payload, child count
+    string offsets  string count + 1 offsets into the string data
+    string data     utf-8 encoded, de-duplicated strings
+
+The tag of a scalar is the value of its SydDataType (UNTYPED when it has none) and the flags tell how the payload is
+encoded. A container has the CONTAINER tag, the IS_LIST flag for lists, the index of its first child as the payload
+and the number of children.
+
+An image is opened read-only (through mmap for files) by SydBinaryImage and SydData nodes are only materialized when
+a container is accessed, so many processes can share one page cached image.
+"""
+import mmap
+import struct
+import datetime
+from syd.datatypes.syd_data import SydDataType, SydData, SydContainer
+from syd.exceptions import SynamicSydBinaryFormatError
+
+MAGIC = b'SYDB'
+VERSION = 1
+
+_header = struct.Struct('<4sHHIIQQQ')  # magic, version, reserved, node count, string count, 3 section offsets
+_node = struct.Struct('<BBHIqI')  # tag, flags, reserved, key, payload, child count
+_offset = struct.Struct('<Q')
+_float_bits = struct.Struct('<d')
+_int_bits = struct.Struct('<q')
+
+CONTAINER = 0
+UNTYPED = 255
+_NO_KEY = 0xFFFFFFFF
+
+# container flags
+IS_LIST = 1
+
+# scalar payload encodings
+_ENC_INT = 0
+_ENC_FLOAT = 1
+_ENC_BIG_INT = 2  # decimal string
+_ENC_STR = 3
+_ENC_BOOL = 4
+_ENC_DATE = 5  # ordinal
+_ENC_TIME = 6  # microseconds since midnight
+_ENC_DATETIME = 7  # microseconds since 0001-01-01
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+_DAY_US = 86400 * 10 ** 6
+
+
+def _time_to_us(t):
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 10 ** 6 + t.microsecond
+
+
+def _us_to_time(us):
+    seconds, microsecond = divmod(us, 10 ** 6)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return datetime.time(hour, minute, second, microsecond)
+
+
+class _StringTable:
+    def __init__(self):
+        self.__index = {}
+        self.__strings = []
+
+    def add(self, s):
+        idx = self.__index.get(s)
+        if idx is None:
+            idx = self.__index[s] = len(self.__strings)
+            self.__strings.append(s.encode('utf-8'))
+        return idx
+
+    def __len__(self):
+        return len(self.__strings)
+
+    def offsets_and_data(self):
+        offsets = bytearray()
+        pos = 0
+        offsets += _offset.pack(pos)
+        for b in self.__strings:
+            pos += len(b)
+            offsets += _offset.pack(pos)
+        return bytes(offsets), b''.join(self.__strings)
+
+
+def _encode_scalar(value, strings):
+    """Returns flags and payload"""
+    if isinstance(value, bool):
+        return _ENC_BOOL, int(value)
+    elif isinstance(value, int):
+        if _INT64_MIN <= value <= _INT64_MAX:
+            return _ENC_INT, value
+        return _ENC_BIG_INT, strings.add(str(value))
+    elif isinstance(value, float):
+        return _ENC_FLOAT, _int_bits.unpack(_float_bits.pack(value))[0]
+    elif isinstance(value, str):
+        return _ENC_STR, strings.add(value)
+    elif isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            raise SynamicSydBinaryFormatError(f'Timezone aware date-time cannot be stored: {value}')
+        return _ENC_DATETIME, (value.toordinal() - 1) * _DAY_US + _time_to_us(value.time())
+    elif isinstance(value, datetime.date):
+        return _ENC_DATE, value.toordinal()
+    elif isinstance(value, datetime.time):
+        if value.tzinfo is not None:
+            raise SynamicSydBinaryFormatError(f'Timezone aware time cannot be stored: {value}')
+        return _ENC_TIME, _time_to_us(value)
+    raise SynamicSydBinaryFormatError(f'Value of type {type(value)} cannot be stored in the binary format')
+
+
+def dumps_binary(container):
+    """Binary image of a SydContainer tree as bytes"""
+    assert isinstance(container, SydContainer)
+    strings = _StringTable()
+    records = bytearray()
+    nodes = [container]
+    idx = 0
+    while idx < len(nodes):
+        node = nodes[idx]
+        idx += 1
+        key = _NO_KEY if node.key is None else strings.add(node.key)
+        if node.is_container:
+            children = node.get_children()
+            records += _node.pack(CONTAINER, IS_LIST if node.is_list else 0, 0, key, len(nodes), len(children))
+            nodes.extend(children)
+        else:
+            tag = UNTYPED if node.type is None else node.type.value
+            flags, payload = _encode_scalar(node.value, strings)
+            records += _node.pack(tag, flags, 0, key, payload, 0)
+
+    offsets, data = strings.offsets_and_data()
+    node_table_offset = _header.size
+    string_offsets_offset = node_table_offset + len(records)
+    string_data_offset = string_offsets_offset + len(offsets)
+    header = _header.pack(MAGIC, VERSION, 0, len(nodes), len(strings),
+                          node_table_offset, string_offsets_offset, string_data_offset)
+    return b''.join((header, records, offsets, data))
+
+
+def dump_binary(container, path):
+    with open(path, 'wb') as f:
+        f.write(dumps_binary(container))
+
+
+class SydBinaryImage:
+    """
+    Read-only view of a binary image. `root` is a SydContainer whose nested containers load their children from the
+    image on first access. The image must stay open while unloaded containers are still in use.
+    """
+    def __init__(self, buffer, read_only=True):
+        self.__buffer = buffer
+        self.__mmap = None
+        self.__read_only = read_only
+        if len(buffer) < _header.size:
+            raise SynamicSydBinaryFormatError('Buffer is too small for a Syd binary image')
+        magic, version, _, node_count, string_count, node_table_offset, string_offsets_offset, string_data_offset = \
+            _header.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise SynamicSydBinaryFormatError('Not a Syd binary image')
+        if version != VERSION:
+            raise SynamicSydBinaryFormatError(f'Unsupported Syd binary image version: {version}')
+        self.__node_count = node_count
+        self.__string_count = string_count
+        self.__node_table_offset = node_table_offset
+        self.__string_offsets_offset = string_offsets_offset
+        self.__string_data_offset = string_data_offset
+        self.__keys = {}
+        self.__root = None
+
+    @classmethod
+    def open(cls, path, read_only=True):
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        image = cls(mm, read_only=read_only)
+        image.__mmap = mm
+        return image
+
+    def close(self):
+        if self.__mmap is not None:
+            self.__mmap.close()
+            self.__mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def node_count(self):
+        return self.__node_count
+
+    @property
+    def root(self):
+        if self.__root is None:
+            self.__root = self.__node(0)
+            if self.__read_only:
+                self.__root.lock()
+        return self.__root
+
+    def __string(self, idx):
+        start, end = struct.unpack_from('<QQ', self.__buffer, self.__string_offsets_offset + idx * _offset.size)
+        start += self.__string_data_offset
+        end += self.__string_data_offset
+        return bytes(self.__buffer[start:end]).decode('utf-8')
+
+    def __key(self, idx):
+        if idx == _NO_KEY:
+            return None
+        key = self.__keys.get(idx)
+        if key is None:
+            key = self.__keys[idx] = self.__string(idx)
+        return key
+
+    def __node(self, idx):
+        if not 0 <= idx < self.__node_count:
+            raise SynamicSydBinaryFormatError(f'Node index {idx} is out of range')
+        tag, flags, _, key_idx, payload, count = _node.unpack_from(
+            self.__buffer, self.__node_table_offset + idx * _node.size
+        )
+        key = self.__key(key_idx)
+        if tag == CONTAINER:
+            container = SydContainer(key, is_list=bool(flags & IS_LIST))
+            # a read-only container locks the children it loads
+            container.syd_set_children_loader(lambda: [self.__node(i) for i in range(payload, payload + count)])
+            return container
+        datatype = None if tag == UNTYPED else SydDataType(tag)
+        return SydData(key, self.__decode_scalar(flags, payload), datatype)
+
+    def __decode_scalar(self, flags, payload):
+        if flags == _ENC_INT:
+            return payload
+        elif flags == _ENC_STR:
+            return self.__string(payload)
+        elif flags == _ENC_FLOAT:
+            return _float_bits.unpack(_int_bits.pack(payload))[0]
+        elif flags == _ENC_BIG_INT:
+            return int(self.__string(payload))
+        elif flags == _ENC_BOOL:
+            return bool(payload)
+        elif flags == _ENC_DATE:
+            return datetime.date.fromordinal(payload)
+        elif flags == _ENC_TIME:
+            return _us_to_time(payload)
+        elif flags == _ENC_DATETIME:
+            days, us = divmod(payload, _DAY_US)
+            return datetime.datetime.combine(datetime.date.fromordinal(days + 1), _us_to_time(us))
+        raise SynamicSydBinaryFormatError(f'Unknown scalar encoding: {flags}')
+
+
+def load_binary(path, read_only=True):
+    """Opens a binary image file through mmap and returns its root container"""
+    return SydBinaryImage.open(path, read_only=read_only).root
@@ -0,0 +1,142 @@
+"""
+Persistent cache of parsed Syd files.
+
+A parsed tree is stored in its tuple form (see syd.serialization) in `<cache_dir>/<key>.sydc`, where the key is the
+hash of the file content and directory (or of its path, size and modification time). Unchanged files are then loaded without
+running SydParser. The content hashes of included files are stored with the tree and checked on load. The least recently used entries are evicted when the total cache size goes above the limit.
+
+Cache files are pickles: only use a cache_dir that no one else can write to, as loading a crafted cache file can run
+any code. Files without the header of the current format are never unpickled.
+"""
+import os
+import sys
+import pickle
+import hashlib
+from syd.curlybrace_parser import SydParser
+from syd.serialization import tree_to_tuple, tree_from_tuple
+
+CACHE_SUFFIX = '.sydc'
+DEFAULT_MAX_CACHE_SIZE = 256 * 1024 * 1024
+# bump when the tuple form or the parser output changes so that stale entries are never used.
+_CACHE_FORMAT_VERSION = 2
+_CACHE_HEADER = f'syd-cache-{_CACHE_FORMAT_VERSION}\n'.encode()
+
+
+def _cache_key(path, content=None):
+    """
+    Hash of the content and the directory of the file when content is provided (includes are resolved relative to
+    the directory), hash of the path, size and modification time otherwise.
+    """
+    h = hashlib.sha256(f'syd-{_CACHE_FORMAT_VERSION}-{sys.version_info[:2]}\0'.encode())
+    if content is not None:
+        h.update(f'{os.path.dirname(os.path.abspath(path))}\0'.encode())
+        h.update(content)
+    else:
+        st = os.stat(path)
+        h.update(f'{os.path.abspath(path)}\0{st.st_size}\0{st.st_mtime_ns}'.encode())
+    return h.hexdigest()
+
+
+def _file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _includes_unchanged(included_files):
+    for path, digest in included_files:
+        try:
+            if _file_hash(path) != digest:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _read_cached(cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            if f.read(len(_CACHE_HEADER)) != _CACHE_HEADER:
+                return None  # not a cache file of this format
+            included_files, data = pickle.load(f)
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        # a corrupt (e.g. truncated) file is a miss
+        return None
+    if not _includes_unchanged(included_files):
+        return None
+    try:
+        os.utime(cache_path)  # mark as recently used for eviction
+    except OSError:
+        pass
+    return data
+
+
+def _write_cached(cache_path, data):
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(_CACHE_HEADER)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def evict(cache_dir, max_cache_size=DEFAULT_MAX_CACHE_SIZE):
+    """Removes least recently used cache entries until the total size is within max_cache_size"""
+    entries = []
+    total = 0
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(CACHE_SUFFIX) and entry.is_file():
+                st = entry.stat()
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                total += st.st_size
+    if total <= max_cache_size:
+        return
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_cache_size:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def load(path, cache_dir=None, max_cache_size=DEFAULT_MAX_CACHE_SIZE, use_mtime=False, encoding='utf-8'):
+    """
+    Parses the Syd file at path and returns the root SydContainer.
+    When cache_dir is provided the parsed tree is reused as long as the file content (or with use_mtime, the file
+    size and modification time) stays the same. The cache files are pickles, so no one else may write to cache_dir.
+    """
+    if cache_dir is None:
+        with open(path, encoding=encoding) as f:
+            return SydParser.parse_file(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    content = None
+    if not use_mtime:
+        with open(path, 'rb') as f:
+            content = f.read()
+    cache_path = os.path.join(cache_dir, _cache_key(path, content) + CACHE_SUFFIX)
+
+    data = _read_cached(cache_path)
+    if data is not None:
+        return tree_from_tuple(data)
+
+    if content is None:
+        with open(path, encoding=encoding) as f:
+            parser = SydParser.for_file(f)
+            tree = parser.parse()
+    else:
+        parser = SydParser(content.decode(encoding), base_dir=base_dir)
+        tree = parser.parse()
+
+    os.makedirs(cache_dir, exist_ok=True)
+    _write_cached(cache_path, (parser.included_files, tree_to_tuple(tree)))
+    evict(cache_dir, max_cache_size)
+    return tree
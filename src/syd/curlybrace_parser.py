@@ -1,9 +1,14 @@
 import re
 import enum
+import os
+import collections
+import functools
+import sys
 from syd.datatypes.date_time import DtPatterns, parse_date, parse_time, parse_datetime
 from syd.datatypes.syd_data import SydDataType, SydData, SydContainer
-from syd.exceptions import SynamicSydParseError
-from syd.utils import get_source_snippet_from_text
+from syd.exceptions import SynamicSydParseError, SynamicInvalidDateTimeFormat
+from syd.utils import LineIndex, LinesView, indent_width, dedent
+from syd.include import INCLUDE_PATTERN, IncludeResolver
 
 # TODO: add inline mode too.
 
@@ -35,18 +40,162 @@ class _Patterns:
 
     inline_list_separator = re.compile(r'(?<!\\),')
 
-    multiline_spaces = re.compile(r'^[ \t]*')
+    # a } at the end of a line - a candidate for the end line of a multiline string.
+    multiline_end = re.compile(r'}[ \t]*(?=[\r\n\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]|\Z)')
 
     inline_list = re.compile(r'^[ \t]*\((?P<content>.*?)\)[ \t]*$')
 
+    # a line that opens a nested block or a multiline string - used to find the end of a block without parsing it.
+    # like block_opener but anything can follow the brace - used to skip a broken block.
+    broken_block_opener = re.compile(r'''^[ \t]*
+        (?:[a-zA-Z_]+[a-zA-Z0-9_]*)?
+        [ \t]*
+        (?P<is_multiline>~{1,3})?
+        [ \t]*
+        :?
+        [ \t]*
+        (?P<open>[{\[])''', re.X)
+
+    block_opener = re.compile(r'''^[ \t]*
+        (?:[a-zA-Z_]+[a-zA-Z0-9_]*)? # key, not present for list items
+        [ \t]*
+        (?P<is_multiline>~{1,3})?
+        [ \t]*
+        :?
+        [ \t]*
+        (?P<open>[{\[])
+        [ \t]*
+        (?:(?:\#|//).*)? # comment
+        $''', re.X)
+
+
+_DIGITS = frozenset('0123456789')
+_SIGNS = frozenset('+-')
+_COMMENT_STARTS = ('#', '//')
+# first characters of values that are not a single bare scalar (blocks, lists, inline lists, quoted and multiline
+# strings, and the list items with a colon or an include)
+_NOT_SIMPLE = frozenset('{[(\'"~:!')
+
+
+@enum.unique
+class SydEventType(enum.Enum):
+    start_block = 1
+    end_block = 2
+    start_list = 3
+    end_list = 4
+    scalar = 5
+
+    def __str__(self):
+        return str(self.name)
+
+    def __repr__(self):
+        return str(self)
+
+
+# Lazily parsed block, only used between the parser and its tree builder. Value is `(is_list, children loader)`.
+_DEFERRED_BLOCK = 'deferred_block'
+
+# One parse event. `key` is None for list elements, `value` and `datatype` are only set for scalars.
+SydEvent = collections.namedtuple('SydEvent', ('event', 'key', 'value', 'datatype', 'line_no'))
+
+
+class _LineReader:
+    """
+    Pulls lines lazily from an iterable with one line of look-ahead.
+    Only a few recent lines are remembered (for error snippets), so memory does not grow with the source.
+    A LineIndex is read by line number instead, up to last_line_no, and lines can be skipped without slicing them.
+    """
+    def __init__(self, lines, history=10, line_no=0, last_line_no=None):
+        """line_no is the number of the line before the first one pulled from lines"""
+        if isinstance(lines, LineIndex):
+            self.__line_index = lines
+            self.__last_line_no = len(lines) if last_line_no is None else last_line_no
+        else:
+            self.__line_index = None
+            self.__lines = iter(lines)
+        self.__line_no = line_no
+        self.__line = None
+        self.__history = collections.deque(maxlen=history)
+        self.__next_line = self.__fetch()
+
+    def __fetch(self):
+        if self.__line_index is not None:
+            line_no = self.__line_no + 1
+            return self.__line_index.line(line_no) if line_no <= self.__last_line_no else None
+        for line in self.__lines:
+            return line.rstrip('\r\n')
+        return None
+
+    @property
+    def line_index(self):
+        """The LineIndex that is read or None"""
+        return self.__line_index
+
+    @property
+    def last_line_no(self):
+        return self.__last_line_no
+
+    @property
+    def line_no(self):
+        return self.__line_no
+
+    @property
+    def line(self):
+        return self.__line
+
+    @property
+    def next_line(self):
+        return self.__next_line
+
+    @property
+    def has_next(self):
+        return self.__next_line is not None
+
+    def advance(self):
+        assert self.__next_line is not None, 'No more lines to read'
+        self.__line = self.__next_line
+        self.__line_no += 1
+        self.__history.append(self.__line)
+        self.__next_line = self.__fetch()
+        return self.__line
+
+    def skip_to(self, line_no):
+        """Makes line_no the current line - the lines before it are not read (only with a LineIndex)"""
+        assert self.__line_index is not None and self.__line_no < line_no <= self.__last_line_no
+        self.__line_no = line_no - 1
+        self.__next_line = self.__fetch()
+        return self.advance()
+
+    def snippet(self, limit=10):
+        """Snippet around the current line built from the remembered lines and the look-ahead line"""
+        lines = list(self.__history)
+        res = ['.... ' + line for line in lines[-(limit // 2) - 1:-1]]
+        if lines:
+            res.append('->.. ' + lines[-1])
+        if self.__next_line is not None:
+            res.append('.... ' + self.__next_line)
+        return '\n'.join(res)
+
+
+class _Children(list):
+    """Collects the children of a lazily parsed block - they are added to their container by its loader."""
+    add = list.append
+
 
 class SydParseError:
-    def __init__(self, line, line_no, invalid_data, col_no=None, msg=''):
+    def __init__(self, line, line_no, invalid_data, col_no=None, msg='', snippet=''):
         self.line = line
         self.line_no = line_no
         self.invalid_data = invalid_data
         self.col_no = col_no
         self.msg = msg
+        self.snippet = snippet
+
+    def __str__(self):
+        return f'Line {self.line_no}: {self.msg}'
+
+    def __repr__(self):
+        return repr(self.__str__())
 
 
 @enum.unique
@@ -66,27 +215,96 @@ class _ParseState(enum.Enum):
 
 
 class SydParser:
-    def __init__(self, text, debug=False):
-        self.__text = text
+    def __init__(self, text, debug=False, collect_errors=False, base_dir=None, include_resolver=None):
+        """
+        `text` is either the whole document as a string or any iterable of lines (e.g. an open file); lines are
+        pulled from the iterable lazily as parsing proceeds.
+        With collect_errors, parsing does not stop at the first error: the broken line (or block) is skipped and a
+        SydParseError is recorded in `errors`.
+        Paths of `!include` directives are relative to base_dir (the current directory by default). For string
+        sources all the included files are parsed before the document, in parallel with an IncludeResolver that has
+        workers (see syd.include). Other sources resolve includes one by one when they are reached.
+        """
         self.__debug = debug
+        self.__base_dir = base_dir
+        self.__include_resolver = include_resolver
         self.__tree = SydContainer('__root__')
-        self.__error = None
-        self.__lines = self.__text.splitlines()
-        self.__current_line_no = 0
+        self.__collect_errors = collect_errors
+        self.__errors = []
+        if isinstance(text, str):
+            self.__line_index = LineIndex(text)
+            text = self.__line_index
+        else:
+            self.__line_index = None
+        self.__reader = _LineReader(text)
+        self.__lazy = False
+        # multiline strings of string sources are LinesView-s until the tree materializes them
+        self.__text_views = False
+        # whether blocks were still open at the end of the text
+        self.__open_at_end = False
 
         self.__parse_states = []
-        self.__container_stack = [self.__tree]
+        # blocks opened but not ended yet: (key, end char, end event, state)
+        self.__open_blocks = []
+
+    @classmethod
+    def parse_file(cls, fileobj, debug=False, **kwargs):
+        """Parses an open (text mode) file object without reading all of it into memory first"""
+        return cls.for_file(fileobj, debug=debug, **kwargs).parse()
+
+    @classmethod
+    def for_file(cls, fileobj, debug=False, **kwargs):
+        """Parser of an open file - includes are resolved relative to the directory of the file"""
+        name = getattr(fileobj, 'name', None)
+        if isinstance(name, str) and 'base_dir' not in kwargs:
+            kwargs['base_dir'] = os.path.dirname(os.path.abspath(name))
+        return cls(fileobj, debug=debug, **kwargs)
+
+    @property
+    def included_files(self):
+        """(path, content hash) of every file included while parsing, directly or not"""
+        if self.__include_resolver is None:
+            return ()
+        return self.__include_resolver.dependencies
 
     def __dprint(self, *args, **kwargs):
         if self.__debug:
             print(*args, **kwargs)
 
+    @property
+    def __current_line_no(self):
+        return self.__reader.line_no
+
     @property
     def __fmt_error_msg(self):
-        line = self.__lines[self.__current_line_no - 1]
+        line = self.__reader.line
         return f"Line no: {self.__current_line_no}\n"\
             f"Line: {line}\nCurrent Processing States Stack: {', '.join(str(state) for state in self.__parse_states)}"
 
+    @property
+    def errors(self):
+        """SydParseError-s collected so far (only with collect_errors)"""
+        return tuple(self.__errors)
+
+    def __snippet(self):
+        if self.__line_index is not None:
+            return self.__line_index.snippet(self.__current_line_no, limit=10)
+        return self.__reader.snippet(limit=10)
+
+    def __parse_error(self, msg):
+        line = self.__reader.line
+        snippet = self.__snippet()
+        err = SynamicSydParseError(
+            f'{msg}:\n{self.__fmt_error_msg}\n'
+            f'Details:\n{snippet}',
+            parse_error=SydParseError(line, self.__current_line_no, line.strip() if line else line, msg=msg,
+                                      snippet=snippet)
+        )
+        return err
+
+    def __event(self, event, key, value=None, datatype=None):
+        return SydEvent(event, key, value, datatype, self.__current_line_no)
+
     def __enter_state(self, state: _ParseState):
         self.__parse_states.append(state)
 
@@ -108,62 +326,206 @@ class SydParser:
     def __current_level(self):
         return len(self.__parse_states)
 
-    def parse(self):  # (-1)
-        if len(self.__lines) != 0:
-            assert self.__current_line_no == 0
-            self.__enter_state(_ParseState.processing_block)
-            self.__process_block('__root__')  # root doc is considered a single block.
-            self.__leave_state(_ParseState.processing_block)
+    def parse(self, lazy=False):  # (-1)
+        """
+        Builds the SydContainer tree - it is just one consumer of the event stream.
+        With lazy, nested blocks of any level are only scanned for their end line and their body is parsed the first
+        time the container is accessed. Errors inside a nested block are then raised on that access.
+        """
+        self.__lazy = lazy
+        self.__text_views = True
+        line_index = self.__line_index
+        if line_index is not None and '!include' in line_index.text and INCLUDE_PATTERN.search(line_index.text):
+            # parse all the included files first (in parallel when the resolver has workers)
+            self.__resolver.prepare(line_index.text, self.__base_dir)
+        events = self.iter_events()
+        next(events)  # start of the root block
+        self.__build(events, self.__tree)
+        # interpolation is resolved once the whole tree (or with lazy, the loaded part of it) is there
+        self.__tree.interpolate()
         return self.__tree
 
-    def __process_block(self, key, block_type=None):  # (0)
-        """This loop is used at the root and at any nested level (root from that perspective)"""
-        assert self.__current_state in (_ParseState.processing_block, _ParseState.processing_list)
-        if key != '__root__':
-            if self.__current_state == _ParseState.processing_list:
-                is_list = True
+    @staticmethod
+    def __build(events, root):
+        stack = [root]
+        for event, key, value, datatype, _ in events:
+            if event is SydEventType.scalar:
+                stack[-1].add(SydData(key, value, datatype))
+            elif event is SydEventType.start_block or event is SydEventType.start_list:
+                container = SydContainer(key, is_list=event is SydEventType.start_list)
+                stack[-1].add(container)
+                stack.append(container)
+            elif event is _DEFERRED_BLOCK:
+                is_list, loader = value
+                container = SydContainer(key, is_list=is_list)
+                container.syd_set_children_loader(loader, after_load=SydContainer.interpolate)
+                stack[-1].add(container)
             else:
-                is_list = False
-            parent_container = SydContainer(key, is_list=is_list)
-            root_container = self.__container_stack[-1]
-            root_container.add(parent_container)
-            self.__container_stack.append(parent_container)
-
-        while self.__current_line_no < len(self.__lines):
-            # this top level while lool will process only the top level lines/key-values
-            self.__current_line_no += 1
-            line = self.__lines[self.__current_line_no - 1]
-            self.__dprint("Line %s: %s" % (self.__current_line_no, line))
+                del stack[-1]
+
+    @classmethod
+    def _parse_deferred_children(cls, lines, is_list, first_line_no, debug=False, base_dir=None,
+                                 include_resolver=None, last_line_no=None):
+        """
+        Children loader of a lazily parsed block: parses the lines of its body and returns its children.
+        lines is the LineIndex of the whole source (the body ends at last_line_no) or the lines of the body.
+        """
+        parser = cls((), debug=debug, base_dir=base_dir, include_resolver=include_resolver)
+        parser.__reader = _LineReader(lines, line_no=first_line_no - 1, last_line_no=last_line_no)
+        if isinstance(lines, LineIndex):
+            parser.__line_index = lines
+        parser.__lazy = True
+        parser.__text_views = True
+        parser.__enter_state(_ParseState.processing_list if is_list else _ParseState.processing_block)
+        children = _Children()
+        parser.__build(parser.__process_block(), children)
+        return children
+
+    @classmethod
+    def _parse_region(cls, lines, first_line_no=1, debug=False, base_dir=None, include_resolver=None):
+        """
+        Parses the top level items of a part of a document (see SydDocument), without interpolation.
+        Returns the items, the number of the last line of every item and whether blocks were still open at the end.
+        """
+        parser = cls((), debug=debug, base_dir=base_dir, include_resolver=include_resolver)
+        parser.__reader = _LineReader(lines, line_no=first_line_no - 1)
+        parser.__text_views = True
+        parser.__enter_state(_ParseState.processing_block)
+        last_line_nos = []
+
+        def events():
+            depth = 0
+            for event in parser.__process_block():
+                if event.event is SydEventType.start_block or event.event is SydEventType.start_list:
+                    depth += 1
+                elif event.event is SydEventType.end_block or event.event is SydEventType.end_list:
+                    depth -= 1
+                if depth == 0:
+                    last_line_nos.append(event.line_no)
+                yield event
+
+        children = _Children()
+        parser.__build(events(), children)
+        return children, last_line_nos, parser.__open_at_end
+
+    def iter_events(self):
+        """
+        Generates SydEvent-s (SAX style) while the lines are being read.
+        The whole document is wrapped in a `start_block`/`end_block` pair with the key `__root__`.
+        """
+        assert self.__current_line_no == 0
+        yield self.__event(SydEventType.start_block, '__root__')
+        if self.__reader.has_next:
+            self.__enter_state(_ParseState.processing_block)
+            yield from self.__process_block()  # root doc is considered a single block.
+            self.__leave_state(_ParseState.processing_block)
+        yield self.__event(SydEventType.end_block, '__root__')
+
+    def __process_block(self):  # (0)
+        """
+        Processes the lines of the current block and of all the blocks nested in it.
+        Nesting is kept on an explicit stack of open blocks next to the parse states instead of recursion, so the
+        depth of a document is only limited by memory.
+        """
+        assert self.__current_state in (_ParseState.processing_block, _ParseState.processing_list)
+        reader = self.__reader
+        open_blocks = self.__open_blocks
+        base_level = len(open_blocks)
+        while reader.has_next:
+            line = reader.advance()
+            if self.__debug:
+                self.__dprint("Line %s: %s" % (reader.line_no, line))
 
             # ignore empty line: empty lines are ignored only when they are at the top level (no matter how indented)
             stripped_line = line.strip()
             if stripped_line == '':
                 continue
             # ignore comment
-            elif self.__is_comment(stripped_line):
+            elif stripped_line.startswith(_COMMENT_STARTS):
                 continue
             # leave block
-            is_block_end, block_end_type = self.__block_end(line)
-            if is_block_end:
-                if block_type == '{':
-                    if block_end_type == '}':
-                        # self.current_line_no += 1
-                        break
-                elif block_type == '[':
-                    if block_end_type == ']':
-                        # self.current_line_no += 1
+            if len(open_blocks) > base_level and stripped_line[0] in '}]':
+                is_block_end, block_end_type = self.__block_end(line)
+                if is_block_end and block_end_type == open_blocks[-1][1]:
+                    yield self.__close_block()
+                    continue
+            event = self.__simple_scalar(line, stripped_line)
+            if event is not None:
+                yield event
+                continue
+            if not self.__collect_errors:
+                yield from self.__process_block_items()
+            else:
+                states_len = len(self.__parse_states)
+                try:
+                    yield from self.__process_block_items()
+                except SynamicSydParseError as err:
+                    self.__errors.append(err.parse_error)
+                    del self.__parse_states[states_len:]
+                    self.__recover()
+        # end of text - blocks that are still open end here
+        while len(open_blocks) > base_level:
+            self.__open_at_end = True
+            yield self.__close_block()
+
+    def __simple_scalar(self, line, stripped_line):
+        """
+        Fast path for the most common lines: the scalar event of a `key: value` line of a block or of a value line of a
+        list when the value is a single bare scalar - None for any other line (they are processed in full).
+        """
+        state = self.__parse_states[-1]
+        if state is _ParseState.processing_block:
+            key_match = _Patterns.key_pattern.match(line)
+            if key_match is None or key_match.group('is_multiline'):
+                return None
+            text = line[key_match.end():].strip()
+            key = sys.intern(key_match.group('key'))
+        elif state is _ParseState.processing_list:
+            text = stripped_line
+            key = None
+        else:
+            return None
+        if text[:1] in _NOT_SIMPLE:
+            return None
+        try:
+            value, datatype = self.__classify_bare_scalar(text)
+        except (ValueError, SynamicInvalidDateTimeFormat):
+            return None  # the error is raised by the full processing
+        return SydEvent(SydEventType.scalar, key, value, datatype, self.__reader.line_no)
+
+    def __open_block(self, key, block_type):
+        if block_type == '{':
+            state, start_event, end_event, end_char = \
+                _ParseState.processing_block, SydEventType.start_block, SydEventType.end_block, '}'
+        else:
+            state, start_event, end_event, end_char = \
+                _ParseState.processing_list, SydEventType.start_list, SydEventType.end_list, ']'
+        self.__enter_state(state)
+        self.__open_blocks.append((key, end_char, end_event, state))
+        return self.__event(start_event, key)
+
+    def __close_block(self):
+        key, _, end_event, state = self.__open_blocks.pop()
+        self.__leave_state(state)
+        return self.__event(end_event, key)
+
+    def __recover(self):
+        """Skips the rest of a broken block or multiline string so that parsing resumes after it"""
+        reader = self.__reader
+        if reader.line_no != self.__errors[-1].line_no:
+            return  # already moved past the broken line (e.g. reached the end of text)
+        opener = _Patterns.broken_block_opener.match(reader.line)
+        if opener:
+            if opener.group('is_multiline') and opener.group('open') == '{':
+                while reader.has_next:
+                    if reader.advance().strip(' \t') == '}':
                         break
-            self.__process_block_items()
-        del self.__container_stack[-1]
-
-    def __process_key_value(self):
-        pass
-
-    def __process_value(self):
-        pass
+            else:
+                self.__skip_block()
 
     def __process_block_items(self):  # (1)
-        line = self.__lines[self.__current_line_no - 1]
+        """Processes the item on the current line and returns its events. A nested block is only opened here."""
+        line = self.__reader.line
         #  text = line
 
         #  extract key
@@ -172,19 +534,20 @@ class SydParser:
         is_multiline = False
         multiline_token = None
         if self.__current_state not in (_ParseState.processing_list, _ParseState.processing_block_string):
+            if line.lstrip(' \t').startswith('!'):
+                include_match = INCLUDE_PATTERN.match(line)
+                if include_match:
+                    return self.__process_include(include_match)
             key_match = _Patterns.key_pattern.match(line)
             if key_match:
-                key = key_match.group('key')
+                # keys repeat across blocks, every node of a key shares one string
+                key = sys.intern(key_match.group('key'))
                 multiline_token = key_match.group('is_multiline')
                 is_multiline = bool(multiline_token)
                 end_pos = key_match.end()
             else:
                 self.__dprint("error in line: %s" % line)
-                err = SynamicSydParseError(
-                    f'Syd Parsing key match error:\n{self.__fmt_error_msg}\n'
-                    f'Details:\n{get_source_snippet_from_text(self.__text, self.__current_line_no, limit=10)}'
-                )
-                raise err
+                raise self.__parse_error('Syd Parsing key match error')
         else:
             multiline_match = _Patterns.is_multiline_pattern.match(line, end_pos)
             if multiline_match:
@@ -192,165 +555,194 @@ class SydParser:
                 is_multiline = bool(multiline_token)
                 end_pos = multiline_match.end()
 
-        # self.__dprint("\nKEY: %s" % str(key))
-        # self.__dprint("\nLINE END: %s" % line[end_pos:])
         # process multi line block
         # multi line string processing
 
         line_end = line[end_pos:].lstrip()
-        next_line = self.__next_line
+        next_line = self.__reader.next_line
         is_block_start, block_type = self.__block_start(line_end, next_line)
         inline_list_match = _Patterns.inline_list.match(line_end)
         if is_multiline:
-            # end_pos += multiline_match.end()
             self.__enter_state(_ParseState.processing_block_string)
-            self.__process_datum_ml_string(end_pos, key, multiline_token)
+            events = (self.__process_datum_ml_string(end_pos, key, multiline_token),)
             self.__leave_state(_ParseState.processing_block_string)
         # so it is not a multi line stuff
         # is it nested stuff?
         elif is_block_start:
-            if block_type == '{':
-                self.__enter_state(_ParseState.processing_block)
-                # self.current_line_no += 1
-                self.__process_block(key, block_type)
-                #
-                self.__leave_state(_ParseState.processing_block)
-            elif block_type == '[':
-                self.__enter_state(_ParseState.processing_list)
-                self.__process_block(key, block_type)
-                self.__leave_state(_ParseState.processing_list)
+            if block_type not in ('{', '['):
+                raise self.__parse_error('Syd Parsing error - Something is horribly wrong')
+            elif self.__lazy:
+                events = (self.__deferred_block(key, block_type == '['),)
             else:
-                err = SynamicSydParseError(
-                    f'Syd Parsing error - Something is horribly wrong:\n{self.__fmt_error_msg}\n'
-                    f'Details:\n{get_source_snippet_from_text(self.__text, self.__current_line_no, limit=10)}'
-                )
-                raise err
+                # the lines of the block are processed by the loop in __process_block()
+                events = (self.__open_block(key, block_type),)
         # inline list
         elif inline_list_match:
             content = inline_list_match.group('content')
-            cnt = SydContainer(key, is_list=True)
-            self.__container_stack[-1].add(cnt)
-            self.__container_stack.append(cnt)
             self.__enter_state(_ParseState.processing_inline_list)
-            parts = self.__process_datum_inline(content, None, True)
-            for part in parts:
-                cnt.add(part)
+            values = self.__process_datum_inline(content, True)
+            events = [self.__event(SydEventType.start_list, key)]
+            for value, datatype in values:
+                events.append(self.__event(SydEventType.scalar, None, value, datatype))
+            events.append(self.__event(SydEventType.end_list, key))
             self.__leave_state(_ParseState.processing_inline_list)
-            del self.__container_stack[-1]
         elif self.__is_inline(line_end, next_line):
             self.__enter_state(_ParseState.processing_inline)
-            data = self.__process_datum_inline(line_end, key)
-            self.__container_stack[-1].add(data)
-            # must not increment as it it is inline: X self.current_line_no += 1
+            value, datatype = self.__process_datum_inline(line_end)[0]
+            events = (self.__event(SydEventType.scalar, key, value, datatype),)
             self.__leave_state(_ParseState.processing_inline)
         else:
-            err = SynamicSydParseError(
-                f'Syd Parsing error - could not parse:\n{self.__fmt_error_msg}\n'
-                f'Details:\n{get_source_snippet_from_text(self.__text, self.__current_line_no, limit=10)}'
-            )
-            raise err
+            raise self.__parse_error('Syd Parsing error - could not parse')
+        return events
+
+    @property
+    def __resolver(self):
+        if self.__include_resolver is None:
+            self.__include_resolver = IncludeResolver()
+        return self.__include_resolver
+
+    def __process_include(self, include_match):
+        """The entries of the included file become entries of the current block"""
+        path = self.__resolver.resolve_path(include_match.group('path'), self.__base_dir)
+        try:
+            tree = self.__resolver.tree(path, if_exists=include_match.group('directive') == 'include_if_exists')
+        except SynamicSydParseError as err:
+            raise self.__parse_error(f'Syd Parsing error - {err.args[0]}')
+        if tree is None:
+            return ()
+        return list(tree_events(tree, self.__current_line_no))[1:-1]
+
+    def __deferred_block(self, key, is_list):
+        line_no = self.__current_line_no
+        line_index = self.__line_index
+        if line_index is not None:
+            # only the line span is recorded, the lines are sliced out of the text when the block is loaded.
+            found_end, _ = self.__skip_block()
+            last_line_no = self.__current_line_no - 1 if found_end else self.__current_line_no
+            lines = line_index
+        else:
+            _, lines = self.__skip_block(collect=True)
+            last_line_no = None
+        loader = functools.partial(self._parse_deferred_children, lines, is_list, line_no + 1, self.__debug,
+                                   self.__base_dir, self.__include_resolver, last_line_no)
+        return SydEvent(_DEFERRED_BLOCK, key, (is_list, loader), None, line_no)
+
+    def __skip_block(self, collect=False):
+        """
+        Skips the body of a nested block without parsing it and leaves the reader on its end line.
+        Nested blocks are brace matched and inside multiline strings only their own end line is looked for.
+        Returns whether the end line was found and, with collect, the body lines.
+        """
+        reader = self.__reader
+        lines = [] if collect else None
+        depth = 1
+        in_ml_string = False
+        while reader.has_next:
+            line = reader.advance()
+            stripped_line = line.strip(' \t')
+            if in_ml_string:
+                if stripped_line == '}':
+                    in_ml_string = False
+            elif stripped_line == '}' or stripped_line == ']':
+                depth -= 1
+                if depth == 0:
+                    return True, lines
+            elif '{' in line or '[' in line:
+                opener = _Patterns.block_opener.match(line)
+                if opener:
+                    if opener.group('is_multiline') and opener.group('open') == '{':
+                        in_ml_string = True
+                    else:
+                        depth += 1
+            if collect:
+                lines.append(line)
+        return False, lines
 
     def __process_datum_ml_string(self, end_pos, key, multiline_token):  # (1.1)
-        line = self.__lines[self.__current_line_no - 1]
+        line = self.__reader.line
         line_end = line[end_pos:].lstrip()
         if not line_end.startswith('{'):
-            err = SynamicSydParseError(
-                f'Syd Parsing error - ...:\n{self.__fmt_error_msg}\n'
-                f'Details:\n{get_source_snippet_from_text(self.__text, self.__current_line_no, limit=10)}'
-            )
-            raise err
+            raise self.__parse_error('Syd Parsing error - ...')
         else:
-            lines = []
             line_end = line_end[1:]
 
             # test & ignore first line if valid code follows (starts with {)
             if line_end.strip() == '' or self.__is_comment(line_end):
                 pass  # ignore empty line or comment for the first line.
             else:
-                err = SynamicSydParseError(
-                    f'Syd Parsing error - Multiline string starting line cannot contain data (only comment or blank)'
-                    f':\n{self.__fmt_error_msg}\n'
-                    f'Details:\n{get_source_snippet_from_text(self.__text, self.__current_line_no, limit=10)}'
+                raise self.__parse_error(
+                    'Syd Parsing error - Multiline string starting line cannot contain data (only comment or blank)'
                 )
-                raise err
 
-            # now collect lines until you get a } on a single line.
+            # the string ends at a } on a single line.
             # if a line contains only one } and you want to make that literal then escape it with \
-            # extract lines
+            if self.__reader.line_index is not None:
+                value = self.__ml_string_view(multiline_token == '~')
+            else:
+                value = self.__ml_string_lines(multiline_token == '~')
+            # TODO: process ~~~ for escape chars & special sequences.
+            return self.__event(SydEventType.scalar, key, value, SydDataType.string)
+
+    def __ml_string_view(self, dedented):
+        """
+        Finds the end of a multiline string with one search in the source text and skips the reader to it.
+        The body is only the line numbers (and indentation) of a LinesView - with one pass over the line offsets.
+        """
+        reader = self.__reader
+        line_index = reader.line_index
+        text = line_index.text
+        first_line_no = reader.line_no + 1
+        end_line_no = None
+        if first_line_no <= reader.last_line_no:
+            pos = line_index.start(first_line_no)
+            limit = line_index.end(reader.last_line_no)
             while True:
-                self.__current_line_no += 1
-                line = self.__lines[self.__current_line_no - 1]
-                is_block_end, end_char = self.__block_end(line)
-                if is_block_end and end_char == '}':
+                # str.find() is much faster than a regex search for the brace
+                pos = text.find('}', pos, limit)
+                if pos == -1:
                     break
-                if line.strip(' \t') == r'\}':
-                    # unescape starting curly brace.
-                    line = line.replace(r'\}', '}')
-
-                lines.append(line)
-                if self.__current_line_no == len(self.__lines):
-                    err = SynamicSydParseError(
-                        f'Syd Parsing error - End of text but no end to the newline found'
-                        f':\n{self.__fmt_error_msg}\n'
-                        f'Details:\n{get_source_snippet_from_text(self.__text, self.__current_line_no, limit=10)}'
-                    )
-                    raise err
-
-                    # process lines
-                    # > if is_multiline == '~~'
-                    # blah blah blah
-            if multiline_token == '~':
-                processed_lines = []
-                ind_sizes = []
-                for line in lines:
-                    match = _Patterns.multiline_spaces.match(line)
-                    spaces = match.group() if match.group() is not None else ''
-                    size = 0
-                    for space in spaces:
-                        if space == ' ':
-                            size += 1
-                        elif space == '\t':
-                            size += 4
-                    ind_sizes.append(size)
-                if len(ind_sizes) > 0:
-                    ind_size = min(ind_sizes)
-                else:
-                    ind_size = 0
-
-                # process lines.
-                for line in lines:
-                    idx = 0
-                    ind_limit = 0
-                    for char in line:
-                        while ind_limit < ind_size:
-                            if char == ' ':
-                                ind_limit += 1
-                            elif char == '\t':
-                                ind_limit += 4
-                            else:
-                                break
-                            idx += 1
-                    res_line = line[idx:]
-                    processed_lines.append(res_line)
-            elif multiline_token == '~~':
-                processed_lines = lines
-            else:
-                assert multiline_token == '~~~'
-                processed_lines = lines
-                # TODO: process for escape chars & special sequences.
-
-            data = SydData(key, '\n'.join(processed_lines), SydDataType.string)
-            self.__container_stack[-1].add(data)
-
-    def __process_datum_inline(self, text, key, processing_inline_list=False):
+                line_no = line_index.line_no_at(pos)
+                if _Patterns.multiline_end.match(text, pos) and \
+                        text[line_index.start(line_no):pos].strip(' \t') == '':
+                    end_line_no = line_no
+                    break
+                pos += 1
+        if end_line_no is None or end_line_no > reader.last_line_no:
+            if reader.has_next:
+                reader.skip_to(reader.last_line_no)
+            raise self.__parse_error('Syd Parsing error - End of text but no end to the newline found')
+        reader.skip_to(end_line_no)
+        last_line_no = end_line_no - 1
+        indent = 0
+        if dedented and first_line_no <= last_line_no:
+            indent = line_index.min_indent_width(first_line_no, last_line_no)
+        view = LinesView(line_index, first_line_no, last_line_no, indent)
+        return view if self.__text_views else str(view)
+
+    def __ml_string_lines(self, dedented):
+        """Collects the lines of a multiline string up to its end line"""
+        lines = []
+        while True:
+            if not self.__reader.has_next:
+                raise self.__parse_error('Syd Parsing error - End of text but no end to the newline found')
+            line = self.__reader.advance()
+            is_block_end, end_char = self.__block_end(line)
+            if is_block_end and end_char == '}':
+                break
+            if line.strip(' \t') == r'\}':
+                # unescape starting curly brace.
+                line = line.replace(r'\}', '}')
+            lines.append(line)
+        if dedented and lines:
+            indent = min(indent_width(line) for line in lines)
+            lines = [dedent(line, indent) for line in lines]
+        return '\n'.join(lines)
+
+    def __process_datum_inline(self, text, processing_inline_list=False):
         try:
-            return self.convert_to_scalar_values(text, key, processing_inline_list=processing_inline_list)
-        except ValueError as ve:
-            err = SynamicSydParseError(
-                f'Syd Parsing error - value error ({ve.args[0]}):\n{self.__fmt_error_msg}\n'
-                f'Details:\n{get_source_snippet_from_text(self.__text, self.__current_line_no, limit=10)}'
-            )
-            raise err
+            return self.scalar_values(text, processing_inline_list=processing_inline_list)
+        except (ValueError, SynamicInvalidDateTimeFormat) as ve:
+            raise self.__parse_error(f'Syd Parsing error - value error ({ve.args[0]})')
 
     @staticmethod
     def __extract_key(text):
@@ -393,11 +785,7 @@ class SydParser:
                 # so this is a block
                 return True, lstripped_text[0]
             else:
-                err = SynamicSydParseError(
-                    f'Syd Parsing error - Something is horribly wrong!:\n{self.__fmt_error_msg}\n'
-                    f'Details:\n{get_source_snippet_from_text(self.__text, self.__current_line_no, limit=10)}'
-                )
-                raise err
+                raise self.__parse_error('Syd Parsing error - Something is horribly wrong!')
         return False, None
 
     @staticmethod
@@ -409,13 +797,6 @@ class SydParser:
             return True, ']'
         return False, None
 
-    @property
-    def __next_line(self):
-        next_line = None
-        if self.__current_line_no < len(self.__lines):  # current line is the last line:
-            next_line = self.__lines[self.__current_line_no]
-        return next_line
-
     #  InlineDataProcessors
     single_quoted_string_stop = re.compile(r"(?<!\\)'")
     double_quoted_string_stop = re.compile(r'(?<!\\)"')
@@ -452,6 +833,18 @@ class SydParser:
 
     @classmethod
     def convert_to_scalar_values(cls, text, key, processing_inline_list=False):
+        data_list = [
+            SydData(key, value, datatype) for value, datatype in
+            cls.scalar_values(text, processing_inline_list=processing_inline_list)
+        ]
+        if processing_inline_list:
+            return data_list
+        else:
+            return data_list[0]
+
+    @classmethod
+    def scalar_values(cls, text, processing_inline_list=False):
+        """Infers scalars from text and returns a list of `(value, SydDataType)` pairs"""
         data_list = []
         text = text.strip(' \t\r\n')
 
@@ -461,7 +854,7 @@ class SydParser:
                 if text.startswith("'"):  # and text.endswith("'"):
                     content = text[1:]
                     res, text, _ = cls.__single_q_string(content)
-                    data = SydData(key, res, SydDataType.string)
+                    data = (res, SydDataType.string)
                 # double quoted string
                 else:  # text.startswith('"'):  # and text.endswith('"'):
                     content = text[1:]
@@ -469,7 +862,7 @@ class SydParser:
                     res = res.replace(r'\n', '\n')
                     res = res.replace(r'\r', '\r')
                     res = res.replace(r'\t', '\t')
-                    data = SydData(key, res, SydDataType.string)
+                    data = (res, SydDataType.string)
 
                 if processing_inline_list:
                     next_comma_match = _Patterns.inline_list_separator.search(text)
@@ -478,12 +871,8 @@ class SydParser:
                         text = text[next_stop:]
                 else:
                     if text.strip() != '':
-                        err = SynamicSydParseError(
-                            f'Syd Parsing error - We are not processing inline list, but still there are some data left'
-                            f' after converting one:\n{self.__fmt_error_msg}\n'
-                            f'Details:\n{get_source_snippet_from_text(self.__text, self.__current_line_no, limit=10)}'
-                        )
-                        raise err
+                        raise ValueError('We are not processing inline list, but still there are some data left'
+                                         ' after converting one')
             else:
                 orig_end = text
                 next_stop = len(text)
@@ -497,63 +886,115 @@ class SydParser:
                         text = orig_end[next_stop:]
                 data_part = data_part.strip()
 
-                number_match = _Patterns.number.match(data_part)
-                datetime_match = _Patterns.datetime.match(data_part)
-                date_match = _Patterns.date.match(data_part)
-                time_match = _Patterns.time.match(data_part)
-
-                # number
-                if number_match:
-                    num_str = number_match.group('number')
-                    if num_str.startswith(('+', '-')):
-                        sign = num_str[0]
-                        num_str = num_str[0:]
-                        sign_mul = 1 if sign == '+' else -1
-                    else:
-                        sign_mul = 1
-                    if data_part.isdigit():
-                        number = int(data_part)
-                    else:
-                        number = float(data_part)
-                    number = number * sign_mul
-                    data = SydData(key, number, SydDataType.number)
-                # date-time match
-                elif datetime_match:
-                    dt_instance = parse_datetime(datetime_match)
-                    data = SydData(key, dt_instance, SydDataType.datetime)
-                # date match
-                elif date_match:
-                    date_instance = parse_date(date_match)
-                    data = SydData(key, date_instance, SydDataType.date)
-
-                # time match
-                elif time_match:
-                    time_instance = parse_time(time_match)
-                    data = SydData(key, time_instance, SydDataType.time)
-                # bare string : last resort
-                else:
-                    bare_string = data_part
-                    if len(bare_string) > 1:
-                        if bare_string[0:2] in (r'\(', r'\{', r'\['):
-                            bare_string = bare_string[2:]
-                    bare_string = bare_string.strip()
-                    data = SydData(key, bare_string, SydDataType.string)
+                data = cls.__classify_bare_scalar(data_part)
 
             data_list.append(data)
             text = text.strip()
 
         if len(data_list) == 0:
             # bare string
-            data_list.append(
-                SydData(key, '', SydDataType.string)
-            )
+            data_list.append(('', SydDataType.string))
 
-        if processing_inline_list:
-            return data_list
-        else:
-            return data_list[0]
+        return data_list
+
+    @classmethod
+    def __classify_bare_scalar(cls, data_part):
+        """
+        Dispatches on the leading character and length so that at most one matcher runs:
+        a letter means a string right away, a sign means a number candidate and a digit is a number, date-time or
+        time candidate depending on the separator position.
+        """
+        first = data_part[:1]
+        if first in _DIGITS:
+            if len(data_part) >= 8 and data_part[4] == '-':
+                # date-time - a plain date is matched by the date-time pattern too, so the date pattern never wins.
+                datetime_match = _Patterns.datetime.match(data_part)
+                if datetime_match:
+                    return parse_datetime(datetime_match), SydDataType.datetime
+            elif ':' in data_part[1:3]:
+                time_match = _Patterns.time.match(data_part)
+                if time_match:
+                    return parse_time(time_match), SydDataType.time
+            elif _Patterns.number.match(data_part):
+                return cls.__to_number(data_part), SydDataType.number
+        elif first in _SIGNS:
+            if _Patterns.number.match(data_part):
+                return cls.__to_number(data_part), SydDataType.number
+
+        # bare string : last resort
+        bare_string = data_part
+        if len(bare_string) > 1:
+            if bare_string[0:2] in (r'\(', r'\{', r'\['):
+                bare_string = bare_string[2:]
+        bare_string = bare_string.strip()
+        return bare_string, SydDataType.string
+
+    @staticmethod
+    def __to_number(num_str):
+        """num_str must already be matched by the number pattern"""
+        if '.' in num_str:
+            return float(num_str)
+        return int(num_str)
 
     @classmethod
     def covert_one_value(cls, text):
         syd_scalar = cls.convert_to_scalar_values(text, '__null__', processing_inline_list=False)
         return syd_scalar.value
+
+
+def tree_events(syd, line_no=0):
+    """Generates the SydEvent-s that would produce the given SydContainer (or SydData)"""
+    if not syd.is_container:
+        yield SydEvent(SydEventType.scalar, syd.key, syd.value_origin, syd.type, line_no)
+        return
+    stack = [(syd, iter(syd.get_children()))]
+    yield SydEvent(SydEventType.start_list if syd.is_list else SydEventType.start_block, syd.key, None, None, line_no)
+    while stack:
+        container, children = stack[-1]
+        for child in children:
+            if child.is_container:
+                yield SydEvent(SydEventType.start_list if child.is_list else SydEventType.start_block, child.key,
+                               None, None, line_no)
+                stack.append((child, iter(child.get_children())))
+                break
+            yield SydEvent(SydEventType.scalar, child.key, child.value_origin, child.type, line_no)
+        else:
+            stack.pop()
+            yield SydEvent(SydEventType.end_list if container.is_list else SydEventType.end_block, container.key,
+                           None, None, line_no)
+
+
+class SydTemplateFound(Exception):
+    """Raised by the builders of build_from_text() at a string that needs interpolation (a string with a `$`)"""
+
+
+def build_from_text(text, build, **kwargs):
+    """
+    build(events, check_templates) of a document, built while it is parsed (kwargs go to SydParser). When build
+    raises SydTemplateFound the document is parsed into a tree first, so the references are interpolated, and the
+    events of the tree are built with check_templates False.
+    """
+    try:
+        return build(SydParser(text, **kwargs).iter_events(), True)
+    except SydTemplateFound:
+        return build(tree_events(SydParser(text, **kwargs).parse()), False)
+
+
+def build_from_file(fileobj, build, **kwargs):
+    """build_from_text() of an open (text mode) file - includes are resolved relative to the directory of the file"""
+    name = getattr(fileobj, 'name', None)
+    if isinstance(name, str) and 'base_dir' not in kwargs:
+        kwargs['base_dir'] = os.path.dirname(os.path.abspath(name))
+    return build_from_text(fileobj.read(), build, **kwargs)
+
+
+def iterparse(source, debug=False):
+    """
+    Generates SydEvent-s from a file path or an open text file, reading it line by line.
+    Peak memory is bounded by the nesting depth of the document, not by its size.
+    """
+    if hasattr(source, 'read'):
+        yield from SydParser.for_file(source, debug=debug).iter_events()
+    else:
+        with open(source, encoding='utf-8') as f:
+            yield from SydParser.for_file(f, debug=debug).iter_events()
@@ -4,13 +4,18 @@ Synamic Data Classes
 import re
 import enum
 import collections
+import functools
 import datetime
 import numbers
+import sys
+import weakref
+from syd.exceptions import SynamicSydInterpolationError
+from syd.utils import LinesView
 
 
 class _Patterns:
     interpolation_identifier = re.compile(r'(?<!\$)\$\{[ \t]*(?P<identifier>'
-                                          r'[a-z_][a-z0-9_]*)[ \t]*\}', re.I)  # escape $ with another - that simple
+                                          r'[a-z_][a-z0-9_]*(?:\.[a-z0-9_]+)*)[ \t]*\}', re.I)  # escape $ with another - that simple
 
 
 @enum.unique
@@ -41,7 +46,184 @@ for syd_type, py_types in syd_to_py_types.items():
         py_to_syd_types[py_type] = syd_type
 
 
+SydInternReport = collections.namedtuple('SydInternReport', ('nodes_shared', 'bytes_saved'))
+
+
+def _node_size(node):
+    """Approximate memory of a node alone (not of its children)"""
+    size = sys.getsizeof(node)
+    attributes = getattr(node, '__dict__', None)
+    if attributes is not None:
+        size += sys.getsizeof(attributes)
+    if isinstance(node, SydContainer):
+        size += node.syd_own_size()
+    elif type(node.value_origin) is str:
+        size += sys.getsizeof(node.value_origin)
+    return size
+
+
+class SydPath:
+    """
+    A compiled path of keys and list indices, e.g. SydPath('servers.0.port'). Lookups with it do not split or
+    convert anything (see SydContainer.get_child()).
+    """
+    __slots__ = ('__text', '__parents', '__last')
+
+    def __init__(self, keys):
+        if isinstance(keys, str):
+            keys = keys.split('.')
+        assert len(keys) > 0, 'Empty path'
+        steps = tuple(int(k) if type(k) is str and k.isdigit() else k for k in keys)
+        self.__text = '.'.join(str(k) for k in steps)
+        self.__parents = steps[:-1]
+        self.__last = steps[-1]
+
+    @property
+    def parents(self):
+        """The steps before the last one"""
+        return self.__parents
+
+    @property
+    def last(self):
+        return self.__last
+
+    @property
+    def steps(self):
+        return self.__parents + (self.__last, )
+
+    def get(self, container, default=None):
+        return container.get(self, default)
+
+    def __eq__(self, other):
+        return isinstance(other, SydPath) and self.__text == other.__text
+
+    def __hash__(self):
+        return hash(self.__text)
+
+    def __str__(self):
+        return self.__text
+
+    def __repr__(self):
+        return f'SydPath({self.__text!r})'
+
+
+@functools.lru_cache(maxsize=4096)
+def path(text):
+    """The compiled SydPath of a dotted path - the last 4096 are cached"""
+    return SydPath(text)
+
+
+class SydReadOnlyDict(collections.OrderedDict):
+    """
+    The value of a block (see SydContainer.as_dict) - an OrderedDict that cannot be changed, as it is cached and
+    shared. It pickles and copies as a plain OrderedDict.
+    """
+    __slots__ = ()
+
+    def __init__(self, items=()):
+        for key, value in items:
+            collections.OrderedDict.__setitem__(self, key, value)
+
+    def __read_only(self, *args, **kwargs):
+        raise TypeError(f'{self.__class__.__name__} cannot be changed')
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = move_to_end = __ior__ = __read_only
+
+    def __reduce__(self):
+        return collections.OrderedDict, (list(self.items()), )
+
+
+class _SydView:
+    """
+    A live view of the children of a container (like the views of dict) - nothing is copied, it iterates the
+    children of the container every time and it sees the changes of the container.
+    """
+    __slots__ = ('__container', )
+
+    def __init__(self, container):
+        self.__container = container
+
+    @property
+    def container(self):
+        return self.__container
+
+    def __len__(self):
+        return self.__container.children_count
+
+    def __eq__(self, other):
+        if isinstance(other, (_SydView, tuple, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({tuple(self)!r})'
+
+
+class SydKeysView(_SydView):
+    """Keys of a block or indices of a list"""
+    __slots__ = ()
+
+    def __iter__(self):
+        container = self.container
+        if container.is_list:
+            return iter(range(container.children_count))
+        return (data.key for data in container.iter_children() if data.key is not None)
+
+    def __contains__(self, key):
+        container = self.container
+        if container.is_list:
+            return type(key) is int and 0 <= key < container.children_count
+        return container.syd_has_key(key)
+
+
+class SydValuesView(_SydView):
+    """
+    Values of the children - the value of each one is taken when it is reached, so the value of a nested container
+    (its cached dict or tuple) is built only then. Use iter_children() to walk nested containers without their
+    values. Values are not converted!!!
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        return (data.value for data in self.container.iter_children())
+
+    def __contains__(self, value):
+        container = self.container
+        if container.is_list:
+            # lists keep an index of their values
+            return value in container
+        return any(data.value == value for data in container.iter_children())
+
+
+class SydItemsView(_SydView):
+    """(key, value) of blocks or (index, value) of lists. Values are not converted!!!"""
+    __slots__ = ()
+
+    def __iter__(self):
+        container = self.container
+        if container.is_list:
+            return enumerate(data.value for data in container.iter_children())
+        return ((data.key, data.value) for data in container.iter_children())
+
+    def __contains__(self, item):
+        if not isinstance(item, tuple) or len(item) != 2:
+            return False
+        key, value = item
+        container = self.container
+        if container.is_list:
+            if type(key) is not int or not 0 <= key < container.children_count:
+                return False
+            return container.get_child(key).value == value
+        if not container.syd_has_key(key):
+            return False
+        return any(data.value == value for data in container.get_child([key], multi=True))
+
+
 class _SydData:
+    __slots__ = ()
+
     @property
     def key(self):
         raise NotImplemented
@@ -69,6 +251,9 @@ class _SydData:
 
 
 class SydData(_SydData):  # Previously SydScalar.
+    __slots__ = ('__key', '__value', '__datatype', '__converter', '__converted_value', '__parent_container',
+                 '__template', '__hash')
+
     def __init__(self, key, value, datatype=None, parent_container=None, converter=None, converted_value=None):
         if key is not None:
             assert '.' not in key, f'Key {key} is invalid where value is {value}'
@@ -84,8 +269,9 @@ class SydData(_SydData):  # Previously SydScalar.
         self.__converter = converter
         self.__converted_value = converted_value
         self.__parent_container = None
+        self.__template = None
+        self.__hash = None
 
-        self.__cached_interpolated_str = None
         self.syd_set_parent(parent_container)
 
     def clone(self, parent_container=None, converter=None, converted_value=None):
@@ -105,45 +291,99 @@ class SydData(_SydData):  # Previously SydScalar.
             value = self.__converted_value
         else:
             if not callable(self.__converter):
-                value = self.__value
+                value = self.value_origin
             else:
-                value = self.__converter(self.__value)
+                value = self.__converter(self.value_origin)
                 assert value is not None
                 self.__value = value
+                self.__changed()
         return value
 
     @property
     def value_origin(self):
-        return self.__value
+        value = self.__value
+        if type(value) is LinesView:
+            # a multiline string is sliced out of the source the first time it is needed
+            value = self.__value = str(value)
+        return value
 
     def set_converted(self, value):
         assert value is not None
+        self.__will_change()
         self.__converted_value = value
+        if self.__parent_container is not None:
+            self.__parent_container.syd_child_value_changed()
 
     @property
     def type(self):
         return self.__datatype
 
+    @property
+    def parent(self):
+        return self.__parent_container
+
     def syd_set_parent(self, p):
         assert type(p) in (SydContainer, type(None))
         assert self.__parent_container is None, 'Cannot re-set parent'
         self.__parent_container = p
 
-        # process interpolation
-        if p is not None:
-            value = self.__value
-            # process interpolation for string
-            if self.__datatype is SydDataType.string:
-                if self.__cached_interpolated_str is not None:
-                    value = self.__cached_interpolated_str
-                else:
-                    value = self.__cached_interpolated_str = _Patterns.interpolation_identifier.sub(self.__interpolation_replacer,
-                                                                                                    value)
-            self.__value = value
+    @property
+    def is_template(self):
+        """Is this a string that still needs interpolation"""
+        return self.__datatype is SydDataType.string and '$' in self.__value
+
+    @property
+    def template(self):
+        """The string before interpolation (None when it was not interpolated)"""
+        return self.__template
+
+    def syd_set_interpolated(self, value):
+        assert self.__datatype is SydDataType.string
+        self.__will_change()
+        if self.__template is None:
+            self.__template = self.value_origin
+        self.__value = value
+        self.__changed()
+        if self.__parent_container is not None:
+            self.__parent_container.syd_child_value_changed()
+
+    def __will_change(self):
+        # clones of the parent that still share this data copy it first
+        if self.__parent_container is not None:
+            self.__parent_container.syd_copy_to_clones()
+
+    # structural hash
+    def __changed(self):
+        self.__hash = None
+        if self.__parent_container is not None:
+            self.__parent_container.syd_invalidate_hash()
+
+    @property
+    def structural_hash(self):
+        """Hash of the key, type and value - cached"""
+        if self.__hash is None:
+            value = self.value_origin
+            try:
+                self.__hash = hash((self.__key, self.__datatype, type(value), value))
+            except TypeError:
+                self.__hash = hash((self.__key, self.__datatype, type(value), repr(value)))
+        return self.__hash
+
+    def syd_same_as(self, other):
+        """Whether other has the same key, type and value"""
+        if self is other:
+            return True
+        if not isinstance(other, SydData) or self.structural_hash != other.structural_hash:
+            return False
+        a, b = self.value_origin, other.value_origin
+        return self.__key == other.key and self.__datatype is other.type and type(a) is type(b) and a == b
 
     def set_converter(self, converter):
         assert not callable(self.__converter)
+        self.__will_change()
         self.__converter = converter
+        if self.__parent_container is not None:
+            self.__parent_container.syd_child_value_changed()
 
     @property
     def converter(self):
@@ -158,32 +398,47 @@ class SydData(_SydData):  # Previously SydScalar.
     def __repr__(self):
         return repr(self.__str__())
 
-    def __interpolation_replacer(self, match):
-        identifier = match.group('identifier')
-        assert self.__key != identifier, 'Key is being interpolated recursively: %s' % identifier
-        if self.__parent_container is not None:
-            v = self.__parent_container.get(identifier, '')
-            assert type(v) in (int, float, str), 'Only number and string data can be interpolated in' \
-                                                 'to a string. Data with' \
-                                                 ' kye `%s` is of type `%s`' % (self.key, str(type(v)))
-            v = str(v)  # convert it in case it is a number.
-            return v
-        else:
-            raise Exception('Parent for key `%s` is set to None' % str(self.__key))
+
+# marks the place of a deleted child of a block until the children are compacted
+_TOMBSTONE = object()
 
 
 class SydContainer(_SydData):
+    __slots__ = ('__key', '__is_list', '__data_list', '__data_list_index_map', '__tombstones', '__value_index',
+                 '__parent_container', '__converter', '__converted_value', '__read_only', '__children_loader',
+                 '__after_load', '__hash', '__identity_hashed', '__clones', '__copied_generation', '__version',
+                 '__materialized', '__materialized_version', '__weakref__')
+
+    # incremented by every clone() - see syd_copy_to_clones()
+    __clone_generation = 0
+
     def __init__(self, key=None, initial_data=(), is_list=False, parent_container=None, converter=None, converted_value=None, read_only=False):
         if key is not None:
             assert '.' not in key
         self.__key = key
         self.__is_list = is_list
         self.__data_list = []
-        self.__data_list_index_map = {}
+        # key -> index of its child (a list of the indices when the key has more than one child), None for lists
+        self.__data_list_index_map = None if is_list else {}
+        self.__tombstones = 0  # deleted children of a block that are still in the data list
+        # value -> count of the children of a list with it, built by the first membership test (False: unhashable)
+        self.__value_index = None
         self.__parent_container = None  # parent_container from init will be set through a method below.
         self.__converter = converter
         self.__converted_value = converted_value
         self.__read_only = read_only
+        self.__children_loader = None
+        self.__after_load = None
+        self.__hash = None
+        self.__identity_hashed = False  # hashed while it was not locked - see __hash__()
+        # id -> clone, of the clones that did not copy the children of this container yet (weak references - by id, as
+        # hashing a clone would fix its hash before it may be locked)
+        self.__clones = None
+        self.__copied_generation = -1
+        # the value built by as_dict/as_tuple is kept while the version it was built at is the current one
+        self.__version = 0
+        self.__materialized = None
+        self.__materialized_version = -1
 
         self.syd_set_parent(parent_container)
 
@@ -194,12 +449,50 @@ class SydContainer(_SydData):
     def parent(self):
         return self.__parent_container
 
-    def clone(self, parent_container=None, converter=None, converted_value=None, read_only=False):
+    # deferred children
+    def syd_set_children_loader(self, loader, after_load=None):
+        """
+        Children are not added now, loader() is called the first time they are needed and the _SydData-s it returns
+        are added to this container. Then after_load(container) is called when provided.
+        """
+        assert callable(loader)
+        assert self.__children_loader is None and len(self.__data_list) == 0, 'Children were already provided'
+        self.__children_loader = loader
+        self.__after_load = after_load
+
+    @property
+    def is_loaded(self):
+        return self.__children_loader is None
+
+    @property
+    def is_read_only(self):
+        return self.__read_only
+
+    def __ensure_loaded(self):
+        """Loads deferred children and removes the tombstones of deleted ones"""
+        if self.__tombstones:
+            self.__compact()
+        loader = self.__children_loader
+        if loader is not None:
+            self.__children_loader = None
+            read_only = self.__read_only
+            self.__read_only = False
+            # loading does not change the content - it is not a change for clones
+            for data in loader():
+                assert isinstance(data, _SydData)
+                self.__append(data, self)
+            if self.__after_load is not None:
+                self.__after_load(self)
+                self.__after_load = None
+            if read_only:
+                self.lock()
+
+    def __clone_without_children(self, parent_container=None, converter=None, converted_value=None, read_only=False):
         if converter is None:
             converter = self.__converter
         if converted_value is None:
             converted_value = self.__converted_value
-        cln = self.__class__(
+        return self.__class__(
             self.__key,
             is_list=self.__is_list,
             parent_container=parent_container,
@@ -207,10 +500,72 @@ class SydContainer(_SydData):
             converted_value=converted_value,
             read_only=read_only
         )
-        for data in self.__data_list:
-            cln.add(data.clone())
+
+    def clone(self, parent_container=None, converter=None, converted_value=None, read_only=False):
+        """
+        Copy on write - the clone shares the children of this container until one of them is needed, then it copies
+        this level only (nested containers become clones in the same way). A change of this container copies its
+        children to the clones that did not do it yet, so changing either side never changes the other.
+        """
+        cln = self.__clone_without_children(parent_container, converter, converted_value, read_only)
+        cln.__hash = self.__hash
+        cln.syd_set_children_loader(self.__cloned_children, after_load=self.__forget_clone)
+        if self.__clones is None:
+            self.__clones = weakref.WeakValueDictionary()
+        self.__clones[id(cln)] = cln
+        SydContainer.__clone_generation += 1
         return cln
-    copy = clone
+
+    def __cloned_children(self):
+        for data in self.iter_children():
+            yield data.clone()
+
+    def __forget_clone(self, cln):
+        if self.__clones is not None:
+            self.__clones.pop(id(cln), None)
+
+    def syd_copy_to_clones(self):
+        """
+        Called before this container or one of its children changes - the clones of it and of its ancestors that
+        still share their children copy them first (from the root down, so the path to the change is copied).
+        """
+        generation = SydContainer.__clone_generation
+        ancestors = []
+        container = self
+        # containers checked after the last clone was made have no ancestor with clones to copy to
+        while container is not None and container.__copied_generation != generation:
+            ancestors.append(container)
+            container = container.__parent_container
+        for container in reversed(ancestors):
+            clones = container.__clones
+            if clones:
+                container.__clones = None
+                for cln in tuple(clones.values()):
+                    cln.__ensure_loaded()
+        generation = SydContainer.__clone_generation
+        for container in ancestors:
+            container.__copied_generation = generation
+
+    def __getstate__(self):
+        """
+        Pickled without the clones made of it (weak references) and without the cached value - deferred children
+        (of clones too) are loaded first
+        """
+        self.__ensure_loaded()
+        state = {}
+        for name in SydContainer.__slots__:
+            if name != '__weakref__':
+                state[name] = getattr(self, '_SydContainer' + name)
+        state['__clones'] = None
+        state['__identity_hashed'] = False
+        state['__copied_generation'] = -1
+        state['__materialized'] = None
+        state['__materialized_version'] = -1
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, '_SydContainer' + name, value)
 
     def new(self, *others):
         assert not self.is_list, 'Cannot create new from list, it must be a block'
@@ -233,20 +588,23 @@ class SydContainer(_SydData):
         new_container = self.clone()
         for other_container in other_containers:
             assert isinstance(other_container, SydContainer)
-            for key in other_container.keys():
-                other_data = other_container.get_child(key)
-                old_data = new_container.get_child(key, error_out=False)
-
-                if old_data is None:
-                    new_container.add(other_data.clone())
-                else:
-                    if isinstance(old_data, SydData):
-                        assert isinstance(other_data, SydData)
-                        new_container.update(key, other_data.clone())
+            # nested blocks of the new container (its own clones) are merged in place, level by level
+            stack = [(new_container, other_container)]
+            while stack:
+                target, other = stack.pop()
+                for key in other.keys():
+                    other_data = other.get_child(key)
+                    old_data = target.get_child(key, error_out=False)
+
+                    if old_data is None:
+                        target.add(other_data.clone())
                     else:
-                        assert isinstance(other_data, SydContainer) and isinstance(old_data, SydContainer)
-                        merged_children = old_data.merged_new(other_data)
-                        new_container.add(merged_children)
+                        if isinstance(old_data, SydData):
+                            assert isinstance(other_data, SydData)
+                            target.update(key, other_data.clone())
+                        else:
+                            assert isinstance(other_data, SydContainer) and isinstance(old_data, SydContainer)
+                            stack.append((old_data, other_data))
         return new_container
 
     @property
@@ -254,63 +612,84 @@ class SydContainer(_SydData):
         return self.__parent_container is None or self.__key in ('__root__', None)
 
     def get_children(self):
+        self.__ensure_loaded()
         return tuple(self.__data_list)
 
     def clone_children(self):
         return tuple(e.clone() for e in self.get_children())
 
     def get_child(self, key, multi=False, error_out=True):
-        assert isinstance(key, (int, str, list, tuple)), \
-            f'Only integer and string keys are accepted, you provided key of type: {type(key)}'
-        key = int(key) if type(key) is str and key.isdigit() else key
-
+        """
+        key is an index, a key, a dotted path ('servers.0.port' - compiled once, see syd.path()), a SydPath or a
+        list of keys. With multi, all the children of the last key are returned in a tuple.
+        """
         if type(key) is int:
+            self.__ensure_loaded()
             assert self.is_list, \
                 f"Index {key} provided for a block collection. Use numeric index only for list collections {self.is_list}"
             try:
                 d = self.__data_list[key]
-                if multi:
-                    d = (d, )
             except IndexError:
                 if not error_out:
                     return None
-                else:
-                    raise IndexError(f'{key} does not exist')
-        else:
-            if isinstance(key, (list, tuple)):
-                keys = key
-            else:
-                keys = key.split('.')
-            try:
-                first_key = keys[0]
-                syds = []
-                for idx in self.__data_list_index_map[first_key]:
-                    syds.append(self.__data_list[idx])
-
-                keys = keys[1:]
-                last_idx = len(keys) - 1
-                for idx, _key in enumerate(keys):
-                    if last_idx == idx:
-                        if not syds[-1].is_container:
-                            # print('Found value is not a block - it is a scalar')
-                            raise KeyError('Found value is not a block - it is a scalar')
-                    _ = syds[-1].get_child(_key, multi=multi)
-
-                    if multi:
-                        syds = _
-                    else:
-                        syds = [_, ]
+                raise IndexError(f'{key} does not exist')
+            return (d, ) if multi else d
+
+        if type(key) is str:
+            key = path(key)
+        elif type(key) is not SydPath:
+            assert isinstance(key, (list, tuple)), \
+                f'Only integer and string keys are accepted, you provided key of type: {type(key)}'
+            key = SydPath(key)
+        d = self.__resolve(key, multi)
+        if d is None:
+            if not error_out:
+                return None
+            if type(key.last) is int:
+                raise IndexError(f'{key} does not exist')
+            raise KeyError(f'Key `{key}` was not found')
+        return d
 
-                if multi:
-                    d = syds
-                else:
-                    d = syds[-1]
-            except KeyError:
-                if not error_out:
+    def __resolve(self, syd_path, multi):
+        """The child at syd_path (a tuple of them with multi) or None"""
+        container = self
+        for step in syd_path.parents:
+            if container.__children_loader is not None:
+                container.__ensure_loaded()
+            if type(step) is int:
+                assert container.__is_list, f'Index {step} provided for a block collection.'
+                data_list = container.__data_list
+                if not -len(data_list) <= step < len(data_list):
                     return None
-                else:
-                    raise KeyError(f'Key `{key}` was not found')
-        return d
+                container = data_list[step]
+            else:
+                if container.__is_list:
+                    return None
+                idx = container.__data_list_index_map.get(step)
+                if idx is None:
+                    return None
+                container = container.__data_list[idx if type(idx) is int else idx[-1]]
+            if type(container) is not SydContainer:
+                return None
+        if container.__children_loader is not None:
+            container.__ensure_loaded()
+        step = syd_path.last
+        data_list = container.__data_list
+        if type(step) is int:
+            assert container.__is_list, f'Index {step} provided for a block collection.'
+            if not -len(data_list) <= step < len(data_list):
+                return None
+            return (data_list[step], ) if multi else data_list[step]
+        if container.__is_list:
+            return None
+        idx = container.__data_list_index_map.get(step)
+        if idx is None:
+            return None
+        if type(idx) is int:
+            return (data_list[idx], ) if multi else data_list[idx]
+        if multi:
+            return tuple(data_list[i] for i in idx)
+        return data_list[idx[-1]]
 
     def get(self, key, default=None, multi=False):
         try:
@@ -342,37 +721,47 @@ class SydContainer(_SydData):
         return self.__key
 
     def keys(self):
-        """Own keys"""
-        l = list()
-        if self.is_list:
-            l = list(range(len(self.__data_list)))
-        else:
-            for e in self.__data_list:
-                if e.key is not None:
-                    l.append(e.key)
-        return tuple(l)
+        """Own keys (indices of lists) - a live view, see SydKeysView"""
+        return SydKeysView(self)
 
     def values(self):
-        """Values are not converted!!!"""
-        l = list()
-        for e in self.__data_list:
-            value = e.value
-            l.append(value)
-        return tuple(l)
+        """Values are not converted!!! - a live view, see SydValuesView"""
+        return SydValuesView(self)
 
     def items(self):
-        """Values are not converted!!!"""
-        l = []
-        for i, e in enumerate(self.__data_list):
-            value = e.value
-            if self.is_list:
-                l.append((i, value))
-            else:
-                l.append((e.key, value))
-        return tuple(l)
+        """Values are not converted!!! - a live view, see SydItemsView"""
+        return SydItemsView(self)
+
+    def iter_children(self):
+        """
+        The children one by one - nothing is copied like get_children() does. Children deleted while it is iterated
+        are skipped (they are tombstones until the children are compacted).
+        """
+        if self.__children_loader is not None:
+            self.__ensure_loaded()
+        return (data for data in self.__data_list if data is not _TOMBSTONE)
+
+    @property
+    def children_count(self):
+        if self.__children_loader is not None:
+            self.__ensure_loaded()
+        return len(self.__data_list) - self.__tombstones
+
+    def syd_has_key(self, key):
+        """Whether a block has a child with key (not a dotted path)"""
+        if self.__children_loader is not None:
+            self.__ensure_loaded()
+        if self.__is_list:
+            return False
+        try:
+            return key in self.__data_list_index_map
+        except TypeError:
+            return False
 
     def add(self, *args):
         assert not self.__read_only
+        if self.__children_loader is not None:
+            self.__ensure_loaded()
         # args validating, parsing, and constructing value called syd.
         assert len(args) in (1, 2), f'Not enough or more than enough args: {args}'
         parent_container = self
@@ -408,19 +797,28 @@ class SydContainer(_SydData):
 
         # adding the value to the container.
         assert isinstance(syd, _SydData)
+        self.syd_copy_to_clones()
+        self.__append(syd, parent_container)
+
+    def __append(self, syd, parent_container):
         self.__data_list.append(syd)
-        if not self.is_list:
-            idx = len(self.__data_list) - 1
-            key = syd.key
-            if key not in self.__data_list_index_map:
-                data_l = []
-                self.__data_list_index_map[key] = data_l
-            else:
-                data_l = self.__data_list_index_map[key]
-            # data_l.append((idx, syd)), now only one source of truth against two before - previously: data list, map
-            data_l.append(idx)
+        self.__changed()
+        if not self.__is_list:
+            self.__map_index(self.__data_list_index_map, syd.key, len(self.__data_list) - 1)
+        elif self.__value_index is not None:
+            self.__index_value(syd, 1)
         syd.syd_set_parent(parent_container)
 
+    @staticmethod
+    def __map_index(index_map, key, idx):
+        indices = index_map.get(key)
+        if indices is None:
+            index_map[key] = idx
+        elif type(indices) is int:
+            index_map[key] = [indices, idx]
+        else:
+            indices.append(idx)
+
     @staticmethod
     def __create_container_from_vector(key, vector):
         assert isinstance(vector, (list, tuple, dict))
@@ -452,9 +850,17 @@ class SydContainer(_SydData):
     def update(self, key_idx, syd_data):
         assert isinstance(syd_data, _SydData)
         assert key_idx is not None
+        if self.__children_loader is not None or isinstance(key_idx, int):
+            self.__ensure_loaded()
+        self.syd_copy_to_clones()
         if isinstance(key_idx, int):
             assert syd_data.key is None
+            if self.__value_index is not None:
+                self.__index_value(self.__data_list[key_idx], -1)
+                self.__index_value(syd_data, 1)
             self.__data_list[key_idx] = syd_data
+            syd_data.syd_set_parent(self)
+            self.__changed()
             return
 
         if isinstance(key_idx, (list, tuple)):
@@ -464,79 +870,430 @@ class SydContainer(_SydData):
 
         if len(keys) == 1:
             key_idx = keys[0]
-            indices = self.__data_list_index_map[key_idx]
-            idx = indices[-1]
+            idx = self.__data_list_index_map[key_idx]
+            if type(idx) is not int:
+                idx = idx[-1]
             self.__data_list[idx] = syd_data
             syd_data.syd_set_parent(self)
+            self.__changed()
         else:
             parent_keys = keys[:-1]
             key_idx = keys[-1]
             parent_syd = self.get_child(parent_keys)
             parent_syd.update(key_idx, syd_data)
 
+    def apply_patch(self, patch):
+        """Applies a SydPatch (see syd.diff()) to this tree"""
+        assert not self.__read_only
+        patch.apply_to(self)
+
     def __setitem__(self, key, value):
         assert not self.__read_only
         self.set(key, value)
 
     def lock(self):
         assert not self.__read_only
-        self.__read_only = True
-        for d in self.__data_list:
-            if isinstance(d, self.__class__):
-                d.lock()
+        stack = [self]
+        while stack:
+            container = stack.pop()
+            if container.__tombstones:
+                container.__compact()
+            container.__read_only = True
+            # children that are not loaded yet are locked by __ensure_loaded()
+            for d in container.__data_list:
+                if isinstance(d, SydContainer) and not d.__read_only:
+                    stack.append(d)
+
+    def freeze(self):
+        """
+        An immutable snapshot of this tree (a SydFrozen) that looks up dotted paths in a single dict. A locked tree is
+        used as it is, any other one is cloned and the clone is locked.
+        """
+        from syd.frozen import SydFrozen
+        return SydFrozen(self if self.__read_only else self.clone(read_only=True))
+
+    def __changed(self):
+        """A child was added, replaced or removed"""
+        self.syd_invalidate_hash()
+        self.syd_bump_version()
+
+    def syd_bump_version(self):
+        """
+        Changes the version of this container - and of its ancestors, while their values are cached, so the values
+        built before are built again. When a value is not cached, the values of the ancestors are not either.
+        """
+        container = self
+        while container is not None:
+            cached = container.__materialized_version == container.__version
+            container.__version += 1
+            if not cached:
+                break
+            container.__materialized = None
+            container = container.__parent_container
+
+    # structural hash
+    def syd_invalidate_hash(self):
+        """Forgets the cached hash of this container and of its ancestors"""
+        container = self
+        # when a hash is not cached, the hashes of the ancestors are not either
+        while container is not None and container.__hash is not None:
+            container.__hash = None
+            container = container.__parent_container
+
+    @property
+    def structural_hash(self):
+        """
+        Hash of the key, the kind and the structural hashes of the children (a Merkle hash) - cached until the
+        container or anything under it changes.
+        """
+        stack = [self]
+        while stack:
+            container = stack[-1]
+            if container.__hash is not None:
+                stack.pop()
+                continue
+            container.__ensure_loaded()
+            pending = [d for d in container.__data_list if isinstance(d, SydContainer) and d.__hash is None]
+            if pending:
+                stack.extend(pending)
+                continue
+            container.__hash = hash((
+                container.__key, container.__is_list, tuple(d.structural_hash for d in container.__data_list)
+            ))
+            stack.pop()
+        return self.__hash
+
+    @property
+    def has_structural_hash(self):
+        """Whether the structural hash is cached"""
+        return self.__hash is not None
+
+    def syd_same_as(self, other):
+        """Whether other is a container with the same structure and data (the structural hashes are compared first)"""
+        stack = [(self, other)]
+        while stack:
+            a, b = stack.pop()
+            if a is b:
+                continue
+            if not isinstance(b, SydContainer):
+                return False
+            if a.structural_hash != b.structural_hash or a.__key != b.__key or a.__is_list != b.__is_list:
+                return False
+            a.__ensure_loaded()
+            b.__ensure_loaded()
+            if len(a.__data_list) != len(b.__data_list):
+                return False
+            for x, y in zip(a.__data_list, b.__data_list):
+                if isinstance(x, SydContainer):
+                    stack.append((x, y))
+                elif not x.syd_same_as(y):
+                    return False
+        return True
+
+    def __eq__(self, other):
+        """Locked containers are equal when their structure and data are; others only to themselves"""
+        if self is other:
+            return True
+        if not isinstance(other, SydContainer) or not (self.__structurally_hashed() and other.__structurally_hashed()):
+            return NotImplemented
+        return self.syd_same_as(other)
+
+    def __hash__(self):
+        """
+        The structural hash of a locked container. A container hashed before it was locked keeps its identity hash
+        (and equality) after it is locked, so it is still found in the sets and dicts it was put in.
+        """
+        if self.__structurally_hashed():
+            return self.structural_hash
+        self.__identity_hashed = True
+        return object.__hash__(self)
+
+    def __structurally_hashed(self):
+        return self.__read_only and not self.__identity_hashed
+
+    def syd_own_size(self):
+        return sys.getsizeof(self.__data_list) + sys.getsizeof(self.__data_list_index_map)
+
+    def intern(self):
+        """
+        Shares the identical subtrees (and scalars) of this locked tree: every copy after the first one is replaced
+        with the first one. A shared node is not copied, so its parent stays the one of the first copy (the parent
+        of a node reached from another place is not the container it was reached from).
+        Returns a SydInternReport with the number of nodes that were dropped and their approximate memory.
+        """
+        assert self.__read_only, 'Only locked trees can share their nodes'
+        canonical = {}  # structural hash -> nodes
+        nodes_shared = 0
+        bytes_saved = 0
+        stack = [self]
+        while stack:
+            container = stack.pop()
+            container.__ensure_loaded()
+            data_list = container.__data_list
+            for idx, data in enumerate(data_list):
+                candidates = canonical.setdefault(data.structural_hash, [])
+                for candidate in candidates:
+                    if candidate.syd_same_as(data):
+                        break
+                else:
+                    candidates.append(data)
+                    if isinstance(data, SydContainer):
+                        stack.append(data)
+                    continue
+                if candidate is data:
+                    continue
+                data_list[idx] = candidate
+                # the whole replaced subtree is dropped
+                dropped = [data]
+                while dropped:
+                    node = dropped.pop()
+                    nodes_shared += 1
+                    bytes_saved += _node_size(node)
+                    if isinstance(node, SydContainer):
+                        dropped.extend(node.__data_list)
+        return SydInternReport(nodes_shared, bytes_saved)
+
+    # interpolation
+    def interpolate(self, children=None):
+        """
+        Replaces `${key}` and `${key.sub_key}` references in the strings of this tree (containers that are not loaded
+        yet are skipped). A reference is looked up from the container of the string, then from its ancestors, and
+        resolves to '' when it is not found. Strings referring to other templated strings are resolved after them,
+        so the order of the keys does not matter. `$${key}` is left as it is.
+        With children, only those _SydData-s (and the trees of the containers among them) are interpolated.
+        Returns the strings that were interpolated.
+        """
+        # collect the templated strings - only strings with a `$` take part
+        templates = []
+        stack = [self]
+        while stack:
+            container = stack.pop()
+            if container.__tombstones:
+                container.__compact()
+            data_list = container.__data_list if children is None or container is not self else children
+            for data in data_list:
+                if isinstance(data, SydContainer):
+                    if data.__children_loader is None:
+                        stack.append(data)
+                elif data.is_template:
+                    templates.append(data)
+        if not templates:
+            return ()
+
+        pattern = _Patterns.interpolation_identifier
+        lookups = {}  # (id of scope, reference) -> target
+        references = {}  # id of template -> [targets]
+        template_ids = {id(t) for t in templates}
+        for template in templates:
+            targets = []
+            for match in pattern.finditer(template.value_origin):
+                targets.append(self.__interpolation_target(template, match.group('identifier'), lookups))
+            references[id(template)] = targets
+
+        # depth first, dependencies before dependents - with an explicit stack and cycle detection
+        visiting, done = 1, 2
+        states = {}
+        resolved = {}
+        for start in templates:
+            if id(start) in states:
+                continue
+            states[id(start)] = visiting
+            path = [start]
+            while path:
+                template = path[-1]
+                for target in references[id(template)]:
+                    if target is None or id(target) not in template_ids:
+                        continue
+                    state = states.get(id(target))
+                    if state is None:
+                        states[id(target)] = visiting
+                        path.append(target)
+                        break
+                    elif state == visiting:
+                        cycle = path[path.index(target):] + [target]
+                        raise SynamicSydInterpolationError(
+                            'Interpolation cycle: %s' % ' -> '.join(str(t.key) for t in cycle)
+                        )
+                else:
+                    targets = iter(references[id(template)])
+                    value = pattern.sub(
+                        lambda m: self.__interpolated_text(template, next(targets), resolved), template.value_origin
+                    )
+                    resolved[id(template)] = value
+                    states[id(template)] = done
+                    path.pop()
+
+        for template in templates:
+            template.syd_set_interpolated(resolved[id(template)])
+        return tuple(templates)
+
+    @staticmethod
+    def __interpolation_target(template, reference, lookups):
+        scope = template.parent
+        while scope is not None:
+            lookup_key = (id(scope), reference)
+            if lookup_key in lookups:
+                target = lookups[lookup_key]
+            else:
+                try:
+                    target = scope.get_child(reference, error_out=False)
+                except (KeyError, IndexError, AssertionError, AttributeError):
+                    target = None
+                lookups[lookup_key] = target
+            if target is not None:
+                return target
+            scope = scope.parent
+        return None
+
+    @staticmethod
+    def __interpolated_text(template, target, resolved):
+        if target is None:
+            return ''
+        if target is template:
+            raise SynamicSydInterpolationError('Key is being interpolated recursively: %s' % template.key)
+        if id(target) in resolved:
+            return resolved[id(target)]
+        v = None if target.is_container else target.value
+        if type(v) not in (int, float, str):
+            raise SynamicSydInterpolationError(
+                'Only number and string data can be interpolated into a string. Data with key `%s` is of type `%s`'
+                % (target.key, str(type(v) if not target.is_container else type(target)))
+            )
+        return str(v)  # convert it in case it is a number.
 
     # deleting
-    def __remove_from_self(self, key):
+    def __remove_from_self(self, key, compact=True):
+        """
+        Children of a block are replaced with tombstones (the indices in the map stay valid) and they are compacted
+        away when they are more than the live children or when all the children are needed.
+        """
         key = int(key) if type(key) is str and key.isdigit() else key
+        if self.__children_loader is not None:
+            self.__ensure_loaded()
+        self.syd_copy_to_clones()
         if self.is_list:
             # list indexes are not cached in the map
+            if self.__value_index is not None:
+                self.__index_value(self.__data_list[key], -1)
             del self.__data_list[key]
         else:
-            indices = self.__data_list_index_map[key]
-            indices.reverse()  # start deleting from larger index
             # delete from map
-            del self.__data_list_index_map[key]
-            # delete from ordered list
+            indices = self.__data_list_index_map.pop(key)
+            if type(indices) is int:
+                indices = (indices, )
+            data_list = self.__data_list
             for idx in indices:
-                del self.__data_list[idx]
-
-            # map
-            new_map = type(self.__data_list_index_map)()
-            for idx, elem in enumerate(self.__data_list):
-                if elem.key not in new_map:
-                    l = []
-                    new_map[elem.key] = l  # Here was that deadly bug
-                else:
-                    l = new_map[elem.key]
-                l.append(idx)
-            self.__data_list_index_map = new_map
+                data_list[idx] = _TOMBSTONE
+            self.__tombstones += len(indices)
+            if compact and self.__tombstones * 2 > len(data_list):
+                self.__compact()
+        self.__changed()
+
+    def __compact(self):
+        self.__data_list = [data for data in self.__data_list if data is not _TOMBSTONE]
+        self.__tombstones = 0
+        self.__rebuild_index_map()
+
+    def __rebuild_index_map(self):
+        new_map = {}
+        map_index = self.__map_index
+        for idx, elem in enumerate(self.__data_list):
+            map_index(new_map, elem.key, idx)
+        self.__data_list_index_map = new_map
+
+    def syd_splice(self, start, stop, children):
+        """
+        Replaces the children from index start to stop (exclusive) with children and returns the replaced ones.
+        The key index is only rebuilt when the keys at those positions change.
+        """
+        assert not self.__read_only
+        self.__ensure_loaded()
+        self.syd_copy_to_clones()
+        children = list(children)
+        data_list = self.__data_list
+        removed = data_list[start:stop]
+        same_keys = len(removed) == len(children) and all(
+            old.key == new.key for old, new in zip(removed, children)
+        )
+        data_list[start:stop] = children
+        for data in children:
+            data.syd_set_parent(self)
+        self.__changed()
+        self.__value_index = None
+        if not self.is_list and not same_keys:
+            self.__rebuild_index_map()
+        return removed
 
     def __delitem__(self, key):
         assert not self.__read_only
         assert type(key) in (int, str), \
             f'Only integer and string keys are accepted, you provide key of type: {type(key)}'
-        key = str(key)  # TODO: handle int key specially for performance.
-        keys = key.split('.')
-        key2del = keys[-1]
-        keys = keys[:-1]
-
         try:
-            if len(keys) == 0:
-                cont = self
-            else:
-                k = keys[0]
-                keys = keys[1:]
-                cont = self.get_child(k)
-                for k in keys:
-                    cont = cont._get_original(k)
-            cont.__remove_from_self(key2del)
+            self.__delete(path(str(key)))
         except (KeyError, IndexError):
-            # raise
             raise KeyError(f'Key/index `{key}` was not found. Keys: {self.keys()}')
 
+    def __delete(self, syd_path, compact=True):
+        container = self
+        if syd_path.parents:
+            container = self.get_child(SydPath(syd_path.parents))
+            if not isinstance(container, SydContainer):
+                raise KeyError(str(syd_path))
+        container.__remove_from_self(syd_path.last, compact=compact)
+
+    def delete_many(self, keys):
+        """
+        Deletes keys, indices or dotted paths (all of them refer to the children before the deletion). Stops with a
+        KeyError at the first one that does not exist.
+        """
+        assert not self.__read_only
+        if self.is_list:
+            if self.__children_loader is not None:
+                self.__ensure_loaded()
+            indices = set()
+            for key in keys:
+                if type(key) is int:
+                    idx = key
+                else:
+                    syd_path = path(key)
+                    if syd_path.parents:
+                        self.__delete(syd_path)
+                        continue
+                    idx = syd_path.last
+                if type(idx) is not int or not -len(self.__data_list) <= idx < len(self.__data_list):
+                    raise KeyError(f'Index `{key}` was not found')
+                indices.add(idx % len(self.__data_list))
+            if indices:
+                self.syd_copy_to_clones()
+                if self.__value_index is not None:
+                    for idx in indices:
+                        self.__index_value(self.__data_list[idx], -1)
+                self.__data_list = [data for idx, data in enumerate(self.__data_list) if idx not in indices]
+                self.__changed()
+            return
+        try:
+            for key in keys:
+                syd_path = path(str(key))
+                self.__delete(syd_path, compact=False)
+        except (KeyError, IndexError):
+            raise KeyError(f'Key/index `{key}` was not found')
+        finally:
+            # tombstones go away once - the next read would do it anyway
+            if self.__tombstones * 2 > len(self.__data_list):
+                self.__compact()
+
     def __contains__(self, key_value):
         if self.is_list:
+            self.__ensure_loaded()
             value = key_value
+            index = self.__value_index
+            if index is None:
+                index = self.__value_index = self.__build_value_index()
+            if index is not False:
+                try:
+                    return value in index
+                except TypeError:
+                    pass  # unhashable value
             res = False
             for data in self.__data_list:
                 if data.value == value:
@@ -544,9 +1301,41 @@ class SydContainer(_SydData):
                     break
             return res
         else:
-            key = key_value
-            res = self.get(key, None)
-            return False if res is None else True
+            # the child is enough, its value (a nested container too) is not needed
+            return self.get_child(key_value, error_out=False) is not None
+
+    # value index of lists
+    def __build_value_index(self):
+        index = collections.Counter()
+        try:
+            for data in self.__data_list:
+                if isinstance(data, SydContainer):
+                    # values of nested containers change without telling this list - membership tests scan the list
+                    return False
+                index[data.value] += 1
+        except TypeError:
+            return False  # a value cannot be hashed - membership tests scan the list
+        return index
+
+    def __index_value(self, data, count):
+        index = self.__value_index
+        if index is False:
+            return
+        if isinstance(data, SydContainer):
+            self.__value_index = False
+            return
+        try:
+            value = data.value
+            index[value] += count
+            if index[value] <= 0:
+                del index[value]
+        except TypeError:
+            self.__value_index = False
+
+    def syd_child_value_changed(self):
+        """A child was converted or interpolated - the value index and the values are built again when needed"""
+        self.__value_index = None
+        self.syd_bump_version()
 
     def key_exists(self, key):
         return key in self
@@ -589,12 +1378,16 @@ class SydContainer(_SydData):
     def set_converter(self, converter):
         assert not callable(self.__converter)
         assert not self.is_root
+        self.syd_copy_to_clones()
         self.__converter = converter
+        self.__parent_container.syd_child_value_changed()
 
     def set_converted(self, value):
         assert value is not None
         assert not self.is_root
+        self.syd_copy_to_clones()
         self.__converted_value = value
+        self.__parent_container.syd_child_value_changed()
 
     def set_converter_for(self, key, converter):
         syds = self.get_child(key, multi=True)
@@ -611,26 +1404,49 @@ class SydContainer(_SydData):
     # as vector
     @property
     def as_tuple(self):
+        """The values of a list - built once until it changes"""
         assert self.is_list
-        c = []
-        for d in self.__data_list:
-            c.append(d.value)
-        c = tuple(c)
+        self.__ensure_loaded()
+        version = self.__version
+        if self.__materialized_version == version:
+            return self.__materialized
+        c = tuple(d.value for d in self.__data_list)
+        self.__materialized, self.__materialized_version = c, version
         return c
 
     @property
     def as_dict(self):
+        """The values of a block in a SydReadOnlyDict - built once until it changes"""
         assert not self.is_list
-        c = collections.OrderedDict()
-        for d in self.__data_list:
-            c[d.key] = d.value
+        self.__ensure_loaded()
+        version = self.__version
+        if self.__materialized_version == version:
+            return self.__materialized
+        c = SydReadOnlyDict((d.key, d.value) for d in self.__data_list)
+        self.__materialized, self.__materialized_version = c, version
         return c
 
     # as string
     def __str__(self):
-        l = []
-        for e in self.__data_list:
-            l.append(str(e))
+        # nested containers are formatted through a stack instead of recursion
+        self.__ensure_loaded()
+        stack = [(self, iter(self.__data_list), [])]
+        while True:
+            container, children, l = stack[-1]
+            for e in children:
+                if isinstance(e, SydContainer):
+                    e.__ensure_loaded()
+                    stack.append((e, iter(e.__data_list), []))
+                    break
+                l.append(str(e))
+            else:
+                stack.pop()
+                text = container.__format(l)
+                if not stack:
+                    return text
+                stack[-1][2].append(text)
+
+    def __format(self, l):
         if self.is_list:
             data_text = ", ".join(l)
         else:
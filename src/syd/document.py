@@ -0,0 +1,199 @@
+"""
+Documents that are reloaded when their text changes.
+
+The text of a document is split into segments - the lines of its top level items (with the blank and comment lines
+before them). On reload the new text is compared with the old one, only the segments that contain the changed
+characters are parsed again and their items replace the old ones in the existing tree.
+"""
+import os
+import itertools
+from bisect import bisect_right
+from syd.curlybrace_parser import SydParser, SydContainer
+from syd.exceptions import SynamicSydParseError
+from syd.include import IncludeResolver
+from syd.patch import iter_changes
+from syd.utils import LineIndex
+
+# texts are compared chunk by chunk to find where they start to differ
+_CHUNK = 4096
+
+
+def _common_prefix_length(a, b):
+    limit = min(len(a), len(b))
+    pos = 0
+    while pos + _CHUNK <= limit and a[pos:pos + _CHUNK] == b[pos:pos + _CHUNK]:
+        pos += _CHUNK
+    while pos < limit and a[pos] == b[pos]:
+        pos += 1
+    return pos
+
+
+def _common_suffix_length(a, b, limit):
+    length = 0
+    len_a, len_b = len(a), len(b)
+    while length + _CHUNK <= limit and \
+            a[len_a - length - _CHUNK:len_a - length] == b[len_b - length - _CHUNK:len_b - length]:
+        length += _CHUNK
+    while length < limit and a[len_a - length - 1] == b[len_b - length - 1]:
+        length += 1
+    return length
+
+
+class _Segment:
+    __slots__ = ('start', 'end', 'first_line_no', 'count')
+
+    def __init__(self, start, end, first_line_no, count):
+        self.start = start  # offset of the first character
+        self.end = end  # offset after the last character (the line break of its last line included)
+        self.first_line_no = first_line_no
+        self.count = count  # number of top level items
+
+
+class SydDocument:
+    """
+    A parsed document that is kept up to date with reload() - the tree is changed in place.
+    The interpolated strings are remembered with their templates and all of them are interpolated again on reload,
+    so strings that refer to a changed item are updated too.
+    """
+    def __init__(self, text, debug=False, base_dir=None, path=None, encoding='utf-8'):
+        self.__debug = debug
+        self.__base_dir = base_dir
+        self.__path = path
+        self.__encoding = encoding
+        self.__include_resolver = IncludeResolver()
+        self.__tree = SydContainer('__root__')
+        self.__segments = []
+        self.__segment_starts = []  # start offsets of the segments, for bisecting
+        self.__templates = ()
+        self.__text = ''
+        self.reload(text)
+
+    @classmethod
+    def open(cls, path, debug=False, encoding='utf-8'):
+        """A document of a file - reload() without text reads the file again"""
+        with open(path, encoding=encoding) as f:
+            text = f.read()
+        return cls(text, debug=debug, base_dir=os.path.dirname(os.path.abspath(path)), path=path, encoding=encoding)
+
+    @property
+    def tree(self):
+        return self.__tree
+
+    @property
+    def text(self):
+        return self.__text
+
+    def __segment_at(self, offset):
+        return bisect_right(self.__segment_starts, offset) - 1
+
+    def __parse(self, text, start, end, first_line_no):
+        """
+        Parses text[start:end] - returns its items, its segments, the number of the line after it and whether it
+        ended inside a block.
+        """
+        line_index = LineIndex(text[start:end])
+        children, last_line_nos, open_at_end = SydParser._parse_region(
+            line_index.lines(), first_line_no, debug=self.__debug, base_dir=self.__base_dir,
+            include_resolver=self.__include_resolver
+        )
+        segments = []
+        segment_start = start
+        segment_line_no = first_line_no
+        # items of an !include line share the line
+        for last_line_no, group in itertools.groupby(last_line_nos):
+            local_line_no = last_line_no - first_line_no + 1
+            segment_end = start + line_index.start(local_line_no + 1) if local_line_no < len(line_index) else end
+            segments.append(_Segment(segment_start, segment_end, segment_line_no, sum(1 for _ in group)))
+            segment_start = segment_end
+            segment_line_no = last_line_no + 1
+        if segment_start < end:
+            # blank lines and comments after the last item
+            segments.append(_Segment(segment_start, end, segment_line_no, 0))
+        return children, segments, first_line_no + len(line_index), open_at_end
+
+    def reload(self, text=None):
+        """
+        Updates the tree to a new text (or to the file of the document again) and returns the dotted paths that
+        changed. Only the top level items whose lines were changed are parsed again. The tree is not changed when
+        the new text has syntax errors.
+        """
+        if text is None:
+            assert self.__path is not None, 'Text is required for a document that is not from a file'
+            with open(self.__path, encoding=self.__encoding) as f:
+                text = f.read()
+        old_text = self.__text
+        if text == old_text and self.__segments:
+            return ()
+        segments = self.__segments
+        prefix = _common_prefix_length(old_text, text)
+        suffix = _common_suffix_length(old_text, text, min(len(old_text), len(text)) - prefix)
+        delta = len(text) - len(old_text)
+        if segments:
+            first = self.__segment_at(max(prefix - 1, 0))
+            last = self.__segment_at(min(len(old_text) - suffix, len(old_text) - 1))
+        else:
+            first, last = 0, -1
+        while True:
+            start = segments[first].start if segments else 0
+            old_end = segments[last].end if segments else 0
+            first_line_no = segments[first].first_line_no if segments else 1
+            try:
+                children, new_segments, next_line_no, open_at_end = self.__parse(
+                    text, start, old_end + delta, first_line_no
+                )
+            except SynamicSydParseError:
+                # the error may come from a block (or multiline string) that continues in the next segments
+                if last == len(segments) - 1:
+                    raise
+                open_at_end = True
+            if not open_at_end or last == len(segments) - 1:
+                break
+            last = min(last + max(last - first + 1, 1), len(segments) - 1)
+
+        child_start = sum(segment.count for segment in segments[:first])
+        child_stop = child_start + sum(segment.count for segment in segments[first:last + 1])
+        removed = self.__tree.syd_splice(child_start, child_stop, children)
+        interpolated_paths = self.__interpolate(removed, children)
+        paths = tuple(path for _, path, _ in iter_changes(removed, children)) + interpolated_paths
+
+        # the segments after the reparsed ones only moved
+        following = segments[last + 1:]
+        line_delta = next_line_no - following[0].first_line_no if following else 0
+        for segment in following:
+            segment.start += delta
+            segment.end += delta
+            segment.first_line_no += line_delta
+        segments[first:last + 1] = new_segments
+        self.__segment_starts = [segment.start for segment in segments]
+        self.__text = text
+        return tuple(dict.fromkeys(paths))
+
+    def __interpolate(self, removed, children):
+        """Interpolates the new items and the strings of the rest of the tree again - returns the paths that changed"""
+        removed_ids = set()
+        stack = list(removed)
+        while stack:
+            data = stack.pop()
+            removed_ids.add(id(data))
+            if data.is_container:
+                stack.extend(data.get_children())
+        kept = [template for template in self.__templates if id(template) not in removed_ids]
+        old_values = []
+        for template in kept:
+            old_values.append(template.value_origin)
+            template.syd_set_interpolated(template.template)
+        self.__templates = self.__tree.interpolate(list(children) + kept)
+        return tuple(_path(template) for template, value in zip(kept, old_values) if template.value_origin != value)
+
+
+def _path(data):
+    """Dotted path of data from the root"""
+    keys = []
+    while data.parent is not None:
+        parent = data.parent
+        if parent.is_list:
+            keys.append(str(next(idx for idx, child in enumerate(parent.get_children()) if child is data)))
+        else:
+            keys.append(data.key)
+        data = parent
+    return '.'.join(reversed(keys))
@@ -4,7 +4,28 @@ class SydError(Exception):
 
 class SynamicSydParseError(SydError):
     """Syd parse error in curlybrace parser."""
+    def __init__(self, *args, parse_error=None):
+        super().__init__(*args)
+        # SydParseError record of the error
+        self.parse_error = parse_error
 
 
 class SynamicInvalidDateTimeFormat(SydError):
     """When date, time or datetime is invalid"""
+
+
+class SynamicSydBinaryFormatError(SydError):
+    """When a tree cannot be written to or read from the binary format"""
+
+
+class SynamicSydInterpolationError(SydError):
+    """When a ${key} reference in a string cannot be interpolated"""
+
+
+class SynamicSydValidationError(SydError):
+    """When a document does not fit a model - errors are (dotted path, message) of every value that does not fit"""
+    def __init__(self, errors):
+        self.errors = tuple(errors)
+        super().__init__('Document does not fit the model:\n' + '\n'.join(
+            f'  {path or "<root>"}: {message}' for path, message in self.errors
+        ))
@@ -0,0 +1,92 @@
+"""
+Frozen snapshots of trees (see SydContainer.freeze()).
+
+A snapshot is a locked tree with all of its children loaded and a flat index of the dotted paths of all the nodes
+(list indices included), so a lookup of any path is a single dict lookup. Nothing of it changes after it is made,
+so one snapshot can be shared by many threads.
+"""
+from syd.datatypes.syd_data import SydPath
+
+
+class SydFrozen:
+    """An immutable snapshot of a tree - made by SydContainer.freeze()"""
+    def __init__(self, root):
+        assert root.is_read_only, 'The tree of a snapshot must be locked'
+        self.__root = root
+        index = {}
+        stack = [('', root)]
+        while stack:
+            prefix, container = stack.pop()
+            if container.is_list:
+                keyed = enumerate(container.iter_children())
+            else:
+                keyed = ((data.key, data) for data in container.iter_children())
+            # for repeated keys the last child wins, as with get_child()
+            for key, data in keyed:
+                dotted = f'{prefix}{key}'
+                index[dotted] = data
+                if data.is_container:
+                    stack.append((dotted + '.', data))
+        self.__index = index
+
+    @property
+    def root(self):
+        return self.__root
+
+    def freeze(self):
+        return self
+
+    @staticmethod
+    def __dotted(key):
+        if type(key) is str:
+            return key
+        if type(key) in (int, SydPath):
+            return str(key)
+        assert isinstance(key, (list, tuple)), \
+            f'Only integer and string keys are accepted, you provided key of type: {type(key)}'
+        return '.'.join(str(k) for k in key)
+
+    def get_child(self, key, error_out=True):
+        """key is an index, a key, a dotted path, a SydPath or a list of keys"""
+        data = self.__index.get(self.__dotted(key))
+        if data is None and error_out:
+            raise KeyError(f'Key `{key}` was not found')
+        return data
+
+    def get(self, key, default=None):
+        data = self.__index.get(self.__dotted(key))
+        if data is None:
+            return default
+        return data.value
+
+    def __getitem__(self, key):
+        return self.get_child(key).value
+
+    def __contains__(self, key):
+        return self.__dotted(key) in self.__index
+
+    def paths(self):
+        """Dotted paths of all the nodes"""
+        return self.__index.keys()
+
+    def __len__(self):
+        return len(self.__index)
+
+    def keys(self):
+        return self.__root.keys()
+
+    def values(self):
+        return self.__root.values()
+
+    def items(self):
+        return self.__root.items()
+
+    def __iter__(self):
+        return iter(self.__root)
+
+    @property
+    def value(self):
+        return self.__root.value
+
+    def __repr__(self):
+        return f'SydFrozen({len(self.__index)} paths)'
@@ -0,0 +1,191 @@
+"""
+Resolution of `!include <path>` and `!include_if_exists <path>` directives.
+
+Included files are parsed once per process: parsed trees are kept in a process-wide cache keyed by the resolved path
+and the hash of the file content, so a base file included by many documents is parsed a single time.
+
+Before a document is parsed, its include graph is built by scanning the files for include lines. Files are then
+parsed bottom up and, with workers > 1, the files of one level (that do not depend on each other) are parsed in
+parallel processes. Cycles are reported as parse errors when the parser reaches them.
+"""
+import os
+import re
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from syd.exceptions import SynamicSydParseError
+
+INCLUDE_PATTERN = re.compile(r'^[ \t]*!(?P<directive>include_if_exists|include)[ \t]+(?P<path>\S.*?)[ \t]*$', re.M)
+
+
+class _IncludeCache:
+    """(resolved path, content hash) -> (locked tree, files it includes as (path, hash) pairs)"""
+    def __init__(self):
+        self.__entries = {}
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        with self.__lock:
+            return self.__entries.get(key)
+
+    def set(self, key, entry):
+        with self.__lock:
+            self.__entries[key] = entry
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+
+_include_cache = _IncludeCache()
+
+
+def clear_include_cache():
+    _include_cache.clear()
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        content = f.read()
+    return content, hashlib.sha256(content).hexdigest()
+
+
+def _include_paths(text, base_dir):
+    return [os.path.abspath(os.path.join(base_dir, m.group('path'))) for m in INCLUDE_PATTERN.finditer(text)]
+
+
+def _parse_included(path, text, dependency_images, encoding):
+    """Process pool worker: parses one included file with its (already parsed) includes provided as binary images"""
+    from syd.binary import SydBinaryImage, dumps_binary
+    for key, (image, dependencies) in dependency_images.items():
+        if _include_cache.get(key) is None:
+            _include_cache.set(key, (SydBinaryImage(image).root, dependencies))
+    resolver = IncludeResolver(encoding=encoding)
+    tree = resolver.parse(path, text)
+    return dumps_binary(tree), resolver.dependencies
+
+
+class IncludeResolver:
+    """
+    Provides the trees of the files included by one document (and by the files it includes).
+    `dependencies` lists every file used as (path, content hash) pairs.
+    """
+    def __init__(self, workers=1, encoding='utf-8'):
+        self.__workers = workers
+        self.__encoding = encoding
+        self.__in_progress = []
+        self.__dependencies = {}
+
+    @property
+    def dependencies(self):
+        return tuple(self.__dependencies.items())
+
+    @staticmethod
+    def resolve_path(path, base_dir=None):
+        return os.path.abspath(os.path.join(base_dir or os.getcwd(), path))
+
+    def parse(self, path, text):
+        """Parses the document at path (with text as its content) resolving its includes through this resolver"""
+        from syd.curlybrace_parser import SydParser
+        self.__in_progress.append(path)
+        try:
+            tree = SydParser(text, base_dir=os.path.dirname(path), include_resolver=self).parse()
+        finally:
+            self.__in_progress.pop()
+        return tree
+
+    def tree(self, path, if_exists=False):
+        """
+        The locked root container of the included file at the (resolved) path.
+        None when the file does not exist and if_exists is True.
+        """
+        if path in self.__in_progress:
+            cycle = ' -> '.join(self.__in_progress[self.__in_progress.index(path):] + [path])
+            raise SynamicSydParseError(f'Include cycle: {cycle}')
+        try:
+            content, digest = _read(path)
+        except FileNotFoundError:
+            if if_exists:
+                return None
+            raise SynamicSydParseError(f'Included file does not exist: {path}')
+        entry = _include_cache.get((path, digest))
+        if entry is None:
+            # files included by this one are recorded separately for its cache entry
+            outer_dependencies = self.__dependencies
+            self.__dependencies = {}
+            try:
+                tree = self.parse(path, content.decode(self.__encoding))
+                dependencies = self.dependencies
+            finally:
+                self.__dependencies = outer_dependencies
+            tree.lock()
+            entry = (tree, dependencies)
+            _include_cache.set((path, digest), entry)
+        tree, dependencies = entry
+        self.__dependencies[path] = digest
+        self.__dependencies.update(dependencies)
+        return tree
+
+    def prepare(self, text, base_dir=None):
+        """
+        Builds the include graph of a document and parses all the included files bottom up, so that the parser only
+        finds cached trees. Files that can not be read or that are part of a cycle are left to the parser, which
+        reports them when it reaches them.
+        """
+        base_dir = base_dir or os.getcwd()
+        files = {}  # path -> (content, digest, included paths)
+        pending = _include_paths(text, base_dir)
+        while pending:
+            path = pending.pop()
+            if path in files:
+                continue
+            try:
+                content, digest = _read(path)
+            except OSError:
+                continue
+            included = _include_paths(content.decode(self.__encoding), os.path.dirname(path))
+            files[path] = (content, digest, included)
+            pending.extend(included)
+
+        # Kahn's algorithm: one level at a time, every file of a level only includes files of earlier levels.
+        remaining = {path: {p for p in included if p in files} for path, (_, _, included) in files.items()}
+        while remaining:
+            level = [path for path, deps in remaining.items() if not deps]
+            if not level:
+                break  # cycle
+            for path in level:
+                del remaining[path]
+            for deps in remaining.values():
+                deps.difference_update(level)
+            self.__parse_level([(path, files[path][0], files[path][1]) for path in level])
+
+    def __parse_level(self, level):
+        level = [(path, content, digest) for path, content, digest in level
+                 if _include_cache.get((path, digest)) is None]
+        if self.__workers <= 1 or len(level) <= 1:
+            for path, content, digest in level:
+                self.tree(path)
+            return
+
+        from syd.binary import SydBinaryImage, dumps_binary
+        images = {}
+        jobs = []
+        for path, content, digest in level:
+            text = content.decode(self.__encoding)
+            dependency_images = {}
+            for dep_path in _include_paths(text, os.path.dirname(path)):
+                try:
+                    dep_key = (dep_path, _read(dep_path)[1])
+                except OSError:
+                    continue
+                entry = _include_cache.get(dep_key)
+                if entry is not None:
+                    if dep_key not in images:
+                        images[dep_key] = dumps_binary(entry[0])
+                    dependency_images[dep_key] = (images[dep_key], entry[1])
+            jobs.append((path, text, dependency_images))
+
+        with ProcessPoolExecutor(max_workers=min(self.__workers, len(jobs))) as executor:
+            results = executor.map(_parse_included, *zip(*jobs), [self.__encoding] * len(jobs))
+            for (path, content, digest), (image, dependencies) in zip(level, results):
+                _include_cache.set((path, digest), (SydBinaryImage(image).root, dependencies))
@@ -0,0 +1,56 @@
+"""
+Plain Python values of Syd documents, like json.loads().
+
+Blocks become dicts, lists become lists and scalars are the parsed values. They are built straight from the parse
+events - no SydContainer/SydData tree is built and nothing is copied again. Documents with ${...} strings are parsed
+into a tree first, so the references are interpolated like they are by SydParser.parse().
+"""
+from syd.curlybrace_parser import SydEventType, SydTemplateFound, build_from_file, build_from_text
+from syd.datatypes.syd_data import SydDataType
+
+
+def _build(events, check_templates):
+    string = SydDataType.string
+    scalar = SydEventType.scalar
+    start_block, start_list = SydEventType.start_block, SydEventType.start_list
+    events = iter(events)
+    next(events)  # start of the root block
+    root = {}
+    stack = [root]
+    top = root
+    for event, key, value, datatype, _ in events:
+        if event is scalar:
+            if check_templates and datatype is string and '$' in value:
+                raise SydTemplateFound()
+        elif event is start_block or event is start_list:
+            value = [] if event is start_list else {}
+            # the container goes to its parent now and is filled in place
+            if key is None:
+                top.append(value)
+            else:
+                top[key] = value
+            stack.append(value)
+            top = value
+            continue
+        else:
+            del stack[-1]
+            if not stack:
+                break
+            top = stack[-1]
+            continue
+        # for repeated keys the last value wins, as with SydContainer.value
+        if key is None:
+            top.append(value)
+        else:
+            top[key] = value
+    return root
+
+
+def loads(text, **kwargs):
+    """The plain dict of a Syd document (kwargs go to SydParser)"""
+    return build_from_text(text, _build, **kwargs)
+
+
+def load_file(fileobj, **kwargs):
+    """The plain dict of an open (text mode) Syd file - includes are resolved relative to its directory"""
+    return build_from_file(fileobj, _build, **kwargs)
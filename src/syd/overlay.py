@@ -0,0 +1,143 @@
+"""
+Read-only views of layered trees (e.g. defaults <- site <- host <- env) that are merged on demand.
+
+Nothing is copied or merged when an overlay is made. A key is looked up in the layers from the last one down: a
+scalar or a list of a later layer hides the ones below it, blocks of the same key are merged in the same way by a
+nested overlay. Every resolved key and path is cached, so the layers are expected not to change while an overlay of
+them is used - make a new overlay after changing them.
+"""
+from syd.datatypes.syd_data import SydContainer, SydPath, SydReadOnlyDict, path
+
+
+def _is_block(data):
+    return data.is_container and not data.is_list
+
+
+class SydOverlay:
+    """Blocks of containers (or of other overlays) merged on demand - later layers win"""
+    def __init__(self, *containers):
+        assert len(containers) > 0, 'At least one layer is required'
+        for container in containers:
+            assert isinstance(container, (SydContainer, SydOverlay)) and _is_block(container), \
+                'Only blocks can be layered'
+        self.__layers = containers
+        self.__children = {}  # own key -> resolved child (None when no layer has it)
+        self.__resolved = {}  # key, dotted path or SydPath -> resolved child
+        self.__keys = None
+
+    @property
+    def layers(self):
+        return self.__layers
+
+    @property
+    def key(self):
+        return self.__layers[-1].key
+
+    @property
+    def is_scalar(self):
+        return False
+
+    @property
+    def is_container(self):
+        return True
+
+    @property
+    def is_list(self):
+        return False
+
+    def __child(self, key):
+        try:
+            return self.__children[key]
+        except KeyError:
+            pass
+        blocks = []
+        child = None
+        for layer in reversed(self.__layers):
+            if type(layer) is SydOverlay:
+                data = layer.__child(key)
+            else:
+                data = layer.get_child((key, )) if layer.syd_has_key(key) else None
+            if data is None:
+                continue
+            if not _is_block(data):
+                if not blocks:
+                    child = data
+                break  # the layers below are hidden
+            blocks.append(data)
+        if blocks:
+            child = blocks[0] if len(blocks) == 1 else SydOverlay(*reversed(blocks))
+        self.__children[key] = child
+        return child
+
+    def __resolve(self, key):
+        if type(key) is str:
+            syd_path = path(key)
+        elif type(key) is SydPath:
+            syd_path = key
+        else:
+            assert isinstance(key, tuple), f'Only string keys are accepted, you provided key of type: {type(key)}'
+            syd_path = SydPath(key)
+        steps = syd_path.steps
+        data = self
+        for idx, step in enumerate(steps):
+            if type(data) is not SydOverlay:
+                # a container of a single layer resolves the rest itself
+                if not data.is_container:
+                    return None
+                return data.get_child(SydPath(steps[idx:]), error_out=False)
+            if type(step) is int:
+                return None
+            data = data.__child(step)
+            if data is None:
+                return None
+        return data
+
+    def get_child(self, key, error_out=True):
+        """key is a key, a dotted path, a SydPath or a list of keys - the merged child is returned"""
+        if type(key) is list:
+            key = tuple(key)
+        try:
+            data = self.__resolved[key]
+        except KeyError:
+            data = self.__resolved[key] = self.__resolve(key)
+        if data is None and error_out:
+            raise KeyError(f'Key `{key}` was not found')
+        return data
+
+    def get(self, key, default=None):
+        data = self.get_child(key, error_out=False)
+        if data is None:
+            return default
+        return data.value
+
+    def __getitem__(self, key):
+        return self.get_child(key).value
+
+    def __contains__(self, key):
+        return self.get_child(key, error_out=False) is not None
+
+    def keys(self):
+        """Keys of all the layers in the order they first appear"""
+        if self.__keys is None:
+            self.__keys = tuple(dict.fromkeys(key for layer in self.__layers for key in layer.keys()))
+        return self.__keys
+
+    def values(self):
+        return tuple(self.get_child(key).value for key in self.keys())
+
+    def items(self):
+        return tuple((key, self.get_child(key).value) for key in self.keys())
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    @property
+    def value(self):
+        return self.as_dict
+
+    @property
+    def as_dict(self):
+        return SydReadOnlyDict(self.items())
+
+    def __repr__(self):
+        return f'SydOverlay({", ".join(repr(layer.key) for layer in self.__layers)})'
@@ -0,0 +1,43 @@
+"""
+Parsing many Syd files in a process pool.
+
+Workers send parsed trees back as binary images (see syd.binary): one bytes object per file pickles far cheaper than
+the nested node objects, and the parent process only materializes the containers that are accessed.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from syd.curlybrace_parser import SydParser
+from syd.binary import SydBinaryImage, dumps_binary
+
+
+def _parse_to_image(path, encoding):
+    with open(path, encoding=encoding) as f:
+        return dumps_binary(SydParser.parse_file(f))
+
+
+def parse_many(paths, workers=None, merge=False, encoding='utf-8'):
+    """
+    Parses the files at paths with `workers` processes (all CPUs by default) and returns their root containers in the
+    same order. When merge is True a single root is returned where later files override earlier ones
+    (SydContainer.merged_new).
+    """
+    paths = list(paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(paths))
+
+    if workers <= 1:
+        trees = []
+        for path in paths:
+            with open(path, encoding=encoding) as f:
+                trees.append(SydParser.parse_file(f))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            images = executor.map(_parse_to_image, paths, [encoding] * len(paths))
+            trees = [SydBinaryImage(image, read_only=False).root for image in images]
+
+    if merge:
+        if not trees:
+            return SydParser('').parse()
+        return trees[0].merged_new(*trees[1:])
+    return trees
@@ -0,0 +1,149 @@
+"""
+Structural diff of SydContainer trees and patches made from it.
+
+Children of blocks are paired by key and children of lists by index. Subtrees that are the same object on both
+sides, or that have the same structural hash, are skipped without being walked, so trees that share most of their
+nodes (or that are locked and compared again and again) are compared in time proportional to what differs.
+"""
+import itertools
+from syd.datatypes.syd_data import SydContainer
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+
+def _child_pairs(old, new, is_list):
+    """
+    (key, old children, new children) - lists are paired by index. Blocks are paired by key with the children of
+    that key, more than one child of a key on either side is compared (and patched) as a whole.
+    """
+    if is_list:
+        for idx, (o, n) in enumerate(itertools.zip_longest(old, new)):
+            yield str(idx), () if o is None else (o,), () if n is None else (n,)
+        return
+    old_by_key = {}
+    for data in old:
+        old_by_key.setdefault(data.key, []).append(data)
+    new_by_key = {}
+    for data in new:
+        new_by_key.setdefault(data.key, []).append(data)
+    for key in dict.fromkeys(itertools.chain(old_by_key, new_by_key)):
+        yield key, old_by_key.get(key, ()), new_by_key.get(key, ())
+
+
+def _hashed_same(a, b):
+    """
+    Whether two containers are the same, when their structural hashes can tell - they are used when they are cached
+    or when both containers are locked (then they are computed once and stay valid). Different hashes mean different
+    containers, equal hashes are confirmed by comparing the data as hashes can collide.
+    """
+    if (a.has_structural_hash or a.is_read_only) and (b.has_structural_hash or b.is_read_only):
+        return a.structural_hash == b.structural_hash and a.syd_same_as(b)
+    return False
+
+
+def iter_changes(old, new, is_list=False, prefix=''):
+    """
+    Generates (kind, dotted path, new children) for the differences between two sequences of children, in document
+    order. The new children of a removed path are empty.
+    """
+    stack = [(prefix, _child_pairs(old, new, is_list))]
+    while stack:
+        prefix, pairs = stack[-1]
+        for key, o, n in pairs:
+            path = prefix + key
+            if not o:
+                yield ADDED, path, tuple(n)
+            elif not n:
+                yield REMOVED, path, ()
+            elif len(o) != 1 or len(n) != 1:
+                if len(o) != len(n) or not all(a.syd_same_as(b) for a, b in zip(o, n)):
+                    yield CHANGED, path, tuple(n)
+            else:
+                o, n = o[0], n[0]
+                if o is n:
+                    continue
+                if o.is_container and n.is_container and o.is_list == n.is_list:
+                    if _hashed_same(o, n):
+                        continue
+                    stack.append((path + '.', _child_pairs(o.get_children(), n.get_children(), o.is_list)))
+                    break
+                if o.is_container or n.is_container or not o.syd_same_as(n):
+                    yield CHANGED, path, (n,)
+        else:
+            stack.pop()
+
+
+class SydPatch:
+    """The differences between two trees (see diff()) - apply it with SydContainer.apply_patch()"""
+    def __init__(self, changes):
+        self.__changes = tuple(changes)
+
+    def __paths(self, kind):
+        return tuple(path for k, path, _ in self.__changes if k == kind)
+
+    @property
+    def added(self):
+        return self.__paths(ADDED)
+
+    @property
+    def removed(self):
+        return self.__paths(REMOVED)
+
+    @property
+    def changed(self):
+        return self.__paths(CHANGED)
+
+    @property
+    def changes(self):
+        """(kind, dotted path, new children) in document order"""
+        return self.__changes
+
+    def __bool__(self):
+        return bool(self.__changes)
+
+    def __len__(self):
+        return len(self.__changes)
+
+    def __repr__(self):
+        return f'SydPatch(added={self.added}, removed={self.removed}, changed={self.changed})'
+
+    def apply_to(self, container):
+        """
+        Changes container like the tree the patch was made from. The new children are cloned and added keys go to
+        the end of their blocks.
+        """
+        def parent_and_key(path):
+            parent_path, _, key = path.rpartition('.')
+            return (container.get_child(parent_path) if parent_path else container), key
+
+        removed = []
+        for kind, path, children in self.__changes:
+            parent, key = parent_and_key(path)
+            if kind == CHANGED:
+                if parent.is_list:
+                    parent.update(int(key), children[0].clone())
+                elif len(children) == 1 and len(parent.get_child(key, multi=True)) == 1:
+                    parent.update(key, children[0].clone())
+                else:
+                    del parent[key]
+                    for child in children:
+                        parent.add(child.clone())
+            elif kind == ADDED:
+                for child in children:
+                    parent.add(child.clone())
+            else:
+                removed.append((parent, key))
+        # removed list items are at the end of their lists - the last ones go first
+        for parent, key in reversed(removed):
+            del parent[key]
+
+
+def diff(a, b):
+    """The SydPatch that turns the tree a into the tree b"""
+    assert isinstance(a, SydContainer) and isinstance(b, SydContainer)
+    assert a.is_list == b.is_list, 'A block cannot be compared with a list'
+    if a is b:
+        return SydPatch(())
+    return SydPatch(iter_changes(a.get_children(), b.get_children(), a.is_list))
@@ -0,0 +1,352 @@
+"""
+Typed models of Syd documents.
+
+compile_model() turns a dataclass (or a type like list[Server] or dict[str, int]) into a SydDecoder once. The decoder
+builds the model instances straight from the parse events - no SydContainer/SydData tree is built - and all the
+values that do not fit the model are reported by their dotted paths in one SynamicSydValidationError.
+
+Supported types: dataclasses, str, int, float, bool, datetime.date/time/datetime, enums, list[X], tuple[X, ...],
+dict[str, X], Optional[X] (a missing key is None) and Any (plain dicts, lists and scalars).
+"""
+import dataclasses
+import datetime
+import enum
+import functools
+import types
+import typing
+from syd.curlybrace_parser import SydEventType, SydTemplateFound, build_from_file, build_from_text, tree_events
+from syd.datatypes.syd_data import SydDataType
+from syd.exceptions import SynamicSydValidationError
+
+# kinds of compiled types
+_SCALAR = 0
+_MODEL = 1
+_SEQUENCE = 2
+_MAPPING = 3
+_ANY = 4
+
+# marks a value that did not fit - the model that contains it is not built
+_INVALID = object()
+
+# X | None is a types.UnionType from Python 3.10
+_UNIONS = (typing.Union, getattr(types, 'UnionType', typing.Union))
+
+_TRUE = frozenset(('true', 'yes', 'on', '1'))
+_FALSE = frozenset(('false', 'no', 'off', '0'))
+
+
+class _Invalid(Exception):
+    pass
+
+
+def _describe(value):
+    return f'{value!r} ({type(value).__name__})'
+
+
+def _to_str(value):
+    if type(value) is str:
+        return value
+    raise _Invalid(f'expected a string, got {_describe(value)}')
+
+
+def _to_int(value):
+    if type(value) is int:
+        return value
+    if type(value) is float and value.is_integer():
+        return int(value)
+    raise _Invalid(f'expected an integer, got {_describe(value)}')
+
+
+def _to_float(value):
+    if type(value) in (int, float):
+        return float(value)
+    raise _Invalid(f'expected a number, got {_describe(value)}')
+
+
+def _to_bool(value):
+    if type(value) is str:
+        lowered = value.lower()
+        if lowered in _TRUE:
+            return True
+        if lowered in _FALSE:
+            return False
+    elif type(value) is int and value in (0, 1):
+        return bool(value)
+    raise _Invalid(f'expected a boolean, got {_describe(value)}')
+
+
+def _to_date(value):
+    # dates are parsed as datetimes at midnight
+    if type(value) is datetime.datetime and value.time() == datetime.time():
+        return value.date()
+    if type(value) is datetime.date:
+        return value
+    raise _Invalid(f'expected a date, got {_describe(value)}')
+
+
+def _to_time(value):
+    if type(value) is datetime.time:
+        return value
+    raise _Invalid(f'expected a time, got {_describe(value)}')
+
+
+def _to_datetime(value):
+    if type(value) is datetime.datetime:
+        return value
+    if type(value) is datetime.date:
+        return datetime.datetime.combine(value, datetime.time())
+    raise _Invalid(f'expected a date-time, got {_describe(value)}')
+
+
+def _to_enum(enum_type):
+    def convert(value):
+        try:
+            return enum_type(value)
+        except ValueError:
+            pass
+        if type(value) is str and value in enum_type.__members__:
+            return enum_type[value]
+        raise _Invalid(f'expected one of {", ".join(enum_type.__members__)}, got {_describe(value)}')
+    return convert
+
+
+_CONVERTERS = {
+    str: _to_str,
+    int: _to_int,
+    float: _to_float,
+    bool: _to_bool,
+    datetime.date: _to_date,
+    datetime.time: _to_time,
+    datetime.datetime: _to_datetime,
+}
+
+
+class _Compiled:
+    """A compiled type - what the decoder needs to know about it, looked up once"""
+    __slots__ = ('kind', 'name', 'convert', 'cls', 'fields', 'required', 'defaults', 'item', 'factory')
+
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+        self.convert = None  # scalars
+        self.cls = None  # models
+        self.fields = None  # models: key -> compiled type of the field
+        self.required = None  # models: keys without defaults
+        self.defaults = None  # models: key -> None for Optional fields without defaults
+        self.item = None  # sequences and mappings: compiled type of the items
+        self.factory = None  # sequences: list or tuple
+
+
+def _optional_of(tp):
+    """X of Optional[X] (or of X | None), None for other types"""
+    if typing.get_origin(tp) in _UNIONS:
+        args = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+        if len(args) == 1 and len(typing.get_args(tp)) == 2:
+            return args[0]
+    return None
+
+
+def _compile(tp, compiled):
+    """compiled: types compiled so far - models that refer to themselves are compiled once"""
+    if tp in compiled:
+        return compiled[tp]
+    origin = typing.get_origin(tp)
+    args = typing.get_args(tp)
+    if tp is typing.Any or tp is object:
+        result = _Compiled(_ANY, 'any value')
+    elif tp in _CONVERTERS:
+        result = _Compiled(_SCALAR, tp.__name__)
+        result.convert = _CONVERTERS[tp]
+    elif isinstance(tp, type) and issubclass(tp, enum.Enum):
+        result = _Compiled(_SCALAR, tp.__name__)
+        result.convert = _to_enum(tp)
+    elif dataclasses.is_dataclass(tp) and isinstance(tp, type):
+        result = _Compiled(_MODEL, tp.__name__)
+        compiled[tp] = result
+        hints = typing.get_type_hints(tp)
+        result.cls = tp
+        result.fields = {}
+        result.required = []
+        result.defaults = {}
+        for field in dataclasses.fields(tp):
+            if not field.init:
+                continue
+            field_type = hints[field.name]
+            optional = _optional_of(field_type)
+            has_default = field.default is not dataclasses.MISSING or field.default_factory is not dataclasses.MISSING
+            if optional is not None:
+                field_type = optional
+                if not has_default:
+                    result.defaults[field.name] = None
+            elif not has_default:
+                result.required.append(field.name)
+            result.fields[field.name] = _compile(field_type, compiled)
+    elif origin in (list, tuple) or tp in (list, tuple):
+        if origin is tuple and not (len(args) == 2 and args[1] is Ellipsis):
+            raise TypeError(f'Only tuple[X, ...] tuples are supported, not {tp}')
+        result = _Compiled(_SEQUENCE, 'a list')
+        result.factory = tuple if (origin or tp) is tuple else list
+        result.item = _compile(args[0] if args else typing.Any, compiled)
+    elif origin is dict or tp is dict:
+        if args and args[0] is not str:
+            raise TypeError(f'Keys of Syd blocks are strings, {tp} cannot be decoded')
+        result = _Compiled(_MAPPING, 'a block')
+        result.item = _compile(args[1] if args else typing.Any, compiled)
+    elif _optional_of(tp) is not None:
+        result = _compile(_optional_of(tp), compiled)
+    else:
+        raise TypeError(f'{tp} cannot be decoded from Syd documents')
+    compiled[tp] = result
+    return result
+
+
+class SydDecoder:
+    """A model compiled by compile_model()"""
+    def __init__(self, model):
+        self.__model = model
+        self.__compiled = _compile(model, {})
+
+    @property
+    def model(self):
+        return self.__model
+
+    def decode(self, container):
+        """The model instance of a SydContainer (or of a part of a tree)"""
+        return self.__decode(tree_events(container), False)
+
+    def decode_text(self, text, **kwargs):
+        """
+        The model instance of a document, decoded while it is parsed (kwargs go to SydParser). Documents with
+        strings to interpolate are parsed into a tree first, so the references are resolved.
+        """
+        return build_from_text(text, self.__decode, **kwargs)
+
+    def decode_file(self, fileobj, **kwargs):
+        """The model instance of an open (text mode) file - includes are resolved relative to its directory"""
+        return build_from_file(fileobj, self.__decode, **kwargs)
+
+    def decode_events(self, events):
+        """The model instance of SydEvent-s (see SydParser.iter_events()) - strings are not interpolated"""
+        return self.__decode(events, False)
+
+    def __decode(self, events, check_templates):
+        errors = []
+        string = SydDataType.string
+        scalar_event = SydEventType.scalar
+        start_list, start_block = SydEventType.start_list, SydEventType.start_block
+        events = iter(events)
+        root = next(events)
+        value = self.__start(self.__compiled, root.event is start_list, '', errors)
+        if value is None:
+            # the model does not fit at all
+            raise SynamicSydValidationError(errors)
+        # a frame: [compiled type, value being built, dotted path of it with a trailing dot]
+        stack = [[self.__compiled, value, '']]
+        frame = stack[-1]
+        for event, key, value, datatype, _ in events:
+            if event is scalar_event:
+                if check_templates and datatype is string and '$' in value:
+                    raise SydTemplateFound()
+                compiled = frame[0]
+                if compiled is None:
+                    continue  # inside a container that does not fit
+                kind = compiled.kind
+                if kind == _MODEL:
+                    child = compiled.fields.get(key)
+                    if child is None:
+                        errors.append((frame[2] + key, f'unknown key of {compiled.name}'))
+                        continue
+                else:
+                    child = compiled.item if kind != _ANY else compiled
+                if child.kind == _SCALAR:
+                    try:
+                        value = child.convert(value)
+                    except _Invalid as e:
+                        errors.append((self.__child_path(frame, key), str(e)))
+                        value = _INVALID
+                elif child.kind != _ANY:
+                    errors.append((self.__child_path(frame, key), f'expected {child.name}, got {_describe(value)}'))
+                    value = _INVALID
+                if key is None:
+                    frame[1].append(value)
+                else:
+                    frame[1][key] = value
+            elif event is start_block or event is start_list:
+                compiled = frame[0]
+                child = None
+                if compiled is not None:
+                    if compiled.kind == _MODEL:
+                        child = compiled.fields.get(key)
+                        if child is None:
+                            errors.append((frame[2] + key, f'unknown key of {compiled.name}'))
+                    elif compiled.kind == _ANY:
+                        child = compiled
+                    else:
+                        child = compiled.item
+                path = self.__child_path(frame, key)
+                value = None if child is None else self.__start(child, event is start_list, path, errors)
+                frame = [None if value is None else child, value, path + '.', key]
+                stack.append(frame)
+            else:
+                done = stack.pop()
+                if not stack:
+                    break
+                frame = stack[-1]
+                if frame[0] is None:
+                    continue
+                value = self.__finish(done, errors)
+                key = done[3]
+                if key is None:
+                    frame[1].append(value)
+                else:
+                    frame[1][key] = value
+        value = self.__finish(done, errors)
+        if errors:
+            raise SynamicSydValidationError(errors)
+        return value
+
+    @staticmethod
+    def __child_path(frame, key):
+        return frame[2] + (str(len(frame[1])) if key is None else key)
+
+    @staticmethod
+    def __start(compiled, is_list, path, errors):
+        """The empty value a container is built into - None when the container does not fit"""
+        kind = compiled.kind
+        if kind == _ANY:
+            return [] if is_list else {}
+        if kind == _SEQUENCE and is_list:
+            return []
+        if kind in (_MODEL, _MAPPING) and not is_list:
+            return {}
+        errors.append((path, f'expected {compiled.name}, got a {"list" if is_list else "block"}'))
+        return None
+
+    @staticmethod
+    def __finish(frame, errors):
+        compiled, value, path = frame[0], frame[1], frame[2]
+        if compiled is None:
+            return _INVALID
+        kind = compiled.kind
+        if kind == _SEQUENCE:
+            return value if compiled.factory is list else tuple(value)
+        if kind != _MODEL:
+            return value
+        missing = [key for key in compiled.required if key not in value]
+        for key in missing:
+            errors.append((path + key, f'missing key of {compiled.name}'))
+        if missing or any(v is _INVALID for v in value.values()):
+            return _INVALID
+        for key, default in compiled.defaults.items():
+            value.setdefault(key, default)
+        try:
+            return compiled.cls(**value)
+        except (TypeError, ValueError) as e:
+            errors.append((path.rstrip('.'), str(e)))
+            return _INVALID
+
+
+@functools.lru_cache(maxsize=None)
+def compile_model(model):
+    """The SydDecoder of a model (a dataclass or a type like list[X] or dict[str, X]) - compiled once per model"""
+    return SydDecoder(model)
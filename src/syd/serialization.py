@@ -0,0 +1,63 @@
+"""
+Plain tuple form of Syd trees.
+
+A tree is flattened into nested tuples of builtin objects that pickle (or marshal) compactly and quickly, unlike the
+deeply nested, name-mangled node objects:
+
+    scalar:    (SCALAR, key, value, datatype number or None)
+    container: (BLOCK or LIST, key, (child, child, ...))
+
+Converters and converted values are not part of the tuple form.
+"""
+from syd.datatypes.syd_data import SydDataType, SydData, SydContainer
+
+SCALAR = 0
+BLOCK = 1
+LIST = 2
+
+
+def _scalar_to_tuple(syd):
+    datatype = syd.type
+    return SCALAR, syd.key, syd.value_origin, None if datatype is None else datatype.value
+
+
+def tree_to_tuple(syd):
+    if not syd.is_container:
+        return _scalar_to_tuple(syd)
+    # containers are converted through a stack so that deep trees do not hit the recursion limit
+    stack = [(syd, iter(syd.get_children()), [])]
+    while True:
+        container, children, converted = stack[-1]
+        for child in children:
+            if child.is_container:
+                stack.append((child, iter(child.get_children()), []))
+                break
+            converted.append(_scalar_to_tuple(child))
+        else:
+            stack.pop()
+            data = (LIST if container.is_list else BLOCK, container.key, tuple(converted))
+            if not stack:
+                return data
+            stack[-1][2].append(data)
+
+
+def _scalar_from_tuple(data):
+    datatype = data[3]
+    return SydData(data[1], data[2], None if datatype is None else SydDataType(datatype))
+
+
+def tree_from_tuple(data):
+    if data[0] == SCALAR:
+        return _scalar_from_tuple(data)
+    root = SydContainer(data[1], is_list=data[0] == LIST)
+    stack = [(root, data[2])]
+    while stack:
+        container, children = stack.pop()
+        for child in children:
+            if child[0] == SCALAR:
+                container.add(_scalar_from_tuple(child))
+            else:
+                child_container = SydContainer(child[1], is_list=child[0] == LIST)
+                container.add(child_container)
+                stack.append((child_container, child[2]))
+    return root
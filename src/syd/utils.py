@@ -1,23 +1,160 @@
+import re
+import operator
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+
+# line breaks (of str.splitlines()) other than \n - text with any of them cannot be used as lines joined with \n
+# without splitting it
+_OTHER_LINE_BREAKS = '\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+_indentation = re.compile(r'[ \t]*')
+
+
+def _has_other_line_break(text, start, end):
+    # a str.find() per character is much faster than a regex search with a character class
+    return any(text.find(char, start, end) != -1 for char in _OTHER_LINE_BREAKS)
+
+
+def indent_width(text, start=0, end=None):
+    """Width of the spaces and tabs (4 wide) at start of text"""
+    match = _indentation.match(text, start, len(text) if end is None else end)
+    return match.end() - start + 3 * text.count('\t', start, match.end())
+
+
+@lru_cache(maxsize=64)
+def _less_indented(width):
+    """Start of a line with less than width spaces"""
+    return re.compile(r'\n(?! {%d})' % width)
+
+
+def dedent(line, width):
+    """Removes leading spaces and tabs of line up to width"""
+    if line[:width].strip(' ') == '':
+        return line[width:]  # only spaces - the common case
+    idx = 0
+    size = 0
+    while size < width and idx < len(line) and line[idx] in ' \t':
+        size += 4 if line[idx] == '\t' else 1
+        idx += 1
+    return line[idx:]
+
+
+class LineIndex:
+    """
+    Start and end offsets of every line of a text, computed once.
+    Lines (and snippets around them) are sliced out of the text on demand instead of splitting the whole text.
+    Line numbers start at 1 and the lines are the same as the ones from text.splitlines().
+    """
+    def __init__(self, text):
+        self.__text = text
+        # the lines only exist while the offsets are summed up (in C) - it is much faster than a loop over the breaks
+        starts = array('q', accumulate(map(len, text.splitlines(True)), initial=0))
+        starts.pop()  # that is the end of the text
+        self.__starts = starts
+        self.__ends = array('q', map(operator.add, starts, map(len, text.splitlines())))
+
+    @property
+    def text(self):
+        return self.__text
+
+    def __len__(self):
+        return len(self.__starts)
+
+    def start(self, line_no):
+        return self.__starts[line_no - 1]
+
+    def end(self, line_no):
+        return self.__ends[line_no - 1]
+
+    def line_no_at(self, offset):
+        """Number of the line that contains offset"""
+        return bisect_right(self.__starts, offset)
+
+    def min_indent_width(self, first_line_no, last_line_no):
+        """The smallest indent_width() of the lines from first_line_no to last_line_no"""
+        text = self.__text
+        start, end = self.__starts[first_line_no - 1], self.__ends[last_line_no - 1]
+        width = indent_width(text, start, end)
+        if text.find('\t', start, end) == -1 and not _has_other_line_break(text, start, end):
+            # spaces and \n only - a search for a less indented line instead of measuring every line
+            while width > 0:
+                match = _less_indented(width).search(text, start, end)
+                if match is None:
+                    break
+                start = match.end()
+                width = indent_width(text, start, self.__ends[self.line_no_at(start) - 1])
+            return width
+        for line_no in range(first_line_no + 1, last_line_no + 1):
+            width = min(width, indent_width(text, self.__starts[line_no - 1], self.__ends[line_no - 1]))
+        return width
+
+    def line(self, line_no):
+        return self.__text[self.__starts[line_no - 1]:self.__ends[line_no - 1]]
+
+    def lines(self, first_line_no=1, last_line_no=None):
+        """Generates the lines from first_line_no to last_line_no (inclusive)"""
+        text = self.__text
+        starts = self.__starts
+        ends = self.__ends
+        if last_line_no is None:
+            last_line_no = len(starts)
+        for idx in range(first_line_no - 1, last_line_no):
+            yield text[starts[idx]:ends[idx]]
+
+    def __iter__(self):
+        return self.lines()
+
+    def snippet(self, line_no, limit=10):
+        """Line no starts at 1 not at 0"""
+        half_limit = limit // 2
+        first_line_no = max(line_no - half_limit, 1)
+        last_line_no = min(line_no + half_limit, len(self))
+        res = []
+        for no, line in enumerate(self.lines(first_line_no, last_line_no), first_line_no):
+            res.append(('->.. ' if no == line_no else '.... ') + line)
+        return '\n'.join(res)
+
+
+class LinesView:
+    """
+    Lines first_line_no to last_line_no of a LineIndex, joined with \\n and dedented by indent (see dedent).
+    Nothing is copied out of the text until str() is called. Lines that are only an escaped `\\}` become `}`.
+    """
+    def __init__(self, line_index, first_line_no, last_line_no, indent=0):
+        self.__line_index = line_index
+        self.__first_line_no = first_line_no
+        self.__last_line_no = last_line_no
+        self.__indent = indent
+
+    @property
+    def __span(self):
+        if self.__first_line_no > self.__last_line_no:
+            return 0, 0
+        return self.__line_index.start(self.__first_line_no), self.__line_index.end(self.__last_line_no)
+
+    def __contains__(self, sub):
+        start, end = self.__span
+        return self.__line_index.text.find(sub, start, end) != -1
+
+    def __str__(self):
+        start, end = self.__span
+        text = self.__line_index.text
+        if self.__indent == 0 and text.find('\\}', start, end) == -1 and \
+                not _has_other_line_break(text, start, end):
+            return text[start:end]
+        indent = self.__indent
+        lines = []
+        for line in self.__line_index.lines(self.__first_line_no, self.__last_line_no):
+            if line.strip(' \t') == r'\}':
+                line = line.replace(r'\}', '}')
+            lines.append(dedent(line, indent) if indent else line)
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f'LinesView({self.__first_line_no}, {self.__last_line_no}, indent={self.__indent})'
+
+
 def get_source_snippet_from_text(text, line_no, limit=10):
     """Line no starts at 1 not at 0"""
-    source = text
-    lines = source.splitlines()
-
-    half_limit = limit//2
-    half_limit_l = half_limit
-    if line_no > half_limit:
-        half_limit_l = line_no - half_limit
-    else:
-        half_limit_l = 1
-    res = []
-    res.extend(
-        ['.... ' + line for line in lines[half_limit_l - 1:line_no - 1]]
-    )
-
-    error_line = lines[line_no - 1]
-    res.append('->.. ' + error_line)
-
-    res.extend(
-        ['.... ' + line for line in lines[line_no:line_no + half_limit]]
-    )
-    return '\n'.join(res)
+    return LineIndex(text).snippet(line_no, limit=limit)
@@ -0,0 +1,55 @@
+from unittest import TestCase
+from syd import SydParser, SydContainer, SydBinaryImage, dump_binary, dumps_binary
+from syd.exceptions import SynamicSydBinaryFormatError
+from os.path import join, abspath, dirname
+import datetime
+import os
+import tempfile
+
+BASE_DIR = dirname(abspath(__file__))
+
+
+class TestSydBinary(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        with open(join(BASE_DIR, "data/test_text-1.txt"), encoding="utf-8") as f:
+            cls.tree = SydParser(f.read()).parse()
+
+    def test_round_trip(self):
+        image = SydBinaryImage(dumps_binary(self.tree))
+        self.assertEqual(self.tree.value, image.root.value)
+        self.assertEqual(("1", "7'"), image.root["list_ml.4"])
+
+    def test_scalar_types(self):
+        tree = SydContainer('__root__')
+        tree.add('i', 2 ** 70)
+        tree.add('f', -1.25)
+        tree.add('d', datetime.date(2018, 3, 4))
+        tree.add('t', datetime.time(23, 59, 1, 5))
+        tree.add('dt', datetime.datetime(2018, 3, 4, 5, 6, 7))
+        tree.add('s', 'ক')
+        self.assertEqual(tree.value, SydBinaryImage(dumps_binary(tree)).root.value)
+
+    def test_lazy_materialization(self):
+        root = SydBinaryImage(dumps_binary(self.tree)).root
+        key1 = root.get_child('key1')
+        self.assertFalse(key1.is_loaded)
+        self.assertEqual(1, root['key1.key_n1.k'])
+        self.assertTrue(key1.is_loaded)
+        self.assertFalse(root.get_child('list_ml').is_loaded)
+
+    def test_mmap_file(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            dump_binary(self.tree, path)
+            with SydBinaryImage.open(path) as image:
+                self.assertEqual("my\n text", image.root['ml'])
+                with self.assertRaises(AssertionError):
+                    image.root.add('x', 1)
+        finally:
+            os.remove(path)
+
+    def test_invalid_image(self):
+        with self.assertRaises(SynamicSydBinaryFormatError):
+            SydBinaryImage(b'not an image at all, just some bytes')
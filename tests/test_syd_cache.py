@@ -0,0 +1,52 @@
+from unittest import TestCase, mock
+from syd import load, SydParser
+from syd.cache import CACHE_SUFFIX, evict
+from os.path import join, abspath, dirname
+import os
+import shutil
+import tempfile
+
+BASE_DIR = dirname(abspath(__file__))
+
+
+class TestSydCache(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = join(self.tmp_dir, 'cache')
+        self.path = join(self.tmp_dir, 'conf.syd')
+        shutil.copy(join(BASE_DIR, "data/test_text-1.txt"), self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_reload_from_cache_without_parsing(self):
+        tree = load(self.path, cache_dir=self.cache_dir)
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+        with mock.patch('syd.cache.SydParser', side_effect=AssertionError('parsed again')):
+            cached = load(self.path, cache_dir=self.cache_dir)
+        self.assertEqual(tree.value, cached.value)
+        self.assertEqual("ml string in list\n    got it?", cached["list_ml.7"])
+
+    def test_changed_file_is_parsed_again(self):
+        load(self.path, cache_dir=self.cache_dir)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('\nnew_key: 1\n')
+        self.assertEqual(1, load(self.path, cache_dir=self.cache_dir)['new_key'])
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+
+    def test_corrupt_cache_file_is_a_miss(self):
+        tree = load(self.path, cache_dir=self.cache_dir)
+        cache_path = join(self.cache_dir, os.listdir(self.cache_dir)[0])
+        with open(cache_path, 'rb') as f:
+            content = f.read()
+        # a pickle without the header (it would raise AttributeError) is not unpickled, a truncated file is a miss
+        for corrupt in (b'\x80\x04cos\nno_such_attribute\n.', content[:len(content) // 2]):
+            with open(cache_path, 'wb') as f:
+                f.write(corrupt)
+            self.assertEqual(tree.value, load(self.path, cache_dir=self.cache_dir).value)
+
+    def test_eviction(self):
+        load(self.path, cache_dir=self.cache_dir)
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+        evict(self.cache_dir, max_cache_size=0)
+        self.assertEqual([], [n for n in os.listdir(self.cache_dir) if n.endswith(CACHE_SUFFIX)])
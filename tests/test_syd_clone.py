@@ -0,0 +1,66 @@
+import pickle
+from unittest import TestCase
+from syd import SydParser, SydData
+
+
+class TestSydCopyOnWrite(TestCase):
+    def setUp(self):
+        self.base = SydParser("a: 1\nb {\n    c {\n        d: 2\n    }\n    l [\n        x\n    ]\n}\n").parse()
+
+    def test_changes_of_the_original_are_not_seen(self):
+        base = self.base
+        clone = base.clone()
+        self.assertFalse(clone.is_loaded)
+        base.get_child('b.c').update('d', SydData('d', 3))
+        base.get_child('b.l').add(SydData(None, 'y'))
+        del base['a']
+        self.assertEqual({'a': 1, 'b': {'c': {'d': 2}, 'l': ('x',)}}, _plain(clone))
+        self.assertEqual({'b': {'c': {'d': 3}, 'l': ('x', 'y')}}, _plain(base))
+
+    def test_changes_of_the_clone_are_not_seen(self):
+        base = self.base
+        clone = base.clone()
+        clone_of_clone = clone.clone()
+        clone.get_child('b.c').add(SydData('e', 4))
+        clone.get_child('b.l.0').set_converted('X')
+        self.assertEqual({'a': 1, 'b': {'c': {'d': 2, 'e': 4}, 'l': ('X',)}}, _plain(clone))
+        self.assertEqual({'a': 1, 'b': {'c': {'d': 2}, 'l': ('x',)}}, _plain(base))
+        self.assertEqual(_plain(base), _plain(clone_of_clone))
+
+    def test_conversion_of_the_original_is_not_seen(self):
+        base = self.base
+        clone = base.clone()
+        base.get_child('b').set_converted('CONVERTED')
+        base.get_child('b.c').set_converter(lambda value: 'converted')
+        self.assertEqual({'a': 1, 'b': {'c': {'d': 2}, 'l': ('x',)}}, _plain(clone))
+        self.assertEqual({'d': 2}, clone['b']['c'])
+
+    def test_pickle(self):
+        base = self.base
+        base.as_dict
+        clone = base.clone()
+        clone.get_child('b').clone()
+        for tree in (base, clone):
+            copy = pickle.loads(pickle.dumps(tree))
+            self.assertEqual(_plain(base), _plain(copy))
+            self.assertIs(copy, copy.get_child('b').parent)
+        copy.get_child('b.c').add(SydData('e', 4))
+        self.assertEqual({'d': 2}, _plain(clone.get_child('b.c')))
+
+    def test_new_and_merged_new(self):
+        base = self.base
+        override = SydParser("a: 5\nb {\n    c {\n        e: 6\n    }\n}\n").parse()
+        self.assertEqual({'a': 5, 'b': {'c': {'e': 6}}}, _plain(base.new(override)))
+        merged = base.merged_new(override)
+        # only the path to the changes was copied
+        self.assertFalse(merged.get_child('b.l').is_loaded)
+        self.assertEqual({'a': 5, 'b': {'c': {'d': 2, 'e': 6}, 'l': ('x',)}}, _plain(merged))
+        self.assertEqual({'a': 1, 'b': {'c': {'d': 2}, 'l': ('x',)}}, _plain(base))
+
+
+def _plain(container):
+    value = container.value
+    if isinstance(value, dict):
+        return {k: _plain(container.get_child(k)) if container.get_child(k).is_container else v
+                for k, v in value.items()}
+    return value
@@ -0,0 +1,31 @@
+from unittest import TestCase
+from syd import SydParser, SydContainer, SydData
+
+
+class TestSydDelete(TestCase):
+    def test_tombstones_are_compacted(self):
+        block = SydContainer('b')
+        for i in range(10):
+            block.add(SydData(f'k{i}', i))
+        block.add(SydData('k3', 33))
+        del block['k3']
+        del block['k5']
+        self.assertEqual(('k0', 'k1', 'k2', 'k4', 'k6', 'k7', 'k8', 'k9'), block.keys())
+        self.assertEqual(9, block['k9'])
+        block.add(SydData('k3', 3))
+        del block['k0']
+        self.assertEqual(3, block['k3'])
+        self.assertEqual((1, 2, 4, 6, 7, 8, 9, 3), block.values())
+        with self.assertRaises(KeyError):
+            del block['k0']
+
+    def test_delete_many(self):
+        tree = SydParser("a: 1\nb: 2\nc {\n    d: 3\n    e: 4\n}\nl [\n    1\n    2\n    3\n    4\n]\n").parse()
+        tree.delete_many(['a', 'c.d'])
+        self.assertEqual(('b', 'c', 'l'), tree.keys())
+        self.assertEqual({'e': 4}, dict(tree['c']))
+        tree.get_child('l').delete_many([0, '2', -1])
+        self.assertEqual((2,), tree['l'])
+        with self.assertRaises(KeyError):
+            tree.delete_many(['b', 'nope'])
+        self.assertEqual(('c', 'l'), tree.keys())
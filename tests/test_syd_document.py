@@ -0,0 +1,50 @@
+from unittest import TestCase
+from syd import SydParser, SydDocument, SynamicSydParseError
+
+
+class TestSydDocumentReload(TestCase):
+    text = "name: app\n\ndb {\n    host: localhost\n    port: 5432\n}\n# servers\nservers [\n    a\n    b\n]\n" \
+           "url: ${db.host}/${name}\n"
+
+    def assert_same_as_parse(self, document):
+        self.assertEqual(SydParser(document.text).parse().value, document.tree.value)
+
+    def test_one_line_edit(self):
+        document = SydDocument(self.text)
+        db = document.tree.get_child('db')
+        servers = document.tree.get_child('servers')
+        changed = document.reload(self.text.replace('port: 5432', 'port: 5433'))
+        self.assertEqual(('db.port',), changed)
+        self.assert_same_as_parse(document)
+        # untouched items are kept
+        self.assertIs(servers, document.tree.get_child('servers'))
+        self.assertIsNot(db, document.tree.get_child('db'))
+        self.assertEqual((), document.reload(document.text))
+
+    def test_interpolated_strings_follow_changes(self):
+        document = SydDocument(self.text)
+        changed = document.reload(self.text.replace('host: localhost', 'host: db.local'))
+        self.assertEqual({'db.host', 'url'}, set(changed))
+        self.assertEqual('db.local/app', document.tree['url'])
+
+    def test_added_removed_and_structure_changes(self):
+        document = SydDocument(self.text)
+        self.assertEqual(('servers.2',), document.reload(self.text.replace('    b\n', '    b\n    c\n')))
+        self.assert_same_as_parse(document)
+        # removing the end of a block changes what follows it
+        text = self.text.replace('    port: 5432\n}\n', '    port: 5432\n')
+        changed = document.reload(text)
+        self.assertIn('db.servers', changed)
+        self.assertIn('servers', changed)
+        self.assert_same_as_parse(document)
+        document.reload('')
+        self.assertEqual({}, dict(document.tree.value))
+        document.reload(self.text)
+        self.assert_same_as_parse(document)
+
+    def test_errors_leave_the_tree(self):
+        document = SydDocument(self.text)
+        with self.assertRaises(SynamicSydParseError):
+            document.reload(self.text.replace('port: 5432', 'port ~ { data'))
+        self.assertEqual(self.text, document.text)
+        self.assertEqual(5432, document.tree['db.port'])
@@ -0,0 +1,52 @@
+from unittest import TestCase
+from syd import SydParser, SydEventType, SydDataType, iterparse, SynamicSydParseError
+from os.path import join, abspath, dirname
+
+BASE_DIR = dirname(abspath(__file__))
+
+
+class TestSydEvents(TestCase):
+    def test_iterparse_events(self):
+        text = "a: 1\nb {\n    c: x\n}\nl: (1, y)\n"
+        events = [(e.event, e.key, e.value, e.datatype) for e in SydParser(text).iter_events()]
+        self.assertEqual([
+            (SydEventType.start_block, '__root__', None, None),
+            (SydEventType.scalar, 'a', 1, SydDataType.number),
+            (SydEventType.start_block, 'b', None, None),
+            (SydEventType.scalar, 'c', 'x', SydDataType.string),
+            (SydEventType.end_block, 'b', None, None),
+            (SydEventType.start_list, 'l', None, None),
+            (SydEventType.scalar, None, 1, SydDataType.number),
+            (SydEventType.scalar, None, 'y', SydDataType.string),
+            (SydEventType.end_list, 'l', None, None),
+            (SydEventType.end_block, '__root__', None, None),
+        ], events)
+
+    def test_parse_file_matches_parse(self):
+        path = join(BASE_DIR, "data/test_text-1.txt")
+        with open(path, encoding="utf-8") as f:
+            tree_from_text = SydParser(f.read()).parse()
+        with open(path, encoding="utf-8") as f:
+            tree_from_file = SydParser.parse_file(f)
+        self.assertEqual(tree_from_text.value, tree_from_file.value)
+
+    def test_iterparse_path(self):
+        events = list(iterparse(join(BASE_DIR, "data/test_text-2.txt")))
+        self.assertEqual(SydEventType.start_block, events[0].event)
+        self.assertEqual(SydEventType.end_block, events[-1].event)
+        self.assertEqual(('max1', 5), (events[1].key, events[1].value))
+
+    def test_iter_events_is_lazy(self):
+        pulled = []
+
+        def lines():
+            for line in ("a: 1\n", "}}}\n", "b: 2\n", "c: 3\n"):
+                pulled.append(line)
+                yield line
+        events = SydParser(lines()).iter_events()
+        self.assertEqual(SydEventType.start_block, next(events).event)
+        self.assertEqual('a', next(events).key)
+        with self.assertRaises(SynamicSydParseError):
+            next(events)
+        # only the look-ahead line after the broken one was read
+        self.assertEqual(3, len(pulled))
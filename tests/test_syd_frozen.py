@@ -0,0 +1,46 @@
+import threading
+from unittest import TestCase
+from syd import SydParser, SydData, SydFrozen, SydPath
+
+
+class TestSydFrozen(TestCase):
+    text = "a {\n    b [\n        x\n        {\n            c: 1\n        }\n    ]\n}\nd: 2\nd: 3\n"
+
+    def test_lookups(self):
+        tree = SydParser(self.text).parse()
+        frozen = tree.freeze()
+        self.assertIsInstance(frozen, SydFrozen)
+        self.assertEqual(1, frozen['a.b.1.c'])
+        self.assertEqual(1, frozen.get(SydPath('a.b.1.c')))
+        self.assertEqual('x', frozen.get(['a', 'b', 0]))
+        self.assertEqual(3, frozen['d'])  # the last one, as in the tree
+        self.assertIsNone(frozen.get('a.b.2'))
+        self.assertRaises(KeyError, frozen.get_child, 'a.c')
+        self.assertEqual(['a', 'a.b', 'a.b.0', 'a.b.1', 'a.b.1.c', 'd'], sorted(frozen.paths()))
+        self.assertIs(frozen, frozen.freeze())
+
+    def test_snapshot_does_not_change(self):
+        tree = SydParser(self.text).parse()
+        frozen = tree.freeze()
+        tree.get_child('a.b.1').add(SydData('e', 4))
+        del tree['d']
+        self.assertNotIn('a.b.1.e', frozen)
+        self.assertEqual(3, frozen['d'])
+        self.assertTrue(frozen.root.is_read_only)
+        self.assertTrue(frozen.get_child('a.b.1').is_read_only)
+        # a locked tree is not copied
+        tree.lock()
+        self.assertIs(tree, tree.freeze().root)
+
+    def test_threads(self):
+        frozen = SydParser(self.text).parse().freeze()
+        results = []
+
+        def read():
+            results.append(all(frozen['a.b.1.c'] == 1 and frozen.get('a.b.0') == 'x' for _ in range(1000)))
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([True] * 4, results)
@@ -0,0 +1,60 @@
+from unittest import TestCase
+from syd import SydParser, SydData
+
+
+def host_text(hosts):
+    return ''.join(f'host_{i} {{\n    port: 80\n    tls {{\n        cert: /etc/cert\n        on: true\n    }}\n}}\n'
+                   for i in range(hosts))
+
+
+class TestSydStructuralHash(TestCase):
+    def test_hash_is_cached_and_invalidated(self):
+        tree = SydParser("a {\n    b {\n        c: 1\n    }\n}\nd: 2\n").parse()
+        b = tree.get_child('a.b')
+        before = tree.structural_hash
+        self.assertTrue(b.has_structural_hash)
+        b.add(SydData('e', 3))
+        self.assertFalse(tree.has_structural_hash)
+        changed = tree.structural_hash
+        self.assertNotEqual(before, changed)
+        del tree['a.b.e']
+        self.assertEqual(before, tree.structural_hash)
+        tree.update('d', SydData('d', 3))
+        self.assertNotEqual(before, tree.structural_hash)
+
+    def test_equality_of_locked_containers(self):
+        a = SydParser(host_text(2)).parse()
+        b = SydParser(host_text(2)).parse()
+        self.assertNotEqual(a, b)  # not locked
+        a.lock()
+        b.lock()
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual(1, len({a, b}))
+        self.assertEqual(a.get_child('host_0.tls'), b.get_child('host_1.tls'))
+        self.assertNotEqual(a.get_child('host_0'), a.get_child('host_1'))  # keys differ
+
+    def test_hash_does_not_change_when_locked(self):
+        a = SydParser(host_text(1)).parse()
+        b = SydParser(host_text(1)).parse()
+        seen = {a}
+        a.lock()
+        b.lock()
+        self.assertIn(a, seen)
+        self.assertNotEqual(a, b)  # a keeps the identity it was hashed with
+        c = SydParser(host_text(1)).parse()
+        c.lock()
+        self.assertEqual(b, c)
+
+    def test_intern(self):
+        tree = SydParser(host_text(10)).parse()
+        tree.lock()
+        report = tree.intern()
+        # port and tls of 9 hosts (tls with its 2 children) are shared with the first host
+        self.assertEqual(9 * 4, report.nodes_shared)
+        self.assertGreater(report.bytes_saved, 0)
+        self.assertIs(tree.get_child('host_0.tls'), tree.get_child('host_9.tls'))
+        # a shared node keeps the parent of one copy, not the container it is reached from
+        self.assertEqual(1, len({id(tree.get_child(f'host_{i}.tls').parent) for i in range(10)}))
+        self.assertEqual(SydParser(host_text(10)).parse().value, tree.value)
+        self.assertEqual(0, tree.intern().nodes_shared)
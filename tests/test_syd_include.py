@@ -0,0 +1,82 @@
+from unittest import TestCase, mock
+from syd import SydParser, SynamicSydParseError, IncludeResolver, clear_include_cache, load
+from os.path import join
+from concurrent.futures import ProcessPoolExecutor
+import os
+import shutil
+import tempfile
+
+
+class TestSydInclude(TestCase):
+    def setUp(self):
+        clear_include_cache()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, name, text):
+        path = join(self.tmp_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def parse(self, name, **kwargs):
+        with open(join(self.tmp_dir, name), encoding='utf-8') as f:
+            return SydParser.parse_file(f, **kwargs)
+
+    def test_include(self):
+        self.write('base.syd', 'host: localhost\nports: (80, 443)\n')
+        self.write('main.syd', 'name: x\n!include base.syd\nsrv {\n    !include base.syd\n}\n')
+        tree = self.parse('main.syd')
+        self.assertEqual('localhost', tree['host'])
+        self.assertEqual((80, 443), tree['ports'])
+        self.assertEqual('localhost', tree['srv.host'])
+
+    def test_include_if_exists(self):
+        self.write('main.syd', 'a: 1\n!include_if_exists missing.syd\n')
+        self.assertEqual(1, self.parse('main.syd')['a'])
+        self.write('broken.syd', 'a: 1\n!include missing.syd\n')
+        with self.assertRaisesRegex(SynamicSydParseError, 'does not exist'):
+            self.parse('broken.syd')
+
+    def test_shared_include_is_parsed_once(self):
+        self.write('base.syd', 'b: 1\n')
+        self.write('a.syd', '!include base.syd\na: 1\n')
+        self.write('c.syd', '!include base.syd\nc: 1\n')
+        original_parse = IncludeResolver.parse
+        with mock.patch.object(IncludeResolver, 'parse', autospec=True, side_effect=original_parse) as parse:
+            self.assertEqual(1, self.parse('a.syd')['b'])
+            self.assertEqual(1, self.parse('c.syd')['b'])
+        self.assertEqual([join(self.tmp_dir, 'base.syd')], [call.args[1] for call in parse.call_args_list])
+
+    def test_cycle(self):
+        self.write('a.syd', '!include b.syd\n')
+        self.write('b.syd', '!include a.syd\n')
+        with self.assertRaisesRegex(SynamicSydParseError, 'Include cycle'):
+            self.parse('a.syd')
+
+    def test_parallel_resolution(self):
+        self.write('base.syd', 'b: 1\n')
+        for name in ('x', 'y', 'z'):
+            self.write(f'{name}.syd', f'!include base.syd\n{name}: 2\n')
+        resolver = IncludeResolver(workers=2)
+        text = '!include x.syd\n!include y.syd\n!include z.syd\n'
+        with mock.patch('syd.include.ProcessPoolExecutor', wraps=ProcessPoolExecutor) as executor:
+            tree = SydParser(text, base_dir=self.tmp_dir, include_resolver=resolver).parse()
+        executor.assert_called_once()
+        self.assertEqual((2, 2, 2, 1), (tree['x'], tree['y'], tree['z'], tree['b']))
+
+    def test_cached_load_checks_includes(self):
+        self.write('base.syd', 'b: 1\n')
+        main = self.write('main.syd', '!include base.syd\n')
+        cache_dir = join(self.tmp_dir, 'cache')
+        self.assertEqual(1, load(main, cache_dir=cache_dir)['b'])
+        self.write('base.syd', 'b: 2\n')
+        self.assertEqual(2, load(main, cache_dir=cache_dir)['b'])
+        # the same main file in another directory includes another base file
+        for name, b in (('one', 1), ('two', 2)):
+            os.mkdir(join(self.tmp_dir, name))
+            self.write(join(name, 'base.syd'), f'b: {b}\n')
+            main = self.write(join(name, 'main.syd'), '!include base.syd\n')
+            self.assertEqual(b, load(main, cache_dir=cache_dir)['b'])
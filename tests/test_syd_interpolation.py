@@ -0,0 +1,35 @@
+from unittest import TestCase
+from syd import SydParser
+from syd.exceptions import SynamicSydInterpolationError
+
+
+class TestSydInterpolation(TestCase):
+    def test_forward_and_chained_references(self):
+        text = "greeting: hello ${name}\nname: ${first} ${last}\nfirst: John\nlast: Doe\nage: 30\ns: ${age}\n"
+        tree = SydParser(text).parse()
+        self.assertEqual("hello John Doe", tree['greeting'])
+        self.assertEqual("30", tree['s'])
+
+    def test_dotted_and_ancestor_references(self):
+        text = "db {\n    host: localhost\n    port: 5432\n}\n" \
+               "app {\n    url: ${db.host}:${db.port}/${ name }\n    name: app\n}\nmissing: a${nope}b\nescaped: $${name}\n"
+        tree = SydParser(text).parse()
+        self.assertEqual("localhost:5432/app", tree['app.url'])
+        self.assertEqual("ab", tree['missing'])
+        self.assertEqual("$${name}", tree['escaped'])
+
+    def test_cycles_are_reported(self):
+        with self.assertRaisesRegex(SynamicSydInterpolationError, 'cycle'):
+            SydParser("a: ${b}\nb: ${c}\nc: ${a}\n").parse()
+        with self.assertRaises(SynamicSydInterpolationError):
+            SydParser("a: x${a}\n").parse()
+
+    def test_container_cannot_be_interpolated(self):
+        with self.assertRaises(SynamicSydInterpolationError):
+            SydParser("b {\n    c: 1\n}\na: ${b}\n").parse()
+
+    def test_lazy_blocks(self):
+        text = "name: syd\nb {\n    c: ${name}-${d}\n    d: 1\n}\n"
+        tree = SydParser(text).parse(lazy=True)
+        self.assertEqual("syd-1", tree['b.c'])
+        self.assertEqual(SydParser(text).parse().value, tree.value)
@@ -0,0 +1,38 @@
+from unittest import TestCase
+from syd import SydParser, SynamicSydParseError
+from os.path import join, abspath, dirname
+
+BASE_DIR = dirname(abspath(__file__))
+
+
+class TestSydLazyParse(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        with open(join(BASE_DIR, "data/test_text-1.txt"), encoding="utf-8") as f:
+            cls.text = f.read()
+
+    def test_same_tree(self):
+        self.assertEqual(SydParser(self.text).parse().value, SydParser(self.text).parse(lazy=True).value)
+
+    def test_blocks_are_parsed_on_access(self):
+        tree = SydParser(self.text).parse(lazy=True)
+        key1 = tree.get_child('key1')
+        self.assertFalse(key1.is_loaded)
+        self.assertEqual('v', tree['k'])
+        self.assertEqual("; l:9;", tree["key1.key_n1.o.p"])
+        self.assertTrue(key1.is_loaded)
+        self.assertEqual("ml string in list\n    got it?", tree["list_ml.7"])
+
+    def test_multiline_string_braces_are_not_counted(self):
+        text = "a {\n    s ~ {\n        {\n        [\n    }\n    n: 1\n}\nb: 2\n"
+        tree = SydParser(text).parse(lazy=True)
+        self.assertEqual(2, tree['b'])
+        self.assertEqual(1, tree['a.n'])
+        self.assertEqual("{\n[", tree['a.s'])
+
+    def test_error_is_raised_on_access(self):
+        text = "a {\n    b {\n        }}}\n    }\n}\nc: 1\n"
+        tree = SydParser(text).parse(lazy=True)
+        self.assertEqual(1, tree['c'])
+        with self.assertRaisesRegex(SynamicSydParseError, 'Line no: 3'):
+            tree['a.b']
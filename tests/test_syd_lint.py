@@ -0,0 +1,37 @@
+from unittest import TestCase
+from syd import SydParser, SynamicSydParseError
+
+
+class TestSydCollectErrors(TestCase):
+    text = "\n".join([
+        "a: 1",
+        "!!! broken key",
+        "b {",
+        "    c: 2",
+        "    ??? also broken",
+        "}",
+        "d { junk",
+        "    e: 3",
+        "}",
+        "m ~ { data",
+        "    }}}",
+        "}",
+        "t: 2018-13-40",
+        "f: 4",
+    ])
+
+    def test_errors_are_collected(self):
+        parser = SydParser(self.text, collect_errors=True)
+        tree = parser.parse()
+        self.assertEqual([2, 5, 7, 10, 13], [e.line_no for e in parser.errors])
+        self.assertEqual('!!! broken key', parser.errors[0].invalid_data)
+        self.assertIn('->..     ??? also broken', parser.errors[1].snippet)
+        self.assertEqual(1, tree['a'])
+        self.assertEqual(2, tree['b.c'])
+        self.assertEqual(4, tree['f'])
+        self.assertNotIn('d', tree)
+
+    def test_raises_first_error_by_default(self):
+        with self.assertRaises(SynamicSydParseError) as cm:
+            SydParser(self.text).parse()
+        self.assertEqual(2, cm.exception.parse_error.line_no)
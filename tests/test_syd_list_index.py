@@ -0,0 +1,44 @@
+from unittest import TestCase
+from syd import SydParser, SydData
+
+
+class TestSydListValueIndex(TestCase):
+    def setUp(self):
+        self.allowed = SydParser("allowed [\n    alice\n    bob\n    1\n    bob\n]\n").parse().get_child('allowed')
+
+    def test_membership_follows_changes(self):
+        allowed = self.allowed
+        self.assertIn('bob', allowed)
+        self.assertIn(1.0, allowed)
+        self.assertNotIn('carol', allowed)
+        allowed.add(SydData(None, 'carol'))
+        self.assertIn('carol', allowed)
+        del allowed[1]
+        self.assertIn('bob', allowed)  # the other one
+        del allowed[2]
+        self.assertNotIn('bob', allowed)
+        allowed.update(0, SydData(None, 'dave'))
+        self.assertNotIn('alice', allowed)
+        self.assertIn('dave', allowed)
+        allowed.delete_many([0, 1])
+        self.assertEqual(('carol',), allowed.value)
+        self.assertNotIn('dave', allowed)
+
+    def test_converted_and_unhashable(self):
+        allowed = self.allowed
+        self.assertIn('alice', allowed)
+        allowed.get_child(0).set_converter(str.upper)
+        self.assertIn('ALICE', allowed)
+        self.assertNotIn('alice', allowed)
+        self.assertNotIn({}, allowed)
+        nested = SydParser("l [\n    {\n        a: 1\n    }\n    x\n]\n").parse().get_child('l')
+        self.assertIn('x', nested)
+        self.assertIn({'a': 1}, nested)
+
+    def test_nested_containers_change(self):
+        nested = SydParser("l [\n    (1, 2)\n    x\n]\n").parse().get_child('l')
+        self.assertIn((1, 2), nested)
+        nested.get_child(0).add(SydData(None, 3))
+        self.assertEqual(((1, 2, 3), 'x'), nested.value)
+        self.assertIn((1, 2, 3), nested)
+        self.assertNotIn((1, 2), nested)
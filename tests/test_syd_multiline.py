@@ -0,0 +1,29 @@
+import io
+from unittest import TestCase
+from syd import SydParser, SynamicSydParseError
+from syd.utils import LinesView
+
+
+class TestSydMultilineStrings(TestCase):
+    text = "a ~ {\n      x\n        y\n      \\}\n}\nb ~~ {\r\n  p\r\n\r\n  q\r\n}\r\nc ~~~ {\n\t r $\n}\nd ~ {\n}\n" \
+           "e ~ {\n\t  m\n\t  n\n}\n"
+    expected = {'a': "x\n  y\n}", 'b': "  p\n\n  q", 'c': "\t r $", 'd': '', 'e': 'm\nn'}
+
+    def test_string_and_file_sources(self):
+        self.assertEqual(self.expected, dict(SydParser(self.text).parse().value))
+        self.assertEqual(self.expected, dict(SydParser(io.StringIO(self.text)).parse().value))
+        self.assertEqual(self.expected, dict(SydParser(self.text).parse(lazy=True).value))
+
+    def test_bodies_are_views_until_accessed(self):
+        tree = SydParser("a ~~ {\n  big\n}\n").parse()
+        self.assertIs(type(tree.get_child('a')._SydData__value), LinesView)
+        self.assertEqual("  big", tree['a'])
+        self.assertIs(type(tree.get_child('a')._SydData__value), str)
+        # the event stream has plain strings
+        values = [e.value for e in SydParser("a ~~ {\n  big\n}\n").iter_events() if e.value is not None]
+        self.assertEqual(["  big"], values)
+
+    def test_unterminated(self):
+        for source in ("a ~ {\n x\n }x\n", "a ~ {\n x\n"):
+            with self.assertRaisesRegex(SynamicSydParseError, 'no end'):
+                SydParser(source).parse()
@@ -0,0 +1,38 @@
+import io
+import os
+import tempfile
+from unittest import TestCase
+from syd import SydParser, loads, load_file
+
+
+def _plain(value):
+    if isinstance(value, tuple):
+        return [_plain(v) for v in value]
+    if hasattr(value, 'items'):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
+
+
+class TestSydNative(TestCase):
+    text = "name: app\nport: 80\nservers [\n    {\n        host: a\n    }\n    b\n    (1, 2)\n]\n" \
+           "db {\n    multi ~{\n        line one\n        line two\n    }\n}\nname: again\n"
+
+    def test_same_as_tree_value(self):
+        value = loads(self.text)
+        self.assertIs(type(value), dict)
+        self.assertIs(type(value['servers']), list)
+        self.assertEqual(_plain(SydParser(self.text).parse().value), value)
+        self.assertEqual('again', value['name'])
+        self.assertEqual({}, loads(''))
+
+    def test_interpolation_and_files(self):
+        self.assertEqual({'a': 'x', 'b': 'x-y'}, loads('a: x\nb: ${a}-y\n'))
+        self.assertEqual({'port': 80}, load_file(io.StringIO('port: 80\n')))
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'common.syd'), 'w') as f:
+                f.write('shared: 1\n')
+            path = os.path.join(directory, 'main.syd')
+            with open(path, 'w') as f:
+                f.write('!include common.syd\nown: 2\n')
+            with open(path) as f:
+                self.assertEqual({'shared': 1, 'own': 2}, load_file(f))
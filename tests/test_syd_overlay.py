@@ -0,0 +1,39 @@
+from unittest import TestCase
+from syd import SydParser, SydOverlay
+
+
+class TestSydOverlay(TestCase):
+    def setUp(self):
+        self.defaults = SydParser(
+            "name: app\nserver {\n    host: localhost\n    port: 80\n    tls {\n        enabled: false\n    }\n}\n"
+            "hosts [\n    a\n    b\n]\n"
+        ).parse()
+        self.site = SydParser("server {\n    port: 8080\n    tls {\n        cert: site.pem\n    }\n}\n").parse()
+        self.env = SydParser("server {\n    tls: off\n}\nhosts [\n    c\n]\ndebug: true\n").parse()
+
+    def test_later_layers_win(self):
+        overlay = SydOverlay(self.defaults, self.site, self.env)
+        self.assertEqual(('name', 'server', 'hosts', 'debug'), overlay.keys())
+        self.assertEqual(8080, overlay['server.port'])
+        self.assertEqual('localhost', overlay.get('server.host'))
+        self.assertEqual('off', overlay['server.tls'])  # a scalar hides the blocks below it
+        self.assertEqual(('c', ), overlay['hosts'])  # lists are not merged
+        self.assertEqual('c', overlay.get(['hosts', 0]))
+        self.assertIsNone(overlay.get('server.tls.cert'))
+        self.assertNotIn('missing', overlay)
+        self.assertRaises(KeyError, overlay.get_child, 'server.missing')
+
+    def test_nested_blocks_are_merged(self):
+        overlay = SydOverlay(self.defaults, self.site)
+        server = overlay.get_child('server')
+        self.assertIsInstance(server, SydOverlay)
+        self.assertIs(server, overlay.get_child('server'))
+        self.assertEqual({'enabled': 'false', 'cert': 'site.pem'}, dict(overlay['server.tls']))
+        self.assertEqual([('host', 'localhost'), ('port', 8080)], list(server.items())[:2])
+        # overlays can be layered too
+        layered = SydOverlay(overlay, self.env)
+        self.assertEqual(8080, layered['server.port'])
+        self.assertEqual('off', layered['server.tls'])
+        self.assertEqual(
+            dict(self.defaults.merged_new(self.site)['server']), dict(overlay['server'])
+        )
@@ -0,0 +1,26 @@
+from unittest import TestCase
+from syd import SydParser, parse_many
+from os.path import join, abspath, dirname
+
+BASE_DIR = dirname(abspath(__file__))
+PATHS = [join(BASE_DIR, "data/test_text-1.txt"), join(BASE_DIR, "data/test_text-2.txt")]
+
+
+class TestSydParseMany(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.trees = []
+        for path in PATHS:
+            with open(path, encoding="utf-8") as f:
+                cls.trees.append(SydParser(f.read()).parse())
+
+    def test_parse_many(self):
+        for workers in (1, 2):
+            trees = parse_many(PATHS, workers=workers)
+            self.assertEqual([t.value for t in self.trees], [t.value for t in trees])
+
+    def test_parse_many_merged(self):
+        merged = parse_many(PATHS, workers=2, merge=True)
+        self.assertEqual(5, merged['max1'])
+        self.assertEqual('t', merged['m_in'])
+        merged.add('new', 1)
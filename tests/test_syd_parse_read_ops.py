@@ -103,3 +103,25 @@ class TestSydParserReadOps(TestCase):
     #
     # def test_covert_one_value(self):
     #     self.fail()
+
+
+class TestSydDeepNesting(TestCase):
+    depth = 3000  # well past the default recursion limit
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        text = "k {\n" * cls.depth + "v: 1\n" + "}\n" * cls.depth + "after: 2\n"
+        cls.tree = SydParser(text).parse()
+        cls.path = '.'.join(['k'] * cls.depth + ['v'])
+
+    def test_parse(self):
+        self.assertEqual(1, self.tree[self.path])
+        self.assertEqual(2, self.tree['after'])
+
+    def test_tree_operations(self):
+        clone = self.tree.clone()
+        self.assertEqual(1, clone[self.path])
+        merged = self.tree.merged_new(clone)
+        self.assertEqual(1, merged[self.path])
+        self.assertIn('v => 1' + ' }' * self.depth, str(clone))
+        clone.lock()
@@ -0,0 +1,48 @@
+from unittest import TestCase, mock
+from syd import SydParser, SydContainer, diff
+from syd.patch import iter_changes
+
+
+class TestSydDiffPatch(TestCase):
+    a_text = "name: app\ndb {\n    host: localhost\n    port: 5432\n}\nservers [\n    a\n    b\n    c\n]\n" \
+             "flag: 1\ntags [\n    x\n]\n"
+    b_text = "name: app\ndb {\n    host: db.local\n    port: 5432\n    user: root\n}\nservers [\n    a\n    b\n]\n" \
+             "flag: true\ntags {\n    x: 1\n}\nnew: 1\n"
+
+    def test_diff(self):
+        a, b = SydParser(self.a_text).parse(), SydParser(self.b_text).parse()
+        patch = diff(a, b)
+        self.assertEqual(('db.user', 'new'), patch.added)
+        self.assertEqual(('servers.2',), patch.removed)
+        self.assertEqual(('db.host', 'flag', 'tags'), patch.changed)
+        self.assertFalse(diff(a, a.clone()))
+        self.assertFalse(diff(a, a))
+
+    def test_identical_subtrees_are_skipped(self):
+        a, b = SydParser(self.a_text).parse(), SydParser(self.b_text).parse()
+        old = a.get_children()
+        new = list(old)
+        new[3] = b.get_child('flag')  # the other children are the same objects on both sides
+        with mock.patch.object(SydContainer, 'get_children', autospec=True,
+                               side_effect=SydContainer.get_children) as get_children:
+            changes = list(iter_changes(old, new))
+        self.assertEqual([('changed', 'flag', (new[3], ))], changes)
+        # the shared subtrees are not walked
+        self.assertEqual(0, get_children.call_count)
+
+    def test_hash_collisions(self):
+        # hash(-1) == hash(-2) - equal hashes of locked trees are not enough
+        a, b = SydParser('b {\n x: -1\n}').parse(), SydParser('b {\n x: -2\n}').parse()
+        a.lock()
+        b.lock()
+        self.assertEqual(('b.x',), diff(a, b).changed)
+
+    def test_apply_patch(self):
+        a, b = SydParser(self.a_text).parse(), SydParser(self.b_text).parse()
+        target = a.clone()
+        target.apply_patch(diff(a, b))
+        self.assertEqual(b.value, target.value)
+        self.assertFalse(diff(target, b))
+        # the patch does not take the nodes of b
+        self.assertIsNot(b.get_child('db.user'), target.get_child('db.user'))
+        self.assertIs(target, target.get_child('tags').parent)
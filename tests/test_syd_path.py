@@ -0,0 +1,30 @@
+from unittest import TestCase
+import syd
+from syd import SydParser, SydPath
+
+
+class TestSydPath(TestCase):
+    text = "servers [\n    {\n        port: 80\n    }\n    {\n        port: 81\n    }\n]\n" \
+           "db {\n    port: 5432\n}\ndup: 1\ndup: 2\n"
+
+    def setUp(self):
+        self.tree = SydParser(self.text).parse()
+
+    def test_compiled_lookups(self):
+        path = syd.path('servers.1.port')
+        self.assertIs(path, syd.path('servers.1.port'))  # cached
+        self.assertEqual(('servers', 1, 'port'), path.steps)
+        self.assertEqual(81, self.tree[path])
+        self.assertEqual(81, path.get(self.tree))
+        self.assertEqual(5432, self.tree[SydPath(['db', 'port'])])
+        self.assertEqual(80, self.tree['servers.0.port'])
+        self.assertEqual((1, 2), self.tree.get('dup', multi=True))
+
+    def test_missing(self):
+        self.assertIsNone(self.tree.get('servers.5.port'))
+        self.assertIsNone(self.tree.get('db.port.x'))
+        self.assertIsNone(self.tree.get_child('nope.port', error_out=False))
+        with self.assertRaises(IndexError):
+            self.tree.get_child('servers.5')
+        with self.assertRaises(KeyError):
+            self.tree.get_child('db.host')
@@ -0,0 +1,66 @@
+from unittest import TestCase
+from syd import SydParser, SydDataType, SydEventType, SynamicSydParseError
+import datetime
+
+
+class TestSydScalarInference(TestCase):
+    def assertScalar(self, text, value, datatype):
+        self.assertEqual([(value, datatype)], SydParser.scalar_values(text))
+
+    def test_string(self):
+        self.assertScalar('server name', 'server name', SydDataType.string)
+        self.assertScalar('12abc', '12abc', SydDataType.string)
+        self.assertScalar('2018-xx-yy', '2018-xx-yy', SydDataType.string)
+
+    def test_number(self):
+        self.assertScalar('5', 5, SydDataType.number)
+        self.assertScalar('-5', -5, SydDataType.number)
+        self.assertScalar('+2.5', 2.5, SydDataType.number)
+
+    def test_datetime(self):
+        self.assertScalar('2018-1-2', datetime.datetime(2018, 1, 2), SydDataType.datetime)
+        self.assertScalar('2018-1-2 10:30 PM', datetime.datetime(2018, 1, 2, 22, 30), SydDataType.datetime)
+
+    def test_time(self):
+        self.assertScalar('1:05', datetime.time(1, 5), SydDataType.time)
+        self.assertScalar('10:30:15', datetime.time(10, 30, 15), SydDataType.time)
+
+
+class TestSydSimpleScalarLines(TestCase):
+    """Lines with one bare scalar take a fast path in the parser - it must give what the full processing gives"""
+    def assertLineScalar(self, text, value, datatype):
+        source = f'a: {text}\nl [\n    {text}\n]\n'
+        events = [(e.event, e.key, e.value, e.datatype) for e in SydParser(source).iter_events()]
+        self.assertEqual((SydEventType.scalar, 'a', value, datatype), events[1])
+        self.assertEqual((SydEventType.scalar, None, value, datatype), events[3])
+
+    def test_simple_lines(self):
+        self.assertLineScalar('server name', 'server name', SydDataType.string)
+        self.assertLineScalar('-5', -5, SydDataType.number)
+        self.assertLineScalar('2.5', 2.5, SydDataType.number)
+        self.assertLineScalar('2018-1-2 10:30 PM', datetime.datetime(2018, 1, 2, 22, 30), SydDataType.datetime)
+        self.assertLineScalar('10:30:15', datetime.time(10, 30, 15), SydDataType.time)
+        self.assertLineScalar(r'\(not a list)', 'not a list)', SydDataType.string)
+
+    def test_key_lines(self):
+        tree = SydParser('a\nb:\nc 5\nd : x y\n').parse()
+        self.assertEqual({'a': '', 'b': '', 'c': 5, 'd': 'x y'}, tree.value)
+
+    def test_other_lines_are_processed_in_full(self):
+        text = ("q: 'x, y'\n"
+                "c: (1, x)\n"
+                "b {\n    k: v\n}\n"
+                "ml ~ {\n    my text\n}\n"
+                "l [\n    \"x y\"\n    (1, 2)\n    : z\n    [\n        1\n    ]\n    ~{\n    in list\n    }\n]\n")
+        self.assertEqual({
+            'q': 'x, y',
+            'c': (1, 'x'),
+            'b': {'k': 'v'},
+            'ml': 'my text',
+            'l': ('x y', (1, 2), 'z', (1, ), 'in list'),
+        }, SydParser(text).parse().value)
+
+    def test_invalid_values_are_parse_errors(self):
+        for text in ('a: 2018-13-40\n', 'l [\n    2018-13-40\n]\n', 'a ~: x\n'):
+            with self.assertRaises(SynamicSydParseError):
+                SydParser(text).parse()
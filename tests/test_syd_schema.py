@@ -0,0 +1,66 @@
+import dataclasses
+import datetime
+import enum
+from typing import Any, Dict, List, Optional, Tuple
+from unittest import TestCase
+from syd import SydParser, compile_model, SynamicSydValidationError
+
+
+class Mode(enum.Enum):
+    fast = 'fast'
+    slow = 'slow'
+
+
+@dataclasses.dataclass
+class Server:
+    host: str
+    port: int
+    tags: Tuple[str, ...] = ()
+    mode: Mode = Mode.fast
+    note: Optional[str] = None
+
+
+@dataclasses.dataclass
+class Config:
+    name: str
+    debug: bool
+    started: datetime.date
+    servers: List[Server]
+    limits: Dict[str, float]
+    extra: Any = None
+
+
+class TestSydSchema(TestCase):
+    text = "name: app\ndebug: yes\nstarted: 2020-01-02\nlimits {\n    cpu: 2\n}\nservers [\n    {\n" \
+           "        host: a\n        port: 80\n        tags [\n            x\n        ]\n        mode: slow\n    }\n" \
+           "    {\n        host: b\n        port: 81\n    }\n]\nextra {\n    l [\n        1\n    ]\n}\n"
+
+    def test_decode(self):
+        decoder = compile_model(Config)
+        self.assertIs(decoder, compile_model(Config))
+        config = decoder.decode_text(self.text)
+        self.assertEqual(Config(
+            name='app', debug=True, started=datetime.date(2020, 1, 2),
+            servers=[Server('a', 80, ('x', ), Mode.slow), Server('b', 81)],
+            limits={'cpu': 2.0}, extra={'l': [1]}
+        ), config)
+        self.assertEqual(config, decoder.decode(SydParser(self.text).parse()))
+        self.assertEqual([80, 81], [s.port for s in compile_model(List[Server]).decode(
+            SydParser(self.text).parse().get_child('servers')
+        )])
+
+    def test_interpolated_strings(self):
+        config = compile_model(Config).decode_text(self.text.replace('host: b', 'host: ${name}.local'))
+        self.assertEqual('app.local', config.servers[1].host)
+
+    def test_errors_by_path(self):
+        text = self.text.replace('port: 80', 'port: eighty').replace('host: b', 'hostname: b') \
+            .replace('limits {\n    cpu: 2\n}', 'limits [\n    2\n]')
+        with self.assertRaises(SynamicSydValidationError) as cm:
+            compile_model(Config).decode_text(text)
+        self.assertEqual(
+            ['limits', 'servers.0.port', 'servers.1.hostname', 'servers.1.host'],
+            [path for path, _ in cm.exception.errors]
+        )
+        self.assertIn('servers.0.port: expected an integer', str(cm.exception))
+        self.assertRaises(TypeError, compile_model, Dict[int, str])
@@ -0,0 +1,50 @@
+import collections
+import copy
+import json
+import pickle
+from unittest import TestCase
+from syd import SydParser, SydData
+
+
+class TestSydCachedValues(TestCase):
+    def setUp(self):
+        self.tree = SydParser("servers {\n    web {\n        port: 80\n    }\n    hosts [\n        a\n    ]\n}\n").parse()
+
+    def test_values_are_cached_and_read_only(self):
+        tree = self.tree
+        servers = tree['servers']
+        self.assertIs(servers, tree['servers'])
+        self.assertIs(tree.value['servers'], servers)
+        self.assertEqual({'web': {'port': 80}, 'hosts': ('a', )}, servers)
+        with self.assertRaises(TypeError):
+            servers['web'] = 1
+        with self.assertRaises(TypeError):
+            servers.update(web=1)
+        self.assertIs(tree.get_child('servers.hosts').as_tuple, servers['hosts'])
+
+    def test_changes_are_seen(self):
+        tree = self.tree
+        servers = tree['servers']
+        tree.get_child('servers.web').add(SydData('host', 'example.org'))
+        self.assertEqual({'port': 80, 'host': 'example.org'}, tree['servers']['web'])
+        self.assertIsNot(servers, tree['servers'])
+        tree.get_child('servers.hosts').add(SydData(None, 'b'))
+        self.assertEqual(('a', 'b'), tree['servers.hosts'])
+        tree.set('servers.web.port', 8080)
+        self.assertEqual(8080, tree['servers']['web']['port'])
+        tree.get_child('servers.web').update('port', SydData('port', 81))
+        self.assertEqual(81, tree.value['servers']['web']['port'])
+        del tree['servers.hosts']
+        self.assertEqual(('web', ), tuple(tree['servers']))
+        tree.get_child('servers.web').set_converted('converted')
+        self.assertEqual('converted', tree['servers']['web'])
+
+    def test_values_are_plain_for_json_and_pickle(self):
+        value = self.tree.value
+        self.assertIsInstance(value, collections.OrderedDict)
+        self.assertEqual('{"servers": {"web": {"port": 80}, "hosts": ["a"]}}', json.dumps(value))
+        copied = pickle.loads(pickle.dumps(value))
+        self.assertEqual(value, copied)
+        copied['servers']['web']['port'] = 81
+        self.assertEqual(80, self.tree['servers.web.port'])
+        copy.deepcopy(value)['servers'] = None
@@ -0,0 +1,66 @@
+from unittest import TestCase
+from syd import SydParser, SydData
+
+
+class TestSydViews(TestCase):
+    def setUp(self):
+        self.tree = SydParser("a: 1\nb: x\nc {\n    d: 2\n}\nl [\n    p\n    q\n]\n").parse()
+
+    def test_views_follow_changes(self):
+        tree = self.tree
+        keys, values, items = tree.keys(), tree.values(), tree.items()
+        self.assertEqual(('a', 'b', 'c', 'l'), keys)
+        self.assertEqual(4, len(values))
+        self.assertEqual(('a', 1), next(iter(items)))
+        tree.add(SydData('e', 3))
+        del tree['a']
+        self.assertEqual(['b', 'c', 'l', 'e'], list(keys))
+        self.assertEqual(('b', 'x'), next(iter(items)))
+        self.assertEqual(4, len(items))
+
+    def test_membership(self):
+        tree = self.tree
+        self.assertIn('c', tree.keys())
+        self.assertNotIn('c.d', tree.keys())
+        self.assertNotIn([], tree.keys())
+        self.assertIn('x', tree.values())
+        self.assertIn(('a', 1), tree.items())
+        self.assertNotIn(('a', 2), tree.items())
+        l = tree.get_child('l')
+        self.assertIn(1, l.keys())
+        self.assertNotIn(2, l.keys())
+        self.assertIn('q', l.values())
+        self.assertIn((0, 'p'), l.items())
+        self.assertEqual(['p', 'q'], list(l))
+        self.assertEqual([(0, 'p'), (1, 'q')], list(l.items()))
+
+    def test_nested_containers_are_not_materialized(self):
+        tree = self.tree
+        c = tree.get_child('c')
+        self.assertIn('c.d', tree)
+        self.assertIn('c', tree.keys())
+        # converted values of nested containers are not built by membership tests
+        c.set_converter(lambda value: self.fail('converted'))
+        self.assertIn('c', tree)
+        self.assertEqual(4, len(tree.values()))
+
+    def test_delete_while_iterating(self):
+        tree = self.tree
+        keys = []
+        for key in tree.keys():
+            keys.append(key)
+            if key == 'a':
+                del tree['b']
+        self.assertEqual(['a', 'c', 'l'], keys)
+        seen = []
+        for data in tree.iter_children():
+            seen.append(data.key)
+            if data.key == 'c':
+                tree.delete_many(['l'])
+        self.assertEqual(['a', 'c'], seen)
+
+    def test_values_of_nested_containers_are_taken_when_reached(self):
+        tree = SydParser("c {\n    d: 2\n}\ne {\n    f: 3\n}\n").parse()
+        tree.get_child('e').set_converter(lambda value: self.fail('converted'))
+        values = iter(tree.values())
+        self.assertEqual({'d': 2}, next(values))